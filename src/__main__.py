@@ -1,9 +1,17 @@
+import argparse
+import os
+
 import pandas as pd
-from sqlalchemy import create_engine
 from sqlalchemy.orm import Session
+from service.database_engine import create_database_engine
 from service.database_service import DatabaseService
+from service.backtest import WalkForwardBacktest
+from service.feature_store import FeatureStore
+from service.model_store import ModelStore
 from scripts.Scraper import Scraper
+from scripts.response_cache import ResponseCache
 from service.nba_pipeline import NbaPredictor
+from service.staking_sweep import StakingSweep
 
 username = 'jeffreychow'
 port = '5432'
@@ -11,14 +19,30 @@ database = 'nba_test'
 
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--predict-only', action='store_true',
+                        help="Predict with the stored model; don't scrape or train.")
+    parser.add_argument('--sweep-staking', type=int, nargs='+', metavar='YEAR',
+                        help="Evaluate staking parameters on the seasons' saved predictions, then exit.")
+    args = parser.parse_args()
+
+    if args.sweep_staking:
+        sweep = StakingSweep({year: f'data/{year}_prediction.csv' for year in args.sweep_staking},
+                             workers=os.cpu_count())
+        sweep.run().to_csv('data/staking_sweep.csv', index=False)
+        return
+
     # Set Parameters
     scrape_years = range(2015, 2023)
     training_years = [2017, 2018, 2019, 2021]
     prediction_year = 2022
 
-    engine = create_engine(f'postgresql+psycopg2://{username}:@localhost:{port}/{database}')
+    # Set DATABASE_URL to run on another backend, e.g. DATABASE_URL=sqlite:///data/nba.db for a local file database.
+    database_url = os.environ.get('DATABASE_URL', f'postgresql+psycopg2://{username}:@localhost:{port}/{database}')
+    engine = create_database_engine(database_url)
     session = Session(engine)
-    scraper = Scraper()
+    # Scraped pages are cached on disk; set offline=True to re-ingest from the cache without touching the network.
+    scraper = Scraper(cache=ResponseCache('data/http_cache'), offline=False)
     db_service = DatabaseService(session, scraper, engine)
 
     # Scraper-related methods; uncomment if we need to re-initialize the database.
@@ -30,11 +54,34 @@ def main():
     #         continue
     #     db_service.add_odds_data(odds_data)
 
-    predictor = NbaPredictor(db_service, training_years)
-    predictor.train_model()
+    # Nightly in-season update; only scrapes the games played since the last update.
+    # db_service.update_season(prediction_year)
+
+    # Generated season data is stored on disk and only rebuilt when a season's games or the features change.
+    # Seasons are generated in parallel worker processes (one database connection each).
+    predictor = NbaPredictor(db_service, training_years, FeatureStore('data/feature_store'), workers=os.cpu_count())
+
+    # Fitted models are stored with their training years, feature version and training data fingerprint; the latest
+    # stored model (tuned or not) is loaded instead of retraining.
+    model_store = ModelStore('data/models')
+    if not predictor.load_model(model_store):
+        if args.predict_only:
+            print("Run without --predict-only to train the model first.")
+            return
+        predictor.train_model()
+        # Or search pipeline steps and hyperparameters with season-forward splits (keeps the best pipeline).
+        # predictor.tune_model()
+        predictor.save_model(model_store)
+
+    # In-season team and player state, resumed from the last snapshot (only new games are applied).
+    # season_state = predictor.update_season_state(prediction_year, f'data/state/{prediction_year}.snapshot')
 
     predictor.run_prediction_for_season(prediction_year)
+    # Or walk forward through the season, retraining on every game played before each day.
+    # WalkForwardBacktest(predictor).run(prediction_year)
     predictor.check_profit(f'data/{prediction_year}_prediction.csv', float(1000), float(0.05), float(5))
+    # Risk of the same staking over bootstrapped seasons (risk of ruin, drawdowns, final bankroll percentiles).
+    # predictor.check_risk(f'data/{prediction_year}_prediction.csv', float(1000), float(0.05), float(5))
     return
 
 
@@ -0,0 +1,60 @@
+import os
+import shutil
+import uuid
+from typing import Callable
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """
+    Writes a file so that readers see either the previous file or the complete new one, never a truncated file (e.g.
+    when the run is interrupted).
+    :param path: File path.
+    :param data: File contents.
+    :return: None
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_directory(path: str, write: Callable[[str], None]) -> None:
+    """
+    Writes the files of a directory so that readers never see a partially written directory; any directory already at
+    the path is replaced.
+
+    The directory is meant to be keyed by its contents: when several writers store the same path at once, the first
+    directory renamed into place is kept and the others are dropped. Readers may briefly find no directory at all
+    while an existing one is being replaced.
+    :param path: Directory path.
+    :param write: Writes the files into the directory it is given (a temporary directory next to path).
+    :return: None
+    """
+    parent, name = os.path.split(path)
+    tmp_path = _unique_path(parent, name, 'tmp')
+    os.makedirs(tmp_path)
+    try:
+        write(tmp_path)
+
+        if os.path.isdir(path):
+            # Rename the old directory out of the way first (a rename is atomic, removing its files is not).
+            stale_path = _unique_path(parent, name, 'stale')
+            try:
+                os.replace(path, stale_path)
+            except FileNotFoundError:
+                pass  # Another writer already moved it.
+            shutil.rmtree(stale_path, ignore_errors=True)
+
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Another writer renamed its directory into place first (the target is not empty); it holds the same data.
+            if not os.path.isdir(path):
+                raise
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+
+def _unique_path(parent: str, name: str, suffix: str) -> str:
+    # Hidden, and unique to this writer (even between threads of a process).
+    return os.path.join(parent, f'.{name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.{suffix}')
@@ -199,3 +199,57 @@ CITY_NAME_TO_PROPER = {
     'Utah': 'Utah Jazz',
     'Washington': 'Washington Wizards'
 }
+
+# Game log columns and the box score columns they are read from.
+GAME_LOG_BOX_SCORE_COLUMNS = {
+    'minutes_played': 'MP',
+    'field_goals': 'FG',
+    'field_goal_attempts': 'FGA',
+    'field_goal_pct': 'FG%',
+    'three_pointers': '3P',
+    'three_point_attempts': '3PA',
+    'three_point_pct': '3P%',
+    'free_throws': 'FT',
+    'free_throw_attempts': 'FTA',
+    'free_throw_pct': 'FT%',
+    'offensive_rebounds': 'ORB',
+    'defensive_rebounds': 'DRB',
+    'total_rebounds': 'TRB',
+    'assists': 'AST',
+    'steals': 'STL',
+    'blocks': 'BLK',
+    'turnovers': 'TOV',
+    'personal_fouls': 'PF',
+    'points': 'PTS',
+    'true_shooting_pct': 'TS%',
+    'effective_field_goal_pct': 'eFG%',
+    'three_point_attempt_rate': '3PAr',
+    'free_throw_attempt_rate': 'FTr',
+    'offensive_rebound_pct': 'ORB%',
+    'defensive_rebound_pct': 'DRB%',
+    'total_rebound_pct': 'TRB%',
+    'assist_pct': 'AST%',
+    'steal_pct': 'STL%',
+    'block_pct': 'BLK%',
+    'turnover_pct': 'TOV%',
+    'usage_pct': 'USG%',
+    'offensive_rating': 'ORtg',
+    'defensive_rating': 'DRtg',
+}
+
+GAME_PLAYER_LOG_COLUMNS = {
+    **GAME_LOG_BOX_SCORE_COLUMNS,
+    'plus_minus': '+/-',
+    'box_plus_minus': 'BPM',
+}
+
+# Team game logs also read the game summary (line score and four factors).
+GAME_TEAM_LOG_SUMMARY_COLUMNS = {
+    'total_points': 'T',
+    'first_quarter_points': '1',
+    'second_quarter_points': '2',
+    'third_quarter_points': '3',
+    'fourth_quarter_points': '4',
+    'pace': 'Pace',
+    'free_throws_per_field_goal_attempt': 'FT/FGA',
+}
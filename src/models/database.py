@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, DECIMAL
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, DECIMAL, Boolean
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
@@ -127,6 +127,18 @@ class GameType(Base):
     type = Column(String)
 
 
+class IngestCursor(Base):
+    __tablename__ = "ingest_cursor"
+
+    id = Column(Integer, primary_key=True)
+    season_id = Column(Integer, ForeignKey("season.id", name='fk_ingest_cursor_season_id'), unique=True)
+    last_game_code = Column(String)
+    last_game_datetime = Column(DateTime)
+    games_ingested = Column(Integer)
+    completed = Column(Boolean)
+    updated_at = Column(DateTime)
+
+
 class Player(Base):
     __tablename__ = "player"
 
@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class ExponentialAverages:
+    """
+    Exponentially weighted means of per-game stats for every team, one per half-life (in games).
+
+    A game's weight halves every half-life games. Each team keeps only a decayed sum and a decayed weight per
+    half-life, so memory is constant per team and an update is a multiply and an add. The mean is the sum divided by
+    the weight, so the first games are not biased towards 0 (like pandas' `ewm(halflife=..., adjust=True)`).
+    """
+
+    def __init__(self, stats: list[str], half_lives: tuple[float, ...], capacity: int = 32):
+        """
+        Constructor for empty exponential averages.
+        :param stats: Names of the per-game stats, in column order.
+        :param half_lives: Half-lives in games.
+        :param capacity: Number of teams allocated up front.
+        """
+        self.stats = list(stats)
+        self.half_lives = tuple(half_lives)
+        self.decays = 0.5 ** (1 / np.array(self.half_lives, dtype=float))
+        self.sums = np.zeros((capacity, len(self.half_lives), len(self.stats)))
+        self.weights = np.zeros((capacity, len(self.half_lives)))
+
+    @property
+    def feature_names(self) -> list[str]:
+        """
+        Names of the means returned by `means`, e.g. 'off_rtg_ewm5'.
+        """
+        return [f'{stat}_ewm{half_life:g}' for half_life in self.half_lives for stat in self.stats]
+
+    def grow(self, capacity: int) -> None:
+        """
+        Allocates room for more teams.
+        :param capacity: New number of teams.
+        :return: None
+        """
+        self.sums = self.__grow(self.sums, capacity)
+        self.weights = self.__grow(self.weights, capacity)
+
+    def push(self, indexes: np.ndarray, values: np.ndarray) -> None:
+        """
+        Adds a game to several teams at once. A team may appear only once.
+        :param indexes: Team indexes.
+        :param values: Every team's per-game stats (one row per team, columns in stats order).
+        :return: None
+        """
+        self.sums[indexes] = self.sums[indexes] * self.decays[None, :, None] + values[:, None, :]
+        self.weights[indexes] = self.weights[indexes] * self.decays[None, :] + 1
+
+    def means(self, indexes: np.ndarray) -> np.ndarray:
+        """
+        Gets the exponentially weighted means of teams (0 before a team's first game).
+        :param indexes: Team indexes.
+        :return: One row per team, columns in feature_names order.
+        """
+        weights = self.weights[indexes][:, :, None]
+        means = np.divide(self.sums[indexes], weights, out=np.zeros_like(self.sums[indexes]), where=weights > 0)
+        return means.reshape(len(indexes), -1)
+
+    def pre_game_means(self, values: np.ndarray) -> np.ndarray:
+        """
+        Computes the means before each of a team's games at once (the batch equivalent of calling `means`, then
+        `push`, for every game).
+        :param values: The team's per-game stats, in game order.
+        :return: One row per game, columns in feature_names order.
+        """
+        games = np.arange(len(values))
+        means = np.zeros((len(values), len(self.half_lives), len(self.stats)))
+        for i, decay in enumerate(self.decays):
+            # Sum before game k: sum over j < k of decay^(k - 1 - j) * x_j = decay^(k - 1) * cumsum(x_j / decay^j).
+            scaled_totals = np.cumsum(values / decay ** games[:, None], axis=0)
+            sums = scaled_totals[:-1] * decay ** games[:-1, None]
+            weights = (1 - decay ** games[1:]) / (1 - decay)
+            means[1:, i] = sums / weights[:, None]
+        return means.reshape(len(values), -1)
+
+    def to_state(self, index: int) -> dict:
+        """
+        Gets a team's decayed sums and weights as plain values.
+        :param index: Team index.
+        :return: Dictionary with the sums and weights.
+        """
+        return {'sums': self.sums[index].tolist(), 'weights': self.weights[index].tolist()}
+
+    def from_state(self, index: int, state: dict) -> None:
+        """
+        Restores a team's decayed sums and weights returned by to_state.
+        :param index: Team index.
+        :param state: Dictionary with the sums and weights.
+        :return: None
+        """
+        self.sums[index] = state['sums']
+        self.weights[index] = state['weights']
+
+    @staticmethod
+    def __grow(array: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.zeros((capacity,) + array.shape[1:])
+        grown[:len(array)] = array
+        return grown
@@ -0,0 +1,260 @@
+import numpy as np
+
+from models.exponential_averages import ExponentialAverages
+from models.rolling_windows import RollingWindows
+
+
+class LeagueState:
+    """
+    Contiguous array storage for the state of every team and player of a league.
+
+    Team and player accumulators are rows of NumPy arrays indexed by integer ids handed out by `add_team` and
+    `add_player`; `NbaTeam` and `NbaPlayer` objects are thin `__slots__` views over one row. Arrays grow by doubling,
+    so adding teams and players rarely allocates, and a whole slate of games can be applied with single array
+    operations (`apply_games`, `update_player_bpm`). Rolling means of the per-game stats over the last
+    ROLLING_WINDOWS games are kept in `rolling`, and their exponentially weighted means (EWMA_HALF_LIVES) in `ewma`.
+    """
+
+    # Team columns. The first eleven are the team's features, in feature order.
+    TEAM_FIELDS = ['win_loss_pct', 'mov', 'off_rtg', 'tov_pct', 'off_reb', 'ts_pct', 'def_rtg', 'def_reb',
+                   'opp_tov_pct', 'pace', 'last10_pct',
+                   'wins', 'losses', 'games', 'mov_total', 'off_rtg_total', 'tov_pct_total', 'off_reb_total',
+                   'ts_pct_total', 'def_rtg_total', 'def_reb_total', 'opp_tov_pct_total', 'pace_total']
+    FEATURE_COUNT = 11
+
+    # Running means and the totals they are computed from, in feature order (see NbaTeam.update_features).
+    MEAN_FIELDS = ['mov', 'off_rtg', 'tov_pct', 'off_reb', 'ts_pct', 'def_rtg', 'def_reb', 'opp_tov_pct', 'pace']
+
+    PLAYER_FIELDS = ['games_played', 'bpm', 'bpm_total']
+
+    LAST_N_GAMES = 10
+
+    # Rolling windows (in games) of the MEAN_FIELDS per-game stats.
+    ROLLING_WINDOWS = (5, 10, 20)
+
+    # Half-lives (in games) of the exponentially weighted means of the MEAN_FIELDS per-game stats.
+    EWMA_HALF_LIVES = (5, 20)
+
+    def __init__(self, team_capacity: int = 32, player_capacity: int = 512):
+        """
+        Constructor for an empty league state.
+        :param team_capacity: Number of teams allocated up front.
+        :param player_capacity: Number of players allocated up front.
+        """
+        self.team_count = 0
+        self.team_names: list[str] = []
+        self.team_seasons: list[int] = []
+        self.team_values = np.zeros((team_capacity, len(self.TEAM_FIELDS)))
+        # Last n results as a ring buffer per team (1 for a win, 0 for a loss).
+        self.team_last_n = np.zeros((team_capacity, self.LAST_N_GAMES), dtype=np.int8)
+        self.team_last_n_start = np.zeros(team_capacity, dtype=np.int64)
+        self.team_last_n_length = np.zeros(team_capacity, dtype=np.int64)
+        self.rolling = RollingWindows(self.MEAN_FIELDS, self.ROLLING_WINDOWS, team_capacity)
+        self.ewma = ExponentialAverages(self.MEAN_FIELDS, self.EWMA_HALF_LIVES, team_capacity)
+
+        self.player_count = 0
+        self.player_names: list[str] = []
+        self.player_codes: list[str] = []
+        self.player_values = np.zeros((player_capacity, len(self.PLAYER_FIELDS)))
+
+    @staticmethod
+    def team_stats(team_log) -> list[float]:
+        """
+        Gets the stats of a team's game in the column order of apply_games.
+        :param team_log: Game Team Log (GameTeamLog object).
+        :return: total_points, offensive_rating, turnover_pct, offensive_rebounds, true_shooting_pct, defensive_rating,
+        defensive_rebounds, pace.
+        """
+        return [float(team_log.total_points), float(team_log.offensive_rating), float(team_log.turnover_pct),
+                float(team_log.offensive_rebounds), float(team_log.true_shooting_pct),
+                float(team_log.defensive_rating), float(team_log.defensive_rebounds), float(team_log.pace)]
+
+    def add_team(self, name: str, season: int) -> int:
+        """
+        Allocates a team row.
+        :param name: Team name.
+        :param season: Season year (2021-2022 is 2022).
+        :return: Team index.
+        """
+        if self.team_count == len(self.team_values):
+            capacity = max(1, 2 * self.team_count)
+            self.team_values = self.__grow(self.team_values, capacity)
+            self.team_last_n = self.__grow(self.team_last_n, capacity)
+            self.team_last_n_start = self.__grow(self.team_last_n_start, capacity)
+            self.team_last_n_length = self.__grow(self.team_last_n_length, capacity)
+            self.rolling.grow(capacity)
+            self.ewma.grow(capacity)
+
+        self.team_names.append(name)
+        self.team_seasons.append(season)
+        self.team_count += 1
+        return self.team_count - 1
+
+    def add_player(self, name: str, player_code: str) -> int:
+        """
+        Allocates a player row.
+        :param name: Player's name.
+        :param player_code: Player's unique code.
+        :return: Player index.
+        """
+        if self.player_count == len(self.player_values):
+            self.player_values = self.__grow(self.player_values, max(1, 2 * self.player_count))
+
+        self.player_names.append(name)
+        self.player_codes.append(player_code)
+        self.player_count += 1
+        return self.player_count - 1
+
+    def apply_games(self, team_indexes: np.ndarray, team_stats: np.ndarray, opp_stats: np.ndarray) -> None:
+        """
+        Updates several teams with one game each (e.g. a day's slate, home and away rows) in single array operations.
+        Gives the same state as calling NbaTeam.update_features for every row.
+        :param team_indexes: Team index of every row. A team may appear only once.
+        :param team_stats: Every row's team stats (total_points, then offensive_rating, turnover_pct,
+        offensive_rebounds, true_shooting_pct, defensive_rating, defensive_rebounds, pace).
+        :param opp_stats: Every row's opponent stats, same columns as team_stats.
+        :return: None
+        """
+        if len(np.unique(team_indexes)) != len(team_indexes):
+            raise ValueError("A team can only play one game per update.")
+
+        column = {field: i for i, field in enumerate(self.TEAM_FIELDS)}
+        values = self.team_values[team_indexes]
+
+        won = team_stats[:, 0] > opp_stats[:, 0]
+        values[:, column['games']] += 1
+        values[:, column['wins']] += won
+        values[:, column['losses']] += ~won
+        values[:, column['win_loss_pct']] = np.where(values[:, column['wins']] == 0, 0.0,
+                                                     values[:, column['wins']] / values[:, column['games']])
+
+        # Per-game values of MEAN_FIELDS: margin, the team's own stats, the opponent's turnover% and the team's pace.
+        game_values = np.column_stack([team_stats[:, 0] - opp_stats[:, 0], team_stats[:, 1:7], opp_stats[:, 2],
+                                       team_stats[:, 7]])
+        for i, field in enumerate(self.MEAN_FIELDS):
+            values[:, column[f'{field}_total']] += game_values[:, i]
+            values[:, column[field]] = values[:, column[f'{field}_total']] / values[:, column['games']]
+        self.rolling.push(team_indexes, game_values)
+        self.ewma.push(team_indexes, game_values)
+
+        # Push the results into the ring buffers, dropping the oldest result of full buffers.
+        starts = self.team_last_n_start[team_indexes]
+        lengths = self.team_last_n_length[team_indexes]
+        full = lengths == self.LAST_N_GAMES
+        self.team_last_n[team_indexes, (starts + lengths) % self.LAST_N_GAMES] = won
+        self.team_last_n_start[team_indexes] = np.where(full, (starts + 1) % self.LAST_N_GAMES, starts)
+        self.team_last_n_length[team_indexes] = np.where(full, lengths, lengths + 1)
+
+        last_n_wins = self.team_last_n[team_indexes].sum(axis=1, where=self.__last_n_mask(team_indexes))
+        values[:, column['last10_pct']] = np.where(last_n_wins == 0, 0.0,
+                                                   last_n_wins / self.team_last_n_length[team_indexes])
+
+        self.team_values[team_indexes] = values
+
+    def update_player_bpm(self, player_indexes: np.ndarray, bpms: np.ndarray) -> None:
+        """
+        Adds a game to several players at once (e.g. a game's roster). Gives the same state as calling
+        NbaPlayer.update_bpm for every player; players without a BPM (NaN) only count the game.
+        :param player_indexes: Player indexes.
+        :param bpms: Every player's box plus/minus for the game, NaN if missing.
+        :return: None
+        """
+        games_played, bpm, bpm_total = range(len(self.PLAYER_FIELDS))
+        np.add.at(self.player_values[:, games_played], player_indexes, 1)
+
+        has_bpm = ~np.isnan(bpms)
+        np.add.at(self.player_values[:, bpm_total], player_indexes[has_bpm], bpms[has_bpm])
+        updated = np.unique(player_indexes[has_bpm])
+        self.player_values[updated, bpm] = \
+            self.player_values[updated, bpm_total] / self.player_values[updated, games_played]
+
+    def __last_n_mask(self, team_indexes: np.ndarray) -> np.ndarray:
+        # Slots of the ring buffers that hold a result.
+        slots = np.arange(self.LAST_N_GAMES)
+        offsets = (slots[None, :] - self.team_last_n_start[team_indexes, None]) % self.LAST_N_GAMES
+        return offsets < self.team_last_n_length[team_indexes, None]
+
+    @staticmethod
+    def __grow(array: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
+
+
+class ArrayField:
+    """
+    Descriptor exposing one column of a LeagueState array as an attribute of a view object (which has `league` and
+    `index` slots).
+    """
+
+    def __init__(self, array_name: str, column: int):
+        """
+        :param array_name: Name of the LeagueState array (e.g. 'team_values').
+        :param column: Column of the field.
+        """
+        self.array_name = array_name
+        self.column = column
+
+    def __get__(self, view, owner=None):
+        if view is None:
+            return self
+        return float(getattr(view.league, self.array_name)[view.index, self.column])
+
+    def __set__(self, view, value) -> None:
+        getattr(view.league, self.array_name)[view.index, self.column] = value
+
+
+class LastNResults:
+    """
+    Deque-like view over a team's ring buffer of last n results ("W" or "L"), oldest first.
+    """
+
+    __slots__ = ('league', 'index')
+
+    def __init__(self, league: LeagueState, index: int):
+        self.league = league
+        self.index = index
+
+    @property
+    def maxlen(self) -> int:
+        return self.league.LAST_N_GAMES
+
+    def __len__(self) -> int:
+        return int(self.league.team_last_n_length[self.index])
+
+    def __iter__(self):
+        start = self.league.team_last_n_start[self.index]
+        for i in range(len(self)):
+            yield "W" if self.league.team_last_n[self.index, (start + i) % self.maxlen] else "L"
+
+    def append(self, result: str) -> None:
+        """
+        Adds a result, dropping the oldest one if the buffer is full (like a deque with maxlen).
+        :param result: "W" or "L".
+        :return: None
+        """
+        start = self.league.team_last_n_start[self.index]
+        length = len(self)
+        self.league.team_last_n[self.index, (start + length) % self.maxlen] = result == "W"
+        if length == self.maxlen:
+            self.league.team_last_n_start[self.index] = (start + 1) % self.maxlen
+        else:
+            self.league.team_last_n_length[self.index] = length + 1
+
+    def extend(self, results) -> None:
+        for result in results:
+            self.append(result)
+
+    def popleft(self) -> str:
+        """
+        Removes and returns the oldest result.
+        :return: "W" or "L".
+        """
+        length = len(self)
+        if length == 0:
+            raise IndexError("pop from an empty deque")
+        start = self.league.team_last_n_start[self.index]
+        result = "W" if self.league.team_last_n[self.index, start] else "L"
+        self.league.team_last_n_start[self.index] = (start + 1) % self.maxlen
+        self.league.team_last_n_length[self.index] = length - 1
+        return result
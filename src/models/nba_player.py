@@ -1,24 +1,38 @@
 from models.database import GamePlayerLog
+from models.league_state import LeagueState, ArrayField
 
 
 class NbaPlayer:
     """
     NBA Season Object.
+
+    The player's values live in a row of a LeagueState (shared by every player of a league, or private to this
+    player); this object is a view over that row.
     """
+    __slots__ = ('league', 'index')
+
+    games_played = ArrayField('player_values', LeagueState.PLAYER_FIELDS.index('games_played'))
+    bpm = ArrayField('player_values', LeagueState.PLAYER_FIELDS.index('bpm'))
+    bpm_total = ArrayField('player_values', LeagueState.PLAYER_FIELDS.index('bpm_total'))
 
-    def __init__(self, name: str, player_code: str):
+    def __init__(self, name: str, player_code: str, league: LeagueState = None):
         """
         Constructor for player object used for model training and prediction.
         :param name: Name of the self.
         :param player_code: Unique player code that identifies a self.
+        :param league: League state holding the player's values. Default is a state private to this player.
         """
-        self.player_name = name
-        self.player_code = player_code
+        self.league = league if league is not None else LeagueState(team_capacity=0, player_capacity=1)
+        self.index = self.league.add_player(name, player_code)
+
+    @property
+    def player_name(self) -> str:
+        return self.league.player_names[self.index]
+
+    @property
+    def player_code(self) -> str:
+        return self.league.player_codes[self.index]
 
-        self.games_played = 0.0
-        self.bpm = 0.0
-        self.bpm_total = 0.0
-    
     def update_bpm(self, player_log: GamePlayerLog) -> None:
         """
         For each player in the player logs, update their BPM.
@@ -30,3 +44,25 @@ class NbaPlayer:
         if bpm is not None:
             self.bpm_total += float(bpm)
             self.bpm = self.bpm_total / self.games_played
+
+    def to_state(self) -> dict:
+        """
+        Gets the player's state (BPM accumulators) as plain values.
+        :return: Dictionary of field to value.
+        """
+        return {'player_name': self.player_name, 'player_code': self.player_code,
+                'games_played': self.games_played, 'bpm': self.bpm, 'bpm_total': self.bpm_total}
+
+    @classmethod
+    def from_state(cls, state: dict, league: LeagueState = None) -> 'NbaPlayer':
+        """
+        Creates a player from a state returned by to_state.
+        :param state: Dictionary of field to value.
+        :param league: League state to hold the player's values. Default is a state private to this player.
+        :return: NbaPlayer object.
+        """
+        player = cls(state['player_name'], state['player_code'], league)
+        player.games_played = state['games_played']
+        player.bpm = state['bpm']
+        player.bpm_total = state['bpm_total']
+        return player
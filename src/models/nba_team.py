@@ -1,7 +1,8 @@
-from collections import deque
-
+import numpy as np
 from sqlalchemy.engine import Row
 
+from models.league_state import LeagueState, ArrayField, LastNResults
+
 
 class NbaTeam:
     """
@@ -11,50 +12,93 @@ class NbaTeam:
     per game and totals for the stat. Per game (labelled as the normal stat) is simply the cumulated total over
     the course of a season, divided by the number of games played. This may cause statistical differences
     compared to the basketball-reference data.
+
+    The team's values live in a row of a LeagueState (shared by every team of a league, or private to this team);
+    this object is a view over that row.
     """
-    def __init__(self, team: str, season: int):
+    __slots__ = ('league', 'index')
+
+    # Fields that make up the team's state (see to_state); features are derived from them.
+    STATE_FIELDS = ['team_name', 'season', 'win_loss_pct', 'mov', 'off_rtg', 'tov_pct', 'off_reb', 'ts_pct', 'def_rtg',
+                    'def_reb', 'opp_tov_pct', 'pace', 'wins', 'losses', 'games', 'mov_total', 'off_rtg_total',
+                    'tov_pct_total', 'off_reb_total', 'ts_pct_total', 'def_rtg_total', 'def_reb_total',
+                    'opp_tov_pct_total', 'pace_total', 'last10_pct']
+
+    # Features
+    win_loss_pct = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('win_loss_pct'))
+    mov = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('mov'))
+    off_rtg = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('off_rtg'))
+    tov_pct = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('tov_pct'))
+    off_reb = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('off_reb'))
+    ts_pct = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('ts_pct'))
+    def_rtg = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('def_rtg'))
+    def_reb = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('def_reb'))
+    opp_tov_pct = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('opp_tov_pct'))
+    pace = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('pace'))
+    last10_pct = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('last10_pct'))
+    # + Home Court Advantage
+
+    # Supplementary fields
+    wins = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('wins'))
+    losses = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('losses'))
+    games = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('games'))
+
+    mov_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('mov_total'))
+    off_rtg_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('off_rtg_total'))
+    tov_pct_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('tov_pct_total'))
+    off_reb_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('off_reb_total'))
+    ts_pct_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('ts_pct_total'))
+    def_rtg_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('def_rtg_total'))
+    def_reb_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('def_reb_total'))
+    opp_tov_pct_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('opp_tov_pct_total'))
+    pace_total = ArrayField('team_values', LeagueState.TEAM_FIELDS.index('pace_total'))
+
+    def __init__(self, team: str, season: int, league: LeagueState = None):
         """
         Constructor for team object used for model training and prediction.
         :param team: Team name.
         :param season: Year (2021-2022 is 2022).
+        :param league: League state holding the team's values. Default is a state private to this team.
+        """
+        self.league = league if league is not None else LeagueState(team_capacity=1, player_capacity=0)
+        self.index = self.league.add_team(team, season)
+
+    @property
+    def team_name(self) -> str:
+        return self.league.team_names[self.index]
+
+    @property
+    def season(self) -> int:
+        return self.league.team_seasons[self.index]
+
+    @property
+    def last10(self) -> LastNResults:
+        """
+        Last 10 results ("W" or "L"), oldest first, as a deque-like view.
+        """
+        return LastNResults(self.league, self.index)
+
+    @property
+    def features(self) -> list[float]:
+        """
+        Team's features (win_loss_pct, mov, off_rtg, tov_pct, off_reb, ts_pct, def_rtg, def_reb, opp_tov_pct, pace,
+        last10_pct).
         """
-        # Team Details
-        self.team_name = team
-        self.season = season
-
-        # Features
-        self.win_loss_pct = 0.0
-        self.mov = 0.0
-        self.off_rtg = 0.0
-        self.tov_pct = 0.0
-        self.off_reb = 0.0
-        self.ts_pct = 0.0
-        self.def_rtg = 0.0
-        self.def_reb = 0.0
-        self.opp_tov_pct = 0.0
-        self.pace = 0.0
-        # + Home Court Advantage
-
-        # Supplementary fields
-        self.wins = 0.0
-        self.losses = 0.0
-        self.games = 0.0
-
-        self.mov_total = 0.0
-        self.off_rtg_total = 0.0
-        self.tov_pct_total = 0.0
-        self.off_reb_total = 0.0
-        self.ts_pct_total = 0.0
-        self.def_rtg_total = 0.0
-        self.def_reb_total = 0.0
-        self.opp_tov_pct_total = 0.0
-        self.pace_total = 0.0
-
-        self.last10 = deque(maxlen=10)
-        self.last10_pct = self.calculate_last10()
-
-        self.features: list[float] = []
-        self.set_features()
+        return self.league.team_values[self.index, :LeagueState.FEATURE_COUNT].tolist()
+
+    @property
+    def rolling_features(self) -> list[float]:
+        """
+        Team's rolling means over the league's rolling windows (see RollingWindows.feature_names).
+        """
+        return self.league.rolling.means(np.array([self.index]))[0].tolist()
+
+    @property
+    def ewma_features(self) -> list[float]:
+        """
+        Team's exponentially weighted means over the league's half-lives (see ExponentialAverages.feature_names).
+        """
+        return self.league.ewma.means(np.array([self.index]))[0].tolist()
 
     def calculate_last10(self) -> float:
         """
@@ -87,75 +131,14 @@ class NbaTeam:
 
     def update_features(self, team_log: Row, opp_team_log: Row) -> None:
         """
-        Updates the team object's features with the team's stats for the game.
+        Updates the team object's features with the team's stats for the game (see LeagueState.apply_games).
         :param team_log: Game Team Log data row
         :param opp_team_log: Opposing team's Game Team Log data row
         :return: None
         """
-
-        self.games += 1
-
-        if float(team_log.GameTeamLog.total_points) > float(opp_team_log.GameTeamLog.total_points):
-            self.wins += 1
-            self.calculate_win_loss_pct()
-            self.update_last10("W")
-        else:
-            self.losses += 1
-            self.calculate_win_loss_pct()
-            self.update_last10("L")
-
-        margin_of_victory = team_log.GameTeamLog.total_points - opp_team_log.GameTeamLog.total_points
-        self.mov_total += margin_of_victory
-        self.mov = self.mov_total / self.games
-
-        self.off_rtg_total += float(team_log.GameTeamLog.offensive_rating)
-        self.off_rtg = self.off_rtg_total / self.games
-
-        self.tov_pct_total += float(team_log.GameTeamLog.turnover_pct)
-        self.tov_pct = self.tov_pct_total / self.games
-
-        self.off_reb_total += float(team_log.GameTeamLog.offensive_rebounds)
-        self.off_reb = self.off_reb_total / self.games
-
-        self.ts_pct_total += float(team_log.GameTeamLog.true_shooting_pct)
-        self.ts_pct = self.ts_pct_total / self.games
-
-        self.def_rtg_total += float(team_log.GameTeamLog.defensive_rating)
-        self.def_rtg = self.def_rtg_total / self.games
-
-        self.def_reb_total += float(team_log.GameTeamLog.defensive_rebounds)
-        self.def_reb = self.def_reb_total / self.games
-
-        self.opp_tov_pct_total += float(opp_team_log.GameTeamLog.turnover_pct)
-        self.opp_tov_pct = self.opp_tov_pct_total / self.games
-
-        self.pace_total += float(team_log.GameTeamLog.pace)
-        self.pace = self.pace_total / self.games
-
-        # Only need to recalculate because add_last10() was already called earlier
-        self.last10_pct = self.calculate_last10()
-
-        self.set_features()
-
-        print(f"{self.team_name} features updated.")
-
-    def set_features(self) -> None:
-        """
-        Updates the features array with the proper stats.
-        :return:
-        """
-        self.features.clear()
-        self.features.append(self.win_loss_pct)
-        self.features.append(self.mov)
-        self.features.append(self.off_rtg)
-        self.features.append(self.tov_pct)
-        self.features.append(self.off_reb)
-        self.features.append(self.ts_pct)
-        self.features.append(self.def_rtg)
-        self.features.append(self.def_reb)
-        self.features.append(self.opp_tov_pct)
-        self.features.append(self.pace)
-        self.features.append(self.last10_pct)
+        stats = np.array([LeagueState.team_stats(team_log.GameTeamLog),
+                          LeagueState.team_stats(opp_team_log.GameTeamLog)])
+        self.league.apply_games(np.array([self.index]), stats[:1], stats[1:])
 
     def update_last10(self, result: str) -> None:
         """
@@ -167,3 +150,32 @@ class NbaTeam:
             self.last10.popleft()
 
         self.last10.append(result)
+
+    def to_state(self) -> dict:
+        """
+        Gets the team's state (running totals, features, last 10 results, rolling window games and exponentially
+        weighted sums) as plain values.
+        :return: Dictionary of field to value.
+        """
+        state = {field: getattr(self, field) for field in self.STATE_FIELDS}
+        state['last10'] = list(self.last10)
+        state['rolling'] = self.league.rolling.to_state(self.index)
+        state['ewma'] = self.league.ewma.to_state(self.index)
+        return state
+
+    @classmethod
+    def from_state(cls, state: dict, league: LeagueState = None) -> 'NbaTeam':
+        """
+        Creates a team from a state returned by to_state.
+        :param state: Dictionary of field to value.
+        :param league: League state to hold the team's values. Default is a state private to this team.
+        :return: NbaTeam object.
+        """
+        team = cls(state['team_name'], state['season'], league)
+        # team_name and season are set by the constructor.
+        for field in cls.STATE_FIELDS[2:]:
+            setattr(team, field, state[field])
+        team.last10.extend(state['last10'])
+        team.league.rolling.from_state(team.index, state['rolling'])
+        team.league.ewma.from_state(team.index, state['ewma'])
+        return team
@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class PlayerRegistry:
+    """
+    Running box plus/minus of every player, in arrays indexed directly by player id.
+
+    A game's roster is averaged and updated with one gather and one scatter, giving the same values as the per-player
+    NbaPlayer.update_bpm path (players are tracked by id, so no player lookup is needed).
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Constructor for an empty registry.
+        :param capacity: Number of player ids allocated up front. Grows as needed.
+        """
+        self.games_played = np.zeros(capacity)
+        self.bpm_total = np.zeros(capacity)
+        self.bpm = np.zeros(capacity)
+
+    def average_bpm(self, player_ids: np.ndarray, bpms: np.ndarray) -> float:
+        """
+        Gets the average pre-game BPM of a team's players in a game, then adds the game to their BPM.
+        :param player_ids: Ids of the players that played (each player at most once).
+        :param bpms: Every player's box plus/minus for the game, NaN if missing.
+        :return: Average BPM of the players before the game, 0 if no player played.
+        """
+        if len(player_ids) == 0:
+            return 0
+
+        self.__reserve(int(player_ids.max()) + 1)
+        pre_game_bpm = self.bpm[player_ids].mean()
+
+        self.games_played[player_ids] += 1
+        has_bpm = ~np.isnan(bpms)
+        updated = player_ids[has_bpm]
+        self.bpm_total[updated] += bpms[has_bpm]
+        self.bpm[updated] = self.bpm_total[updated] / self.games_played[updated]
+
+        return float(pre_game_bpm)
+
+    def __reserve(self, size: int) -> None:
+        if size <= len(self.bpm):
+            return
+        capacity = max(size, 2 * len(self.bpm))
+        for name in ('games_played', 'bpm_total', 'bpm'):
+            grown = np.zeros(capacity)
+            grown[:len(self.bpm)] = getattr(self, name)
+            setattr(self, name, grown)
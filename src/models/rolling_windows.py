@@ -0,0 +1,95 @@
+import numpy as np
+
+
+class RollingWindows:
+    """
+    Rolling means of per-game stats over several windows (e.g. the last 5, 10 and 20 games) for every team.
+
+    Each window keeps the team's last values in a ring buffer next to their running sum. A game adds its values and
+    subtracts the values leaving the window, so an update costs the same whatever the window sizes.
+    """
+
+    def __init__(self, stats: list[str], windows: tuple[int, ...], capacity: int = 32):
+        """
+        Constructor for empty rolling windows.
+        :param stats: Names of the per-game stats, in column order.
+        :param windows: Window sizes in games.
+        :param capacity: Number of teams allocated up front.
+        """
+        self.stats = list(stats)
+        self.windows = tuple(windows)
+        self.games = np.zeros(capacity, dtype=np.int64)
+        self.buffers = [np.zeros((capacity, window, len(self.stats))) for window in self.windows]
+        self.sums = np.zeros((capacity, len(self.windows), len(self.stats)))
+
+    @property
+    def feature_names(self) -> list[str]:
+        """
+        Names of the rolling means returned by `means`, e.g. 'off_rtg_last5'.
+        """
+        return [f'{stat}_last{window}' for window in self.windows for stat in self.stats]
+
+    def grow(self, capacity: int) -> None:
+        """
+        Allocates room for more teams.
+        :param capacity: New number of teams.
+        :return: None
+        """
+        self.games = self.__grow(self.games, capacity)
+        self.buffers = [self.__grow(buffer, capacity) for buffer in self.buffers]
+        self.sums = self.__grow(self.sums, capacity)
+
+    def push(self, indexes: np.ndarray, values: np.ndarray) -> None:
+        """
+        Adds a game to several teams at once. A team may appear only once.
+        :param indexes: Team indexes.
+        :param values: Every team's per-game stats (one row per team, columns in stats order).
+        :return: None
+        """
+        games = self.games[indexes]
+        for i, window in enumerate(self.windows):
+            slots = games % window
+            # Full windows drop the value in the slot that is about to be overwritten (the oldest one).
+            leaving = np.where((games >= window)[:, None], self.buffers[i][indexes, slots], 0.0)
+            self.sums[indexes, i] += values - leaving
+            self.buffers[i][indexes, slots] = values
+        self.games[indexes] = games + 1
+
+    def means(self, indexes: np.ndarray) -> np.ndarray:
+        """
+        Gets the rolling means of teams (0 before a team's first game).
+        :param indexes: Team indexes.
+        :return: One row per team, columns in feature_names order.
+        """
+        counts = np.minimum(self.games[indexes, None], np.array(self.windows)[None, :])
+        means = np.divide(self.sums[indexes], counts[:, :, None], out=np.zeros_like(self.sums[indexes]),
+                          where=counts[:, :, None] > 0)
+        return means.reshape(len(indexes), -1)
+
+    def to_state(self, index: int) -> list[list[float]]:
+        """
+        Gets a team's recent values, oldest first (enough to fill the largest window).
+        :param index: Team index.
+        :return: List of per-game stats.
+        """
+        largest = int(np.argmax(self.windows))
+        window = self.windows[largest]
+        games = int(self.games[index])
+        slots = [game % window for game in range(max(0, games - window), games)]
+        return self.buffers[largest][index, slots].tolist()
+
+    def from_state(self, index: int, values: list[list[float]]) -> None:
+        """
+        Restores a team's recent values returned by to_state.
+        :param index: Team index.
+        :param values: List of per-game stats, oldest first.
+        :return: None
+        """
+        for game_values in values:
+            self.push(np.array([index]), np.array([game_values]))
+
+    @staticmethod
+    def __grow(array: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+        grown[:len(array)] = array
+        return grown
@@ -1,13 +1,15 @@
+from typing import Iterator
+
 from bs4 import BeautifulSoup, Comment
-from urllib.error import HTTPError
 import pandas as pd
-import requests
 from datetime import datetime
 
 from pandas import DataFrame
 
 from src.common.constants import MONTHS_ABBRV, CITY_NAME_TO_PROPER
-import time
+from src.scripts.async_fetcher import AsyncFetcher
+from src.scripts.box_score_parser import BoxScoreParser
+from src.scripts.response_cache import ResponseCache
 
 
 class Scraper:
@@ -21,12 +23,34 @@ class Scraper:
         Player Page: f"https://www.basketball-reference.com/players/{last_initial}/{player_code}.html"
     """
 
-    def __init__(self):
+    BASKETBALL_REFERENCE_URL = 'https://www.basketball-reference.com'
+    ODDS_URL = 'https://www.sportsbookreviewsonline.com'
+
+    # TODO: (#7) Add the summer months (july, aug, sept) to the months being scraped.
+    SEASON_MONTHS = ["october", "november", "december", "january", "february", "march", "april", "may", "june", "july"]
+
+    def __init__(self, max_concurrency: int = 4, requests_per_second: float = 1 / 3, burst: int = 1,
+                 batch_size: int = 32, base_url: str = BASKETBALL_REFERENCE_URL, odds_url: str = ODDS_URL,
+                 cache: ResponseCache = None, offline: bool = False):
+        """
+        Constructor for the scraper.
+        :param max_concurrency: Maximum number of requests in flight per host.
+        :param requests_per_second: Sustained request rate per host (basketball-reference allows ~20 per minute).
+        :param burst: Number of requests a host may receive back to back before the rate applies.
+        :param batch_size: Number of pages fetched together by the batch scrape methods.
+        :param base_url: Root url of basketball-reference. Can point to a local server serving saved pages.
+        :param odds_url: Root url of the odds archive.
+        :param cache: Optional on-disk response cache. Cached pages skip the network and the rate limit.
+        :param offline: Replay only from the cache and never touch the network. Requires a cache.
+        """
         # TODO: Consider upgrading Agent to an entire request header
         self.__USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) ' \
                             'Chrome/103.0.0.0 Safari/537.36'
-        self.__accessCounter = 0
-        self.__timeoutSeconds = 3
+        self.base_url = base_url
+        self.odds_url = odds_url
+        self.batch_size = batch_size
+        self.fetcher = AsyncFetcher(self.__USER_AGENT, max_concurrency, requests_per_second, burst,
+                                    cache=cache, offline=offline)
 
     def scrape_nba_seasons(self, seasons) -> None:
         """
@@ -39,60 +63,59 @@ class Scraper:
         for season in seasons:
             self.scrape_nba_season(season)
 
-    def scrape_nba_season(self, season: int) -> pd.DataFrame or None:
+    def scrape_nba_season(self, season: int, months: list[str] = None) -> pd.DataFrame or None:
         """
         Scrapes one NBA Season Schedule and returns a collection of schedules.
         :param season: NBA Season to scrape. Note: the 2021-2022 season would be season 2022.
+        :param months: Months of the schedule to scrape (e.g. ["march", "april"]). Default is the whole season.
         :return: Season schedule dataframe.
         """
 
         print(f"Beginning scrape for {season} season.")
-        # TODO: (#7) Add the summer months (july, aug, sept) to the months being scraped.
-        months = ["october", "november", "december", "january", "february", "march", "april", "may", "june", "july"]
-        # months = ["february"]
 
         # List of DataFrame, each df represents one month in the calendar
         schedule = []
 
-        for month in months:
-            # Open URL, request the html, and create BeautifulSoup object
-            try:
-                url = f"https://www.basketball-reference.com/leagues/NBA_{season}_games-{month}.html"
-                soup = self.send_request(url)
-
-                if soup is None:
-                    continue
-            except HTTPError as e:
-                print("An HTTPError occurred!")
-                print(e)
-                # TODO: (#8) Add exception handling to Scraper class
+        # All months are requested together; the fetcher keeps them under the host's request budget.
+        urls = [f"{self.base_url}/leagues/NBA_{season}_games-{month}.html" for month in months or self.SEASON_MONTHS]
+        soups = self.fetch_pages(urls)
+
+        for url in urls:
+            soup = soups[url]
+            if soup is None:
                 continue
-            else:
-                # Extract headers into a list. Expected headers:
-                # ['Date', 'Start (ET)', 'Visitor/Neutral', 'PTS', 'Home/Neutral', 'PTS', '\xa0', '\xa0', 'Attend.',
-                #  'Arena', 'Notes']
-                headers = [th.get_text() for th in soup.find_all('tr', limit=2)[0].find_all('th')]
 
-                # Extract the actual table.
-                table = soup.find_all('tr')[1:]
+            # Add the month's schedule to the final schedule.
+            schedule.append(self.parse_schedule_month(soup))
 
-                # From the table, we parse each row to get a list of "games" from that month.
-                # Note: Can't use List Comprehension because the 'date' column is under 'th' tag and not 'td'.
-                rows_data = self.parse_table_rows(table)
+        if not schedule:
+            print(f"Failed to scrape {season} schedule.")
+            return None
 
-                # Convert the table into a data frame.
-                rows_df = pd.DataFrame(rows_data, columns=headers)
+        # Concatenate all the months together into one single data frame.
+        final_schedule = pd.concat(schedule, ignore_index=True)
+        return final_schedule
 
-                # Add the month's schedule to the final schedule.
-                schedule.append(rows_df)
+    def parse_schedule_month(self, soup: BeautifulSoup) -> pd.DataFrame:
+        """
+        Parses one month of an NBA season schedule.
+        :param soup: Schedule page.
+        :return: The month's schedule dataframe.
+        """
+        # Extract headers into a list. Expected headers:
+        # ['Date', 'Start (ET)', 'Visitor/Neutral', 'PTS', 'Home/Neutral', 'PTS', '\xa0', '\xa0', 'Attend.',
+        #  'Arena', 'Notes']
+        headers = [th.get_text() for th in soup.find_all('tr', limit=2)[0].find_all('th')]
 
-        try:
-            # Concatenate all the months together into one single data frame.
-            final_schedule = pd.concat(schedule, ignore_index=True)
-            return final_schedule
-        except HTTPError:
-            print(f"Failed to scrape {season} schedule.")
-            return None
+        # Extract the actual table.
+        table = soup.find_all('tr')[1:]
+
+        # From the table, we parse each row to get a list of "games" from that month.
+        # Note: Can't use List Comprehension because the 'date' column is under 'th' tag and not 'td'.
+        rows_data = self.parse_table_rows(table)
+
+        # Convert the table into a data frame.
+        return pd.DataFrame(rows_data, columns=headers)
 
     def scrape_nba_game(self, game_code, url=None) -> tuple[DataFrame, DataFrame, DataFrame] | None:
         """
@@ -102,93 +125,127 @@ class Scraper:
         :return: List of game summary and box score data frames.
         """
 
-        try:
-            if url is None:
-                url = f'https://www.basketball-reference.com/boxscores/{game_code}.html'
+        if url is None:
+            url = f'{self.base_url}/boxscores/{game_code}.html'
 
-            soup = self.send_request(url)
+        page = self.fetch_texts([url])[url]
 
-            if soup is None:
-                print("Something went wrong, can't scrape game.")
-                return None
+        if page is None:
+            print("Something went wrong, can't scrape game.")
+            return None
+
+        return self.parse_nba_game(page)
+
+    def scrape_nba_games(self, game_codes: list[str]) \
+            -> Iterator[tuple[str, tuple[DataFrame, DataFrame, DataFrame] | None]]:
+        """
+        Scrapes many nba games, fetching `batch_size` box scores concurrently at a time.
+        :param game_codes: Unique game code strings for the website.
+        :return: Generator of (game code, game summary and box score data frames or None), in input order.
+        """
+        for i in range(0, len(game_codes), self.batch_size):
+            batch = game_codes[i:i + self.batch_size]
+            urls = [f'{self.base_url}/boxscores/{game_code}.html' for game_code in batch]
+            pages = self.fetch_texts(urls)
+
+            for game_code, url in zip(batch, urls):
+                if pages[url] is None:
+                    print(f"Something went wrong, can't scrape game {game_code}.")
+                    yield game_code, None
+                else:
+                    yield game_code, self.parse_nba_game(pages[url])
+
+    @staticmethod
+    def parse_nba_game(page: str) -> tuple[DataFrame, DataFrame, DataFrame]:
+        """
+        Parses a box score page into a collection of data frames from the game.
+        :param page: Box score page html.
+        :return: List of game summary and box score data frames.
+        """
+        return BoxScoreParser.parse(page)
+
+    def parse_nba_game_legacy(self, soup: BeautifulSoup) -> tuple[DataFrame, DataFrame, DataFrame]:
+        """
+        Parses a box score page with BeautifulSoup, finding tables by their position on the page. Cell values are
+        left as strings.
+
+        Superseded by `BoxScoreParser`; kept as the reference implementation for the parser benchmark and tests.
+        :param soup: Box score page.
+        :return: List of game summary and box score data frames.
+        """
+        comments = soup.find_all(string=lambda text: isinstance(text, Comment))
+        ls = -1  # index for line_score comment
+        ff = -1  # index for four_factors comment
+        for i in range(len(comments)):
+            if 'line_score' in comments[i]:
+                ls = i
+            elif 'four_factors' in comments[i]:
+                ff = i
+        comment_ls_soup = BeautifulSoup(comments[ls], 'lxml')
+        comment_ff_soup = BeautifulSoup(comments[ff], 'lxml')
+
+        ls_headers = [th.get_text() for th in comment_ls_soup.find('table').find_all('th')[1:-2]]
+        # ['\xa0', '1', '2', '3', '4', 'T'] Optional: OT
+        ff_headers = [th.get_text() for th in comment_ff_soup.find('table').find_all('th')[4:-2]]
+        # ['\xa0', 'Pace', 'eFG%', 'TOV%', 'ORB%', 'FT/FGA', 'ORtg']
+
+        # Change blank line score header to "Team"
+        ls_headers[0] = "Team"
+
+        line_score_table = comment_ls_soup.find('table').find_all('tr')[2:]
+        four_factors_table = comment_ff_soup.find('table').find_all('tr')[2:]
+
+        ls_rows = self.parse_table_rows(line_score_table)
+        ff_rows = self.parse_table_rows(four_factors_table, 1)
+
+        ls_df = pd.DataFrame(ls_rows, columns=ls_headers)
+        ff_df = pd.DataFrame(ff_rows, columns=ff_headers)
+        game_summary = pd.concat([ls_df, ff_df], axis=1)
+
+        # Scrape for Basic Box Score Stat Headers and Advanced Box Score Stat Headers and merge into one big
+        # header list.
+        box_headers_basic = [th.get_text() for th in soup.find('table').find_all('th')][2:23]
+        box_headers_basic[0] = 'Players'
+
+        # Changed adv headers to be statically set here, rather than dynamically scraped because Play-In Game's
+        # don't track BPM.
+        # TODO: (#8) Add dynamic handling for Play-In Games when scraping games
+
+        # if len(ls_headers) > 6:  # checking if there was OT need to make dynamic (e.g. 2OT, 3OT)
+        #     i = len(ls_headers) - 6
+        #     box_headers_adv = [th.get_text() for th in soup.find_all('table')[7 + i].find_all('th')][4:19]
+        # else:
+        #     box_headers_adv = [th.get_text() for th in soup.find_all('table')[7].find_all('th')][4:19]
+
+        box_headers_adv = ['TS%', 'eFG%', '3PAr', 'FTr', 'ORB%', 'DRB%', 'TRB%', 'AST%', 'STL%', 'BLK%', 'TOV%',
+                           'USG%', 'ORtg', 'DRtg', 'BPM']
+
+        # Add player code to basic box header.
+        box_headers_basic.insert(1, "Player Code")
 
-        except HTTPError as e:
-            print("Error occurred!")
-            print(e)
+        if len(ls_headers) > 6:
+            i = len(ls_headers) - 6
+            visitor_basic_table = soup.find_all('table')[0].find_all('tr')
+            visitor_adv_table = soup.find_all('table')[7 + i].find_all('tr')
+            home_basic_table = soup.find_all('table')[8 + i].find_all('tr')
+            home_adv_table = soup.find_all('table')[15 + (2 * i)].find_all('tr')
         else:
-            comments = soup.find_all(string=lambda text: isinstance(text, Comment))
-            ls = -1  # index for line_score comment
-            ff = -1  # index for four_factors comment
-            for i in range(len(comments)):
-                if 'line_score' in comments[i]:
-                    ls = i
-                elif 'four_factors' in comments[i]:
-                    ff = i
-            comment_ls_soup = BeautifulSoup(comments[ls], 'lxml')
-            comment_ff_soup = BeautifulSoup(comments[ff], 'lxml')
-
-            ls_headers = [th.get_text() for th in comment_ls_soup.find('table').find_all('th')[1:-2]]
-            # ['\xa0', '1', '2', '3', '4', 'T'] Optional: OT
-            ff_headers = [th.get_text() for th in comment_ff_soup.find('table').find_all('th')[4:-2]]
-            # ['\xa0', 'Pace', 'eFG%', 'TOV%', 'ORB%', 'FT/FGA', 'ORtg']
-
-            # Change blank line score header to "Team"
-            ls_headers[0] = "Team"
-
-            line_score_table = comment_ls_soup.find('table').find_all('tr')[2:]
-            four_factors_table = comment_ff_soup.find('table').find_all('tr')[2:]
-
-            ls_rows = self.parse_table_rows(line_score_table)
-            ff_rows = self.parse_table_rows(four_factors_table, 1)
-
-            ls_df = pd.DataFrame(ls_rows, columns=ls_headers)
-            ff_df = pd.DataFrame(ff_rows, columns=ff_headers)
-            game_summary = pd.concat([ls_df, ff_df], axis=1)
-
-            # Scrape for Basic Box Score Stat Headers and Advanced Box Score Stat Headers and merge into one big
-            # header list.
-            box_headers_basic = [th.get_text() for th in soup.find('table').find_all('th')][2:23]
-            box_headers_basic[0] = 'Players'
-
-            # Changed adv headers to be statically set here, rather than dynamically scraped because Play-In Game's
-            # don't track BPM.
-            # TODO: (#8) Add dynamic handling for Play-In Games when scraping games
-
-            # if len(ls_headers) > 6:  # checking if there was OT need to make dynamic (e.g. 2OT, 3OT)
-            #     i = len(ls_headers) - 6
-            #     box_headers_adv = [th.get_text() for th in soup.find_all('table')[7 + i].find_all('th')][4:19]
-            # else:
-            #     box_headers_adv = [th.get_text() for th in soup.find_all('table')[7].find_all('th')][4:19]
-
-            box_headers_adv = ['TS%', 'eFG%', '3PAr', 'FTr', 'ORB%', 'DRB%', 'TRB%', 'AST%', 'STL%', 'BLK%', 'TOV%',
-                               'USG%', 'ORtg', 'DRtg', 'BPM']
-
-            # Add player code to basic box header.
-            box_headers_basic.insert(1, "Player Code")
-
-            if len(ls_headers) > 6:
-                i = len(ls_headers) - 6
-                visitor_basic_table = soup.find_all('table')[0].find_all('tr')
-                visitor_adv_table = soup.find_all('table')[7 + i].find_all('tr')
-                home_basic_table = soup.find_all('table')[8 + i].find_all('tr')
-                home_adv_table = soup.find_all('table')[15 + (2 * i)].find_all('tr')
-            else:
-                visitor_basic_table = soup.find_all('table')[0].find_all('tr')
-                visitor_adv_table = soup.find_all('table')[7].find_all('tr')
-                home_basic_table = soup.find_all('table')[8].find_all('tr')
-                home_adv_table = soup.find_all('table')[15].find_all('tr')
+            visitor_basic_table = soup.find_all('table')[0].find_all('tr')
+            visitor_adv_table = soup.find_all('table')[7].find_all('tr')
+            home_basic_table = soup.find_all('table')[8].find_all('tr')
+            home_adv_table = soup.find_all('table')[15].find_all('tr')
 
-            # Scrape the values in each row for the visitor team in both Basic and Advanced Box Scores.
-            v_rows_basic, v_rows_adv = self.__parse_box_scores(visitor_basic_table, visitor_adv_table)
-            v_box_score = self.generate_boxscore_dataframes(box_headers_basic, v_rows_basic,
-                                                            box_headers_adv, v_rows_adv)
+        # Scrape the values in each row for the visitor team in both Basic and Advanced Box Scores.
+        v_rows_basic, v_rows_adv = self.__parse_box_scores(visitor_basic_table, visitor_adv_table)
+        v_box_score = self.generate_boxscore_dataframes(box_headers_basic, v_rows_basic,
+                                                        box_headers_adv, v_rows_adv)
 
-            # Scrape the values in each row for the home team in both Basic and Advanced Box Scores.
-            h_rows_basic, h_rows_adv = self.__parse_box_scores(home_basic_table, home_adv_table)
-            h_box_score = self.generate_boxscore_dataframes(box_headers_basic, h_rows_basic,
-                                                            box_headers_adv, h_rows_adv)
+        # Scrape the values in each row for the home team in both Basic and Advanced Box Scores.
+        h_rows_basic, h_rows_adv = self.__parse_box_scores(home_basic_table, home_adv_table)
+        h_box_score = self.generate_boxscore_dataframes(box_headers_basic, h_rows_basic,
+                                                        box_headers_adv, h_rows_adv)
 
-            return game_summary, h_box_score, v_box_score
+        return game_summary, h_box_score, v_box_score
 
     def scrape_nba_team(self, team, season, html_file=None) -> list[pd.DataFrame]:
         """
@@ -208,50 +265,80 @@ class Scraper:
         :param url: Specific url of player to scrape. Default is None If specified, ignores player_code input.
         :return: Player stats dataframe.
         """
-        last_initial = player_code[0]
         if url is None:
-            url = f'https://www.basketball-reference.com/players/{last_initial}/{player_code}.html'
+            url = self.get_player_url(player_code)
 
-        try:
-            soup = self.send_request(url)
+        soup = self.send_request(url)
 
-            if soup is None:
-                print("This guy isn't important enough to scrape.")
-                return None
+        if soup is None:
+            print("This guy isn't important enough to scrape.")
+            return None
 
-        except HTTPError as e:
-            print("Error occurred!")
-            print(e)
-        else:
-            pg_stats = soup.find(id='per_game')
+        return self.parse_nba_player(soup)
+
+    def scrape_nba_players(self, player_codes: list[str]) -> Iterator[tuple[str, pd.DataFrame | None]]:
+        """
+        Scrapes many NBA Players, fetching `batch_size` player pages concurrently at a time.
+        :param player_codes: Unique player codes used to find their stats pages.
+        :return: Generator of (player code, player stats dataframe or None), in input order.
+        """
+        for i in range(0, len(player_codes), self.batch_size):
+            batch = player_codes[i:i + self.batch_size]
+            urls = [self.get_player_url(player_code) for player_code in batch]
+            soups = self.fetch_pages(urls)
+
+            for player_code, url in zip(batch, urls):
+                if soups[url] is None:
+                    print("This guy isn't important enough to scrape.")
+                    yield player_code, None
+                else:
+                    yield player_code, self.parse_nba_player(soups[url])
 
-            if pg_stats is None:
-                print("This guy isn't important enough to scrape.")
-                return None
+    def get_player_url(self, player_code: str) -> str:
+        """
+        Gets the url of a player's stats page.
+        :param player_code: Unique player code.
+        :return: Player page url.
+        """
+        last_initial = player_code[0]
+        return f'{self.base_url}/players/{last_initial}/{player_code}.html'
+
+    @staticmethod
+    def parse_nba_player(soup: BeautifulSoup) -> pd.DataFrame | None:
+        """
+        Parses a player page into the player's per game stats.
+        :param soup: Player page.
+        :return: Player stats dataframe.
+        """
+        pg_stats = soup.find(id='per_game')
+
+        if pg_stats is None:
+            print("This guy isn't important enough to scrape.")
+            return None
 
-            # for other functions.
-            pgstats_headers = [th.get_text() for th in pg_stats.find('tr').find_all('th')]
-            # ['Season', 'Age', 'Tm', 'Lg', 'Pos', 'G', 'GS', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%', '2P', '2PA', 
-            # '2P%', 'eFG%', 'FT', 'FTA', 'FT%', 'ORB','DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
+        # for other functions.
+        pgstats_headers = [th.get_text() for th in pg_stats.find('tr').find_all('th')]
+        # ['Season', 'Age', 'Tm', 'Lg', 'Pos', 'G', 'GS', 'MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%', '2P', '2PA', 
+        # '2P%', 'eFG%', 'FT', 'FTA', 'FT%', 'ORB','DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
 
-            pgstats_table = pg_stats.find_all('tr')[1:]
-            pgstats_rows = []
+        pgstats_table = pg_stats.find_all('tr')[1:]
+        pgstats_rows = []
 
-            for i in range(len(pgstats_table)):
-                try:
-                    number = pgstats_table[i].find('th').get_text()
-                    data = [td.get_text() for td in pgstats_table[i].find_all('td')]
-                    data.insert(0, number)
-                except AttributeError:
-                    # for DNP seasons
-                    data = [td.get_text() for td in pgstats_table[i].find_all('td')]
-                    dnp = ['DNP'] * 27
-                    data = data + dnp
-                pgstats_rows.append(data)
+        for i in range(len(pgstats_table)):
+            try:
+                number = pgstats_table[i].find('th').get_text()
+                data = [td.get_text() for td in pgstats_table[i].find_all('td')]
+                data.insert(0, number)
+            except AttributeError:
+                # for DNP seasons
+                data = [td.get_text() for td in pgstats_table[i].find_all('td')]
+                dnp = ['DNP'] * 27
+                data = data + dnp
+            pgstats_rows.append(data)
 
-            pg_stats_df = pd.DataFrame(pgstats_rows, columns=pgstats_headers)
+        pg_stats_df = pd.DataFrame(pgstats_rows, columns=pgstats_headers)
 
-            return pg_stats_df
+        return pg_stats_df
 
     def scrape_odds_data(self, year: int, url=None) -> pd.DataFrame | None:
         # Ensure the input is an integer
@@ -264,54 +351,84 @@ class Scraper:
         year_string = f"{year - 1}-{str(year)[2:]}"
 
         if url is None:
-            url = f"https://www.sportsbookreviewsonline.com/scoresoddsarchives/nba-odds-{year_string}/"
+            url = f"{self.odds_url}/scoresoddsarchives/nba-odds-{year_string}/"
 
-        try:
-            soup = self.send_request(url)
+        soup = self.send_request(url)
 
-            if soup is None:
-                print("Something went wrong, can't scrape game's odds data.")
-                return None
+        if soup is None:
+            print("Something went wrong, can't scrape game's odds data.")
+            return None
 
-        except HTTPError as e:
-            print("Error occurred!")
-            print(e)
-        else:
-            # headers = [td.get_text() for td in soup.find_all('tr', limit=2)[0] if td != '\n']
-            headers = ['Date', 'Visitor_Team', 'Home_Team', 'Closing Odds']
-            table = [[td.get_text() for td in tr if td != '\n'] for tr in soup.find_all('tr')[1:]]
-            data = []
-            for i in range(0, len(table), 2):
-                date = self.odds_to_postgres_date(table[i][0], year)
-                visitor_team = CITY_NAME_TO_PROPER[table[i][3]]
-                home_team = CITY_NAME_TO_PROPER[table[i+1][3]]
-                odds_v = self.convert_to_float_or_zero(table[i][10])
-                odds_h = self.convert_to_float_or_zero(table[i + 1][10])
-
-                if odds_v < odds_h:
-                    odds = float(odds_v)
-                else:
-                    odds = -abs(float(odds_h))
+        return self.parse_odds_data(soup, year)
+
+    def parse_odds_data(self, soup: BeautifulSoup, year: int) -> pd.DataFrame:
+        """
+        Parses a season's odds archive page.
+        :param soup: Odds archive page.
+        :param year: Season year (2021-2022 is 2022).
+        :return: Odds dataframe.
+        """
+        # headers = [td.get_text() for td in soup.find_all('tr', limit=2)[0] if td != '\n']
+        headers = ['Date', 'Visitor_Team', 'Home_Team', 'Closing Odds']
+        table = [[td.get_text() for td in tr if td != '\n'] for tr in soup.find_all('tr')[1:]]
+        data = []
+        for i in range(0, len(table), 2):
+            date = self.odds_to_postgres_date(table[i][0], year)
+            visitor_team = CITY_NAME_TO_PROPER[table[i][3]]
+            home_team = CITY_NAME_TO_PROPER[table[i+1][3]]
+            odds_v = self.convert_to_float_or_zero(table[i][10])
+            odds_h = self.convert_to_float_or_zero(table[i + 1][10])
+
+            if odds_v < odds_h:
+                odds = float(odds_v)
+            else:
+                odds = -abs(float(odds_h))
 
-                data.append([date, visitor_team, home_team, odds])
+            data.append([date, visitor_team, home_team, odds])
 
-            odds_df = pd.DataFrame(data, columns=headers)
+        odds_df = pd.DataFrame(data, columns=headers)
 
-            return odds_df
+        return odds_df
 
     # HELPER FUNCTIONS
 
     def send_request(self, url) -> BeautifulSoup or None:
-        time.sleep(self.__timeoutSeconds)
-        html = requests.get(url, headers={'User-Agent': self.__USER_AGENT})
-        self.__accessCounter += 1
-        print("count: " + str(self.__accessCounter) + " url: " + url)
+        return self.fetch_pages([url])[url]
 
-        if html.status_code == 404:
-            print("The month or season does not exist.")
-            return None
+    def fetch_pages(self, urls: list[str]) -> dict[str, BeautifulSoup | None]:
+        """
+        Fetches pages concurrently, keeping each host under its request budget.
+        :param urls: Urls to fetch.
+        :return: Dictionary of url to BeautifulSoup object, or None if the page does not exist or can't be fetched.
+        """
+        return {url: None if text is None else BeautifulSoup(text, 'lxml')
+                for url, text in self.fetch_texts(urls).items()}
+
+    def fetch_texts(self, urls: list[str]) -> dict[str, str | None]:
+        """
+        Fetches pages concurrently, keeping each host under its request budget.
+        :param urls: Urls to fetch.
+        :return: Dictionary of url to page html, or None if the page does not exist or can't be fetched (any status
+        other than 200, e.g. 429 when rate limited or a 5xx server error).
+        """
+        pages = {}
+        for url, response in self.fetcher.fetch_all(urls).items():
+            if response is None:
+                pages[url] = None
+                continue
+
+            status_code, text = response
+            if status_code == 404:
+                print(f"The month or season does not exist. url: {url}")
+                pages[url] = None
+                continue
+            if status_code != 200:
+                print(f"Failed to fetch page (status {status_code}). url: {url}")
+                pages[url] = None
+                continue
 
-        return BeautifulSoup(html.text, 'lxml')
+            pages[url] = text
+        return pages
 
     @staticmethod
     def convert_to_float_or_zero(s: str) -> float:
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from src.scripts.response_cache import ResponseCache
+
+
+class TokenBucket:
+    """
+    Token bucket used to keep requests to a single host under a request budget.
+
+    The bucket starts full, refills at `rate` tokens per second and never holds more than `capacity` tokens, so a
+    host sees at most `capacity` requests in a burst and `rate` requests per second on average.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Constructor for the token bucket.
+        :param rate: Tokens added per second.
+        :param capacity: Maximum number of tokens the bucket can hold.
+        """
+        if rate <= 0 or capacity < 1:
+            raise ValueError("Token bucket rate must be positive and capacity at least 1.")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def refill(self) -> None:
+        """
+        Adds the tokens accrued since the last refill.
+        :return: None
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """
+        Waits until a token is available and takes it.
+        :return: None
+        """
+        while True:
+            self.refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """
+    Fetches pages concurrently while keeping every host under its own request budget.
+
+    Each host gets a token bucket (shared across calls, so sequential fetches are still rate limited) and a bound on
+    the number of requests in flight. The blocking `requests.get` calls run in worker threads. With a cache, cached
+    pages are served without spending a token, and offline mode never touches the network.
+    """
+
+    def __init__(self, user_agent: str, max_concurrency: int = 4, requests_per_second: float = 1 / 3,
+                 burst: int = 1, host_rates: dict[str, float] = None, timeout_seconds: float = 30,
+                 cache: ResponseCache = None, offline: bool = False):
+        """
+        Constructor for the fetcher.
+        :param user_agent: User-Agent header sent with every request.
+        :param max_concurrency: Maximum number of requests in flight per host.
+        :param requests_per_second: Default sustained request rate per host.
+        :param burst: Number of requests a host may receive back to back before the rate applies.
+        :param host_rates: Optional per-host overrides of `requests_per_second` (e.g. {'example.com': 2.0}).
+        :param timeout_seconds: Timeout for a single request.
+        :param cache: Optional on-disk response cache.
+        :param offline: Serve pages only from the cache (ignoring their ttl) and never touch the network.
+        """
+        if offline and cache is None:
+            raise ValueError("Offline mode requires a response cache.")
+
+        self.user_agent = user_agent
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.host_rates = host_rates or {}
+        self.timeout_seconds = timeout_seconds
+        self.cache = cache
+        self.offline = offline
+        self.request_count = 0
+
+        self.__buckets: dict[str, TokenBucket] = {}
+
+    def fetch_all(self, urls: list[str]) -> dict[str, tuple[int, str] | None]:
+        """
+        Fetches every url and blocks until all of them are done.
+        :param urls: Urls to fetch. Duplicates are fetched once.
+        :return: Dictionary of url to (status code, body), or None if the request failed.
+        """
+        return asyncio.run(self.fetch_all_async(urls))
+
+    async def fetch_all_async(self, urls: list[str]) -> dict[str, tuple[int, str] | None]:
+        """
+        Coroutine version of `fetch_all`, for callers that already run an event loop.
+        :param urls: Urls to fetch. Duplicates are fetched once.
+        :return: Dictionary of url to (status code, body), or None if the request failed.
+        """
+        unique_urls = list(dict.fromkeys(urls))
+
+        # Semaphores are bound to the running event loop, so they are created per call.
+        semaphores: dict[str, asyncio.Semaphore] = {}
+        for url in unique_urls:
+            host = urlsplit(url).netloc
+            if host not in semaphores:
+                semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+
+        responses = await asyncio.gather(*[self.__fetch(url, semaphores[urlsplit(url).netloc])
+                                           for url in unique_urls])
+        return dict(zip(unique_urls, responses))
+
+    async def __fetch(self, url: str, semaphore: asyncio.Semaphore) -> tuple[int, str] | None:
+        if self.cache is not None:
+            body = self.cache.get(url, ignore_ttl=self.offline)
+            if body is not None:
+                return 200, body
+
+        if self.offline:
+            print(f"Offline: {url} is not cached.")
+            return None
+
+        async with semaphore:
+            await self.get_bucket(urlsplit(url).netloc).acquire()
+            try:
+                html = await asyncio.to_thread(requests.get, url, headers={'User-Agent': self.user_agent},
+                                               timeout=self.timeout_seconds)
+            except requests.RequestException as e:
+                print(f"Request failed for {url}")
+                print(e)
+                return None
+
+        self.request_count += 1
+        print("count: " + str(self.request_count) + " url: " + url)
+
+        # Only successful pages are cached, so missing pages (e.g. games not played yet) are retried next run.
+        if self.cache is not None and html.status_code == 200:
+            self.cache.put(url, html.text)
+        return html.status_code, html.text
+
+    def get_bucket(self, host: str) -> TokenBucket:
+        """
+        Gets the token bucket of a host, creating it on first use.
+        :param host: Host name (with port, if any).
+        :return: TokenBucket for the host.
+        """
+        bucket = self.__buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.host_rates.get(host, self.requests_per_second), self.burst)
+            self.__buckets[host] = bucket
+        return bucket
@@ -0,0 +1,56 @@
+"""
+Parse-only benchmark of the box score parsers over saved box score pages.
+
+Usage (from the repository root):
+    python -m src.scripts.benchmark_box_score_parser [directory of saved box score pages] [repetitions]
+"""
+import os
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+from src.scripts.Scraper import Scraper
+from src.scripts.box_score_parser import BoxScoreParser
+
+DEFAULT_PAGE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'data', 'boxscores')
+
+
+def cpu_seconds_per_game(parse, pages: list[str], repetitions: int) -> float:
+    """
+    Measures the CPU time a parser spends per box score page.
+    :param parse: Function that parses one page.
+    :param pages: Box score page html.
+    :param repetitions: Number of passes over the pages.
+    :return: CPU seconds per page.
+    """
+    start = time.process_time()
+    for _ in range(repetitions):
+        for page in pages:
+            parse(page)
+    return (time.process_time() - start) / (repetitions * len(pages))
+
+
+def main():
+    page_dir = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PAGE_DIR
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    pages = []
+    for file_name in sorted(os.listdir(page_dir)):
+        if file_name.endswith('.html'):
+            with open(os.path.join(page_dir, file_name)) as f:
+                pages.append(f.read())
+
+    scraper = Scraper()
+    legacy = cpu_seconds_per_game(lambda page: scraper.parse_nba_game_legacy(BeautifulSoup(page, 'lxml')),
+                                  pages, repetitions)
+    single_pass = cpu_seconds_per_game(BoxScoreParser.parse, pages, repetitions)
+
+    print(f"Pages: {len(pages)} | Repetitions: {repetitions}")
+    print(f"BeautifulSoup parser: {legacy * 1000:.2f} ms CPU per game")
+    print(f"Single-pass parser:   {single_pass * 1000:.2f} ms CPU per game")
+    print(f"Speedup: {legacy / single_pass:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Insert benchmark of the game log ingest paths on a synthetic multi-season load (saved box scores repeated over
+1230-game seasons) in a SQLite database.
+
+Usage (from the repository root):
+    PYTHONPATH=src python -m src.scripts.benchmark_game_log_ingest [seasons] [games per commit]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from models.database import Game, Team, GamePlayerLog
+from scripts.Scraper import Scraper
+from scripts.box_score_parser import BoxScoreParser
+from service.database_service import DatabaseService
+
+PAGE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'test', 'data', 'boxscores')
+GAMES_PER_SEASON = 1230
+
+
+def create_service(path: str, seasons: int) -> tuple[DatabaseService, list[Game], list[Team]]:
+    """
+    Creates a database with two teams and the synthetic seasons' games.
+    :param path: SQLite database file.
+    :param seasons: Number of seasons.
+    :return: DatabaseService, games, teams
+    """
+    engine = create_engine(f'sqlite:///{path}')
+    db_service = DatabaseService(Session(engine), Scraper(), engine)
+    db_service.initialize_database()
+
+    teams = [Team(name='Home'), Team(name='Away')]
+    db_service.session.add_all(teams)
+    db_service.session.flush()
+    db_service.session.execute(insert(Game), [{'game_code': str(i), 'home_team_id': teams[0].id,
+                                               'away_team_id': teams[1].id}
+                                              for i in range(seasons * GAMES_PER_SEASON)])
+    db_service.session.commit()
+    return db_service, db_service.session.query(Game).order_by(Game.id).all(), teams
+
+
+def orm_ingest(db_service: DatabaseService, game: Game, teams: list[Team], box_scores: tuple) -> None:
+    game_summary, home_box, away_box = box_scores
+    db_service.add_game_team_log(game, teams[0], game_summary.iloc[1], home_box.iloc[-1])
+    db_service.add_game_player_logs(game, teams[0], home_box)
+    db_service.add_game_team_log(game, teams[1], game_summary.iloc[0], away_box.iloc[-1])
+    db_service.add_game_player_logs(game, teams[1], away_box)
+
+
+def bulk_ingest(db_service: DatabaseService, game: Game, teams: list[Team], box_scores: tuple) -> None:
+    game_summary, home_box, away_box = box_scores
+    db_service.queue_game_logs(game, teams[0], game_summary.iloc[1], home_box)
+    db_service.queue_game_logs(game, teams[1], game_summary.iloc[0], away_box)
+
+
+def rows_per_second(ingest, seasons: int, chunk_size: int, box_scores: list[tuple]) -> float:
+    """
+    Ingests every synthetic game with an ingest path, committing every `chunk_size` games.
+    :param ingest: Function that adds one game's logs.
+    :param seasons: Number of seasons.
+    :param chunk_size: Number of games per commit.
+    :param box_scores: Parsed box scores, repeated over the games.
+    :return: Game log rows (team and player) inserted per second.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        db_service, games, teams = create_service(os.path.join(directory, 'benchmark.db'), seasons)
+
+        start = time.perf_counter()
+        for i, game in enumerate(games):
+            ingest(db_service, game, teams, box_scores[i % len(box_scores)])
+            if (i + 1) % chunk_size == 0:
+                db_service.flush_game_logs()
+                db_service.session.commit()
+        db_service.flush_game_logs()
+        db_service.session.commit()
+        elapsed = time.perf_counter() - start
+
+        rows = 2 * len(games) + db_service.session.query(GamePlayerLog).count()
+        db_service.session.close()
+        return rows / elapsed
+
+
+def main():
+    seasons = int(sys.argv[1]) if len(sys.argv) > 1 else 2
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    box_scores = []
+    for file_name in sorted(os.listdir(PAGE_DIR)):
+        if file_name.endswith('.html'):
+            with open(os.path.join(PAGE_DIR, file_name)) as f:
+                box_scores.append(BoxScoreParser.parse(f.read()))
+
+    orm = rows_per_second(orm_ingest, seasons, chunk_size, box_scores)
+    bulk = rows_per_second(bulk_ingest, seasons, chunk_size, box_scores)
+
+    print(f"Seasons: {seasons} | Games: {seasons * GAMES_PER_SEASON} | Games per commit: {chunk_size}")
+    print(f"ORM unit of work: {orm:,.0f} rows/sec")
+    print(f"Bulk insert:      {bulk:,.0f} rows/sec")
+    print(f"Speedup: {bulk / orm:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
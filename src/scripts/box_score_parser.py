@@ -0,0 +1,168 @@
+import re
+
+import pandas as pd
+from lxml import etree, html
+from pandas import DataFrame
+
+
+class BoxScoreParser:
+    """
+    Single-pass parser for basketball-reference box score pages.
+
+    The page is parsed once with lxml and its tables and comments are walked once. basketball-reference ships the line
+    score and four factors tables inside HTML comments, so comments that contain a table are parsed on the spot. Tables
+    are located by their element ids (e.g. `line_score`, `box-BOS-game-basic`) instead of their position on the page,
+    so overtime periods do not shift anything. Cell values are converted to int/float as the rows are built.
+    """
+
+    TABLE_ID_PATTERN = re.compile(r'^(line_score|four_factors|box-[A-Z]{3}-game-(basic|advanced))$')
+    NUMBER_PATTERN = re.compile(r'^[+-]?(\d+\.?\d*|\.\d+)$')
+
+    # Columns that are kept as strings.
+    TEXT_COLUMNS = {'Team', 'Players', 'Player Code', 'MP'}
+
+    # Statically set because Play-In Games don't track BPM.
+    # TODO: (#8) Add dynamic handling for Play-In Games when scraping games
+    ADVANCED_HEADERS = ['TS%', 'eFG%', '3PAr', 'FTr', 'ORB%', 'DRB%', 'TRB%', 'AST%', 'STL%', 'BLK%', 'TOV%',
+                        'USG%', 'ORtg', 'DRtg', 'BPM']
+
+    # 'Players', 'Player Code' and the 20 basic box score stats (MP to +/-).
+    BASIC_COLUMN_COUNT = 22
+
+    @classmethod
+    def parse(cls, page: str | bytes) -> tuple[DataFrame, DataFrame, DataFrame]:
+        """
+        Parses a box score page.
+        :param page: Box score page html.
+        :return: game summary (line score and four factors, visitor first), home box score, visitor box score.
+        """
+        tables = cls.find_tables(html.fromstring(page))
+
+        ls_headers, ls_rows = cls.__parse_summary_table(tables['line_score'], True)
+        ff_headers, ff_rows = cls.__parse_summary_table(tables['four_factors'], False)
+
+        # Change blank line score header to "Team"
+        ls_headers[0] = 'Team'
+        summary_headers = ls_headers + ff_headers
+        summary_rows = [cls.__convert_row(summary_headers, ls_row + ff_row) for ls_row, ff_row in zip(ls_rows, ff_rows)]
+        game_summary = pd.DataFrame(summary_rows, columns=summary_headers, dtype=object)
+
+        visitor_abbr, home_abbr = ls_rows[0][0], ls_rows[1][0]
+        v_box_score = cls.__parse_box_score(tables[f'box-{visitor_abbr}-game-basic'],
+                                            tables[f'box-{visitor_abbr}-game-advanced'])
+        h_box_score = cls.__parse_box_score(tables[f'box-{home_abbr}-game-basic'],
+                                            tables[f'box-{home_abbr}-game-advanced'])
+
+        return game_summary, h_box_score, v_box_score
+
+    @classmethod
+    def find_tables(cls, root: html.HtmlElement) -> dict[str, html.HtmlElement]:
+        """
+        Walks the document once and collects the tables needed for a box score, including commented-out tables.
+        :param root: Parsed page.
+        :return: Dictionary of table id to table element.
+        """
+        tables = {}
+        for element in root.iter('table', etree.Comment):
+            if element.tag is etree.Comment:
+                text = element.text
+                if not text or '<table' not in text:
+                    continue
+                for table in html.fragment_fromstring(text, create_parent='div').iter('table'):
+                    if cls.TABLE_ID_PATTERN.match(table.get('id', '')):
+                        tables[table.get('id')] = table
+            elif cls.TABLE_ID_PATTERN.match(element.get('id', '')):
+                tables[element.get('id')] = element
+        return tables
+
+    @staticmethod
+    def __parse_summary_table(table: html.HtmlElement, with_row_header: bool) -> tuple[list[str], list[list[str]]]:
+        """
+        Parses the line score or four factors table.
+        :param table: Table element.
+        :param with_row_header: Keep the team column (the row's th cell).
+        :return: headers, rows
+        """
+        header_row = table.find('thead').findall('tr')[-1]
+        headers = [cell.text_content() for cell in header_row]
+        if not with_row_header:
+            headers = headers[1:]
+
+        rows = []
+        for tr in table.find('tbody').iter('tr'):
+            cells = [cell.text_content() for cell in tr]
+            rows.append(cells if with_row_header else cells[1:])
+        return headers, rows
+
+    @classmethod
+    def __parse_box_score(cls, basic_table: html.HtmlElement, adv_table: html.HtmlElement) -> DataFrame:
+        """
+        Parses a team's basic and advanced box score tables into one box score dataframe (players and team totals).
+        :param basic_table: Team's basic box score table.
+        :param adv_table: Team's advanced box score table.
+        :return: Box score dataframe.
+        """
+        header_row = basic_table.find('thead').findall('tr')[-1]
+        basic_headers = [cell.text_content() for cell in header_row][:cls.BASIC_COLUMN_COUNT - 1]
+        basic_headers[0] = 'Players'
+        basic_headers.insert(1, 'Player Code')
+        headers = basic_headers + cls.ADVANCED_HEADERS
+
+        adv_rows = cls.__body_rows(adv_table)
+        rows = []
+        for tr, adv_tr in zip(cls.__body_rows(basic_table), adv_rows):
+            player_cell = tr[0]
+            player = player_cell.text_content()
+
+            # Get Player Code
+            player_code = ''
+            link = player_cell.find('a')
+            if link is not None:
+                player_code = link.get('href').split('/')[-1].split('.')[0]
+
+            basic_data = [player, player_code] + [td.text_content() for td in tr[1:]]
+            basic_data = (basic_data + [None] * cls.BASIC_COLUMN_COUNT)[:cls.BASIC_COLUMN_COUNT]
+
+            # Skip the minutes played column, which is already in the basic box score.
+            adv_data = [td.text_content() for td in adv_tr[2:]]
+            adv_data = (adv_data + [None] * len(cls.ADVANCED_HEADERS))[:len(cls.ADVANCED_HEADERS)]
+
+            rows.append(cls.__convert_row(headers, basic_data + adv_data))
+
+        return pd.DataFrame(rows, columns=headers, dtype=object)
+
+    @staticmethod
+    def __body_rows(table: html.HtmlElement) -> list[html.HtmlElement]:
+        """
+        Gets the player rows (starters, reserves) and the team totals row of a box score table, skipping the
+        header rows repeated inside the body (e.g. 'Reserves').
+        :param table: Box score table.
+        :return: List of row elements.
+        """
+        rows = []
+        for section in ('tbody', 'tfoot'):
+            element = table.find(section)
+            if element is None:
+                continue
+            rows.extend(tr for tr in element.iter('tr') if 'thead' not in tr.get('class', ''))
+        return rows
+
+    @classmethod
+    def __convert_row(cls, headers: list[str], values: list) -> list:
+        """
+        Converts the numeric cells of a row to int/float and blank cells to None.
+        :param headers: Column headers of the row.
+        :param values: Raw cell text.
+        :return: Typed row.
+        """
+        row = []
+        for header, value in zip(headers, values):
+            if value is None or value == '':
+                row.append(None)
+            elif header in cls.TEXT_COLUMNS or not cls.NUMBER_PATTERN.match(value):
+                row.append(value)
+            elif '.' in value:
+                row.append(float(value))
+            else:
+                row.append(int(value))
+        return row
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import re
+import time
+import zlib
+from datetime import datetime
+
+from common.atomic_write import atomic_write
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of scraped pages.
+
+    Page bodies are zlib-compressed and stored by the SHA-256 of their content, so identical pages are stored once.
+    A small index entry per url (keyed by the SHA-256 of the url) records when the page was fetched and which body
+    it resolved to. Entries expire based on the kind of page:
+        Box scores never change once the game is finished, so they never expire by default.
+        Schedule months of the current season change daily, so they expire quickly. Past seasons never expire.
+        Everything else (player pages, odds archives) uses the default ttl.
+    """
+
+    BOX_SCORE_PATTERN = re.compile(r'/boxscores/\d{9}[A-Z]{3}\.html$')
+    SCHEDULE_PATTERN = re.compile(r'/leagues/NBA_(\d{4})_games-[a-z]+\.html$')
+
+    def __init__(self, directory: str, box_score_ttl_seconds: float | None = None,
+                 schedule_ttl_seconds: float | None = 6 * 60 * 60,
+                 default_ttl_seconds: float | None = 7 * 24 * 60 * 60):
+        """
+        Constructor for the response cache.
+        :param directory: Directory for the cache files. Created if it does not exist.
+        :param box_score_ttl_seconds: Time to live of box score pages. None never expires.
+        :param schedule_ttl_seconds: Time to live of the current season's schedule months. None never expires.
+        :param default_ttl_seconds: Time to live of every other page. None never expires.
+        """
+        self.directory = directory
+        self.box_score_ttl_seconds = box_score_ttl_seconds
+        self.schedule_ttl_seconds = schedule_ttl_seconds
+        self.default_ttl_seconds = default_ttl_seconds
+
+        os.makedirs(os.path.join(directory, 'index'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'objects'), exist_ok=True)
+
+    def get(self, url: str, ignore_ttl: bool = False) -> str | None:
+        """
+        Gets a cached page.
+        :param url: Page url.
+        :param ignore_ttl: Serve the page even if it has expired (used in offline mode).
+        :return: Page body, or None if the page is not cached or has expired.
+        """
+        index_path = self.__index_path(url)
+        if not os.path.exists(index_path):
+            return None
+
+        with open(index_path) as f:
+            entry = json.load(f)
+
+        ttl = self.ttl_for(url)
+        if not ignore_ttl and ttl is not None and time.time() - entry['fetched_at'] > ttl:
+            return None
+
+        object_path = self.__object_path(entry['content_hash'])
+        if not os.path.exists(object_path):
+            return None
+
+        with open(object_path, 'rb') as f:
+            return zlib.decompress(f.read()).decode('utf-8')
+
+    def put(self, url: str, body: str) -> None:
+        """
+        Stores a page in the cache.
+        :param url: Page url.
+        :param body: Page body.
+        :return: None
+        """
+        data = body.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        object_path = self.__object_path(content_hash)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            atomic_write(object_path, zlib.compress(data))
+
+        entry = {'url': url, 'fetched_at': time.time(), 'content_hash': content_hash}
+        atomic_write(self.__index_path(url), json.dumps(entry).encode('utf-8'))
+
+    def ttl_for(self, url: str) -> float | None:
+        """
+        Gets the time to live of a page based on its url.
+        :param url: Page url.
+        :return: Time to live in seconds, or None if the page never expires.
+        """
+        if self.BOX_SCORE_PATTERN.search(url):
+            return self.box_score_ttl_seconds
+
+        schedule = self.SCHEDULE_PATTERN.search(url)
+        if schedule:
+            if int(schedule.group(1)) < self.current_season():
+                return None
+            return self.schedule_ttl_seconds
+
+        return self.default_ttl_seconds
+
+    @staticmethod
+    def current_season() -> int:
+        """
+        Gets the current NBA season (the 2022-2023 season is 2023). Seasons roll over in August.
+        :return: Season year.
+        """
+        today = datetime.now()
+        return today.year + 1 if today.month > 8 else today.year
+
+    def __index_path(self, url: str) -> str:
+        return os.path.join(self.directory, 'index', hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def __object_path(self, content_hash: str) -> str:
+        return os.path.join(self.directory, 'objects', content_hash[:2], content_hash + '.z')
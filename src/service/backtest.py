@@ -0,0 +1,107 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, clone, is_classifier
+
+from service.nba_pipeline import NbaPredictor
+
+
+class WalkForwardBacktest:
+    """
+    Walk-forward evaluation of a model over a season.
+
+    The season is split into steps (days or weeks). Before each step, the model is trained on every game played
+    before it (the history seasons, then the season's earlier steps) and predicts the step's games. Features are
+    generated once for all seasons and sliced by date, so each step only costs a fit.
+
+    Estimators with `partial_fit` (e.g. SGDRegressor) are trained on the history once and then only updated with
+    each step's games; other estimators (e.g. the predictor's pipeline) are refit from scratch before every step.
+    """
+
+    STEPS = ('day', 'week')
+
+    def __init__(self, predictor: NbaPredictor, estimator: BaseEstimator = None, step: str = 'day'):
+        """
+        Constructor for a walk-forward backtest.
+        :param predictor: Predictor that generates the seasons' input data.
+        :param estimator: Estimator to evaluate. Default is the predictor's pipeline.
+        :param step: 'day' or 'week'.
+        """
+        if step not in self.STEPS:
+            raise ValueError(f"Unsupported step '{step}'. Supported steps: {', '.join(self.STEPS)}.")
+
+        self.predictor = predictor
+        self.estimator = estimator if estimator is not None else predictor.pipeline
+        self.step = step
+
+    def run(self, year: int, history_years: list[int] = None) -> pd.DataFrame:
+        """
+        Walks forward through a season.
+        :param year: Season year to predict (2021-2022 is 2022).
+        :param history_years: Seasons trained on before the first step. Default is the predictor's training years
+        (without the predicted season).
+        :return: Dataframe of every predicted game (Prediction, Actual Point Difference, Game Code, Step), in schedule
+        order. Games of steps without any training data are not predicted.
+        """
+        if history_years is None:
+            history_years = [training_year for training_year in self.predictor.training_years if training_year != year]
+
+        # Generate every season once; steps only slice these arrays.
+        season_data = self.predictor.generate_seasons(history_years + [year])
+        inputs = np.concatenate([np.asarray(features, dtype=float) for features, _, _ in season_data])
+        outcomes = np.concatenate([np.asarray(season_outcomes, dtype=float) for _, season_outcomes, _ in season_data])
+        history_count = len(inputs) - len(season_data[-1][2])
+
+        game_codes = list(season_data[-1][2])
+        if len(game_codes) == 0:
+            print(f"Walk-forward {year}: no games to predict.")
+            return pd.DataFrame(columns=['Prediction', 'Actual Point Difference', 'Game Code', 'Step'])
+        steps = np.array([self.step_of(game_code) for game_code in game_codes])
+        # Steps start where the step key changes (games are in schedule order).
+        step_starts = np.flatnonzero(np.r_[True, steps[1:] != steps[:-1]]) + history_count
+        step_ends = np.r_[step_starts[1:], len(inputs)]
+
+        incremental = hasattr(self.estimator, 'partial_fit')
+        model = clone(self.estimator)
+        trained_count = 0
+        predictions = []
+        for start, end in zip(step_starts, step_ends):
+            if start == 0:
+                continue
+
+            if incremental:
+                self.__partial_fit(model, inputs[trained_count:start], outcomes[trained_count:start], outcomes)
+            else:
+                model = clone(self.estimator).fit(inputs[:start], outcomes[:start])
+            trained_count = start
+
+            for i, prediction in enumerate(model.predict(inputs[start:end]), start):
+                game_index = i - history_count
+                predictions.append([prediction, outcomes[i], game_codes[game_index], steps[game_index]])
+
+        print(f"Walk-forward {year}: {len(predictions)} of {len(game_codes)} games predicted in "
+              f"{len(step_starts)} {self.step} steps.")
+        return pd.DataFrame(data=predictions, columns=['Prediction', 'Actual Point Difference', 'Game Code', 'Step'])
+
+    def step_of(self, game_code: str) -> str:
+        """
+        Gets the step of a game from its code (which starts with the game's date, e.g. '202210180BOS').
+        :param game_code: Game code.
+        :return: Date ('20221018') for daily steps, ISO year and week ('2022-W42') for weekly steps.
+        """
+        if self.step == 'day':
+            return game_code[:8]
+        iso_year, iso_week, _ = datetime.strptime(game_code[:8], '%Y%m%d').isocalendar()
+        return f'{iso_year}-W{iso_week:02d}'
+
+    @staticmethod
+    def __partial_fit(model: BaseEstimator, inputs: np.ndarray, outcomes: np.ndarray,
+                      all_outcomes: np.ndarray) -> None:
+        if len(inputs) == 0:
+            return
+        if is_classifier(model):
+            # Classifiers need every class up front; the outcomes of every season are known to the backtest.
+            model.partial_fit(inputs, outcomes, classes=np.unique(all_outcomes))
+        else:
+            model.partial_fit(inputs, outcomes)
@@ -0,0 +1,54 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+
+SUPPORTED_BACKENDS = ('postgresql', 'sqlite')
+
+# Connection settings for file-based SQLite databases, applied to every new connection.
+SQLITE_PRAGMAS = {
+    # Readers don't block the writer, and commits only sync the write-ahead log.
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'temp_store': 'MEMORY',
+    # Negative sizes are in KiB (64 MiB page cache).
+    'cache_size': '-65536',
+}
+
+
+def create_database_engine(url: str, echo: bool = False) -> Engine:
+    """
+    Creates the engine for a database url, with backend-specific settings.
+
+    Supported backends:
+        PostgreSQL (e.g. 'postgresql+psycopg2://user:@localhost:5432/nba'). Bulk inserts and updates are sent as
+        multi-row VALUES batches instead of one statement per row.
+        SQLite (e.g. 'sqlite:///data/nba.db', or 'sqlite://' for in-memory). File databases use a write-ahead log and
+        a larger page cache. No server is needed.
+    :param url: SQLAlchemy database url.
+    :param echo: Log every statement.
+    :return: Engine
+    """
+    backend = make_url(url).get_backend_name()
+
+    if backend == 'postgresql':
+        return create_engine(url, echo=echo, executemany_mode='values_plus_batch')
+
+    if backend == 'sqlite':
+        engine = create_engine(url, echo=echo)
+        if make_url(url).database not in (None, '', ':memory:'):
+            event.listen(engine, 'connect', set_sqlite_pragmas)
+        return engine
+
+    raise ValueError(f"Unsupported database backend '{backend}'. Supported backends: {', '.join(SUPPORTED_BACKENDS)}.")
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """
+    Applies SQLITE_PRAGMAS to a new SQLite connection.
+    :param dbapi_connection: sqlite3 connection.
+    :param connection_record: Pool connection record (unused).
+    :return: None
+    """
+    cursor = dbapi_connection.cursor()
+    for pragma, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {pragma}={value}")
+    cursor.close()
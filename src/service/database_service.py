@@ -1,13 +1,16 @@
+import hashlib
 from datetime import datetime
 from typing import Type
 import pandas as pd
+from sqlalchemy import func, insert, update, bindparam, or_, Integer, Numeric
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 from sqlalchemy.engine.row import Row
-from common.constants import TEAMS_CURRENT, TEAM_ABBRV
+from common.constants import TEAMS_CURRENT, TEAM_ABBRV, GAME_LOG_BOX_SCORE_COLUMNS, GAME_PLAYER_LOG_COLUMNS, \
+    GAME_TEAM_LOG_SUMMARY_COLUMNS
 from models.database import Base, Player, GameType, PlayerStatsType, \
     TeamStatsType, Season, Team, TeamStats, TeamAdvancedStats, PlayerStats, Game, GameTeamLog, PlayerTeam, \
-    GamePlayerLog
+    GamePlayerLog, IngestCursor
 from scripts.Scraper import Scraper
 
 
@@ -17,6 +20,13 @@ class DatabaseService:
         self.scraper = scraper
         self.engine = engine
 
+        # Player id by unique code, loaded once per ingest (see load_player_cache) and kept current by add_player.
+        self.player_cache: dict[str, int] | None = None
+
+        # Game log rows queued by queue_game_logs, written by flush_game_logs.
+        self.pending_team_logs: list[dict] = []
+        self.pending_player_logs: list[dict] = []
+
     def initialize_database(self) -> None:
         """
         Create the database and create the tables based on the mapped classes.
@@ -26,57 +36,320 @@ class DatabaseService:
         Base.metadata.drop_all(self.engine)
         Base.metadata.create_all(self.engine)
 
-    def populate_tables(self, year: int) -> None:
+    def populate_tables(self, year: int, chunk_size: int = 100) -> None:
         """
         Populate empty database tables using the scraper.
+
+        The season is ingested in chunks of `chunk_size` games, each committed together with the season's ingest
+        cursor. If a run fails part way, rerunning it skips the games whose logs are already in the database.
         :param year: Specifies the year (season) to scrape.
+        :param chunk_size: Number of games ingested per commit.
         :return: None
         """
 
         self.add_types()
 
         season = self.get_season_by_year(year)
+        cursor = self.get_ingest_cursor(season.id) if season else None
+
+        # Seasons ingested before ingest cursors existed have no cursor and are treated as complete.
+        if season and (cursor is None or cursor.completed):
+            return
+
+        schedule_df = self.scraper.scrape_nba_season(year)
         if not season:
-            schedule_df = self.scraper.scrape_nba_season(year)
             season = self.add_season(year, schedule_df)
+            cursor = self.add_ingest_cursor(season)
+        else:
+            print(f"Resuming {year} season ingest after {cursor.games_ingested} games ({cursor.last_game_code}).")
 
-            teams = self.add_teams(season.id)
+        self.load_player_cache()
+        scheduled_games = self.add_scheduled_games(season, schedule_df)
 
-            for i in schedule_df.index:
-                if teams.get(schedule_df['Home/Neutral'][i], None) is None:
-                    continue
-                home_team = teams[schedule_df['Home/Neutral'][i]]
-                away_team = teams[schedule_df['Visitor/Neutral'][i]]
+        ingested_game_codes = self.get_ingested_game_codes(season.id)
+        pending_game_codes = [game_code for game_code in scheduled_games if game_code not in ingested_game_codes]
+        self.ingest_games(cursor, scheduled_games, pending_game_codes, chunk_size)
+        self.add_missing_player_stats()
 
-                game_datetime = self.scraper.to_postgres_datetime(schedule_df['Date'][i], schedule_df['Start (ET)'][i])
-                game_code = self.scraper.get_game_code(schedule_df['Date'][i], home_team.abbreviation)
+        cursor.completed = True
+        cursor.updated_at = datetime.now()
+        self.session.commit()
 
-                game = self.get_game_by_game_code(game_code)
-                if not game:
-                    game = self.add_game(game_datetime, game_code, season, home_team, away_team)
+    def update_season(self, year: int, chunk_size: int = 100, today: datetime = None) -> None:
+        """
+        Incrementally ingests the games played since the season's latest ingested game (e.g. a nightly update).
+
+        Only the schedule months from the latest ingested game's month up to the current month are scraped, plus the
+        earlier months that still have played games without logs (e.g. box scores that failed to scrape), and only
+        the completed games without logs are fetched and inserted. Seasons that are not in the database yet are
+        added with the games played so far. Once the season's last month is scraped and every scheduled game has its
+        logs, the season's ingest cursor is marked completed.
+        :param year: Specifies the year (season) to update.
+        :param chunk_size: Number of games ingested per commit.
+        :param today: Current date and time. Default is now.
+        :return: None
+        """
+        today = today or datetime.now()
+        season = self.get_season_by_year(year)
+        cursor = self.get_ingest_cursor(season.id) if season else None
+        if cursor is not None and cursor.completed:
+            print(f"{year} season is already completed.")
+            return
+
+        latest_game_datetime = self.get_latest_ingested_game_datetime(season.id) if season else None
+        months = self.get_months_to_update(year, latest_game_datetime, today)
+        if season:
+            missing_months = self.get_months_with_missing_games(season.id, today)
+            months = [month for month in self.scraper.SEASON_MONTHS if month in months or month in missing_months]
+        if not months:
+            print(f"{year} season has not started yet.")
+            return
+        print(f"Updating {year} season since {latest_game_datetime}: {', '.join(months)}.")
+
+        schedule_df = self.scraper.scrape_nba_season(year, months)
+        if schedule_df is None:
+            return
 
-                game_summary, home_box, away_box = self.scraper.scrape_nba_game(game.game_code)
+        if not season:
+            self.add_types()
+            season = self.add_season(year, schedule_df)
 
-                if game_summary is None:
-                    continue
+        self.load_player_cache()
 
-                home_box_team_stats = home_box.iloc[-1]
-                home_team_game_summary = game_summary.iloc[1]
-                away_box_team_stats = away_box.iloc[-1]
-                away_team_game_summary = game_summary.iloc[0]
+        cursor = self.get_ingest_cursor(season.id)
+        if cursor is None:
+            cursor = self.add_ingest_cursor(season)
 
-                self.add_game_team_log(game, home_team, home_team_game_summary, home_box_team_stats)
-                self.add_game_player_logs(game, home_team, home_box)
-                self.add_game_team_log(game, away_team, away_team_game_summary, away_box_team_stats)
-                self.add_game_player_logs(game, away_team, away_box)
+        scheduled_games = self.add_scheduled_games(season, schedule_df)
 
-            self.session.commit()
+        ingested_game_codes = self.get_ingested_game_codes(season.id)
+        pending_game_codes = [game_code for game_code, (game, _, _) in scheduled_games.items()
+                              if game_code not in ingested_game_codes and game.start_datetime < today]
+        self.ingest_games(cursor, scheduled_games, pending_game_codes, chunk_size)
+        self.add_missing_player_stats()
 
-            for player in self.session.query(Player).all():
-                existing_stats = self.get_player_stats_by_player_id(player.id)
-                if existing_stats is None:
-                    self.add_player_stats(player)
+        # Games of earlier months are only scraped while they miss logs, so the scraped months cover every game left.
+        ingested_game_codes = self.get_ingested_game_codes(season.id)
+        if self.scraper.SEASON_MONTHS[-1] in months and ingested_game_codes.issuperset(scheduled_games):
+            cursor.completed = True
+            cursor.updated_at = datetime.now()
             self.session.commit()
+            print(f"{year} season completed.")
+
+    def add_scheduled_games(self, season: Season, schedule_df: pd.DataFrame) -> dict[str, tuple[Game, Team, Team]]:
+        """
+        Adds the games of a schedule that are not in the database yet, along with the season's teams.
+        :param season: Related Season object.
+        :param schedule_df: Schedule dataframe (all or some of the season's months).
+        :return: Dictionary of game code to (Game, home Team, away Team), in schedule order.
+        """
+        teams = self.add_teams(season.id)
+        existing_games = {game.game_code: game for game in self.get_games_by_season_id(season.id)}
+
+        scheduled_games = {}
+        for i in schedule_df.index:
+            if teams.get(schedule_df['Home/Neutral'][i], None) is None:
+                continue
+            home_team = teams[schedule_df['Home/Neutral'][i]]
+            away_team = teams[schedule_df['Visitor/Neutral'][i]]
+
+            game_datetime = self.scraper.to_postgres_datetime(schedule_df['Date'][i], schedule_df['Start (ET)'][i])
+            game_code = self.scraper.get_game_code(schedule_df['Date'][i], home_team.abbreviation)
+
+            game = existing_games.get(game_code)
+            if not game:
+                game = self.add_game(game_datetime, game_code, season, home_team, away_team)
+
+            scheduled_games[game.game_code] = (game, home_team, away_team)
+        self.session.commit()
+
+        return scheduled_games
+
+    def ingest_games(self, cursor: IngestCursor, scheduled_games: dict[str, tuple[Game, Team, Team]],
+                     game_codes: list[str], chunk_size: int) -> None:
+        """
+        Scrapes box scores and adds the team and player game logs, committing every `chunk_size` games together with
+        the season's ingest cursor.
+        :param cursor: Season's IngestCursor object.
+        :param scheduled_games: Dictionary of game code to (Game, home Team, away Team).
+        :param game_codes: Codes of the games to ingest, in schedule order.
+        :param chunk_size: Number of games ingested per commit.
+        :return: None
+        """
+        # Box scores are fetched concurrently in batches, then bulk inserted in schedule order.
+        games_in_chunk = 0
+        for game_code, box_scores in self.scraper.scrape_nba_games(game_codes):
+            if box_scores is None:
+                continue
+
+            game, home_team, away_team = scheduled_games[game_code]
+            game_summary, home_box, away_box = box_scores
+
+            self.queue_game_logs(game, home_team, game_summary.iloc[1], home_box)
+            self.queue_game_logs(game, away_team, game_summary.iloc[0], away_box)
+
+            self.update_ingest_cursor(cursor, game)
+            games_in_chunk += 1
+            if games_in_chunk == chunk_size:
+                self.flush_game_logs()
+                self.session.commit()
+                games_in_chunk = 0
+
+        self.flush_game_logs()
+        self.session.commit()
+
+    def queue_game_logs(self, game: Game, team: Team, team_game_summary: pd.Series, box_score: pd.DataFrame) -> None:
+        """
+        Converts a team's box score to team and player game log rows and queues them for flush_game_logs. Players that
+        are not in the database yet are added.
+        :param game: Related Game object.
+        :param team: Related Team object.
+        :param team_game_summary: Team's row of the game summary dataframe.
+        :param box_score: Team's box score dataframe (players, then team totals).
+        :return: None
+        """
+        players = box_score.iloc[:-1]
+        player_ids = self.get_player_ids(team, players['Players'].tolist(), players['Player Code'].tolist())
+
+        self.pending_team_logs.append(self.to_game_team_log_row(game.id, team.id, team_game_summary,
+                                                                box_score.iloc[-1]))
+        self.pending_player_logs.extend(self.to_game_player_log_rows(game.id, team.id, player_ids, players))
+
+    def flush_game_logs(self) -> None:
+        """
+        Writes the queued game log rows with one executemany insert per table.
+        :return: None
+        """
+        if self.pending_team_logs:
+            self.session.execute(insert(GameTeamLog), self.pending_team_logs)
+            self.pending_team_logs = []
+        if self.pending_player_logs:
+            self.session.execute(insert(GamePlayerLog), self.pending_player_logs)
+            self.pending_player_logs = []
+
+    def get_player_ids(self, team: Team, player_names: list[str], player_codes: list[str]) -> list[int]:
+        """
+        Resolves a box score's players to player ids.
+        :param team: Team the players played for.
+        :param player_names: Players' names.
+        :param player_codes: Players' unique codes.
+        :return: List of player ids, in box score order.
+        """
+        return [self.get_player_id(team, player_name, player_code)
+                for player_name, player_code in zip(player_names, player_codes)]
+
+    def get_player_id(self, team: Team, player_name: str, player_code: str) -> int:
+        """
+        Resolves a player to its id using the player cache, adding the player if it is not in the database.
+        :param team: Team the player played for.
+        :param player_name: Player's name.
+        :param player_code: Player's unique code.
+        :return: Player id.
+        """
+        if self.player_cache is None:
+            self.load_player_cache()
+
+        player_id = self.player_cache.get(player_code)
+        if player_id is None:
+            player = self.add_player(player_name, player_code)
+            self.add_player_team(player, team)
+            player_id = player.id
+        return player_id
+
+    def load_player_cache(self) -> None:
+        """
+        Loads the id of every player, keyed by unique code, with one query. Called at the start of an ingest so a rolled
+        back run never leaves stale ids behind.
+        :return: None
+        """
+        self.player_cache = dict(self.session.query(Player.unique_code, Player.id).all())
+
+    @staticmethod
+    def to_game_team_log_row(game_id: int, team_id: int, team_game_summary: pd.Series,
+                             team_box_stats: pd.Series) -> dict:
+        """
+        Converts a team's game summary and box score totals to a game_team_log row.
+        :param game_id: Game id.
+        :param team_id: Team id.
+        :param team_game_summary: Team's row of the game summary dataframe.
+        :param team_box_stats: Team totals row of the box score dataframe.
+        :return: Dictionary of game_team_log column to value.
+        """
+        row = {'game_id': game_id, 'team_id': team_id, 'overtime_points': None, 'plus_minus': None,
+               'box_plus_minus': None}
+        for column, header in GAME_TEAM_LOG_SUMMARY_COLUMNS.items():
+            row[column] = team_game_summary[header]
+        for column, header in GAME_LOG_BOX_SCORE_COLUMNS.items():
+            row[column] = team_box_stats[header]
+        return row
+
+    @staticmethod
+    def to_game_player_log_rows(game_id: int, team_id: int, player_ids: list[int],
+                                players: pd.DataFrame) -> list[dict]:
+        """
+        Converts the player rows of a box score to game_player_log rows. The box score is read column by column
+        instead of cell by cell; players that did not play only get their ids.
+        :param game_id: Game id.
+        :param team_id: Team id.
+        :param player_ids: Player ids, in box score order.
+        :param players: Player rows of the box score dataframe (without the team totals).
+        :return: List of dictionaries of game_player_log column to value.
+        """
+        columns = list(GAME_PLAYER_LOG_COLUMNS)
+        values = zip(*[players[header].tolist() for header in GAME_PLAYER_LOG_COLUMNS.values()])
+        empty_stats = dict.fromkeys(columns)
+
+        rows = []
+        for player_id, minutes_played, player_values in zip(player_ids, players['MP'].tolist(), values):
+            row = {'player_id': player_id, 'game_id': game_id, 'team_id': team_id}
+            if minutes_played is None or "Did Not" in minutes_played or "Not With" in minutes_played:
+                row.update(empty_stats)
+            else:
+                row.update(zip(columns, [None if value == '' else value for value in player_values]))
+            rows.append(row)
+        return rows
+
+    def add_missing_player_stats(self) -> None:
+        """
+        Scrapes and adds the stats of every player that has none yet.
+        :return: None
+        """
+        players = {player.unique_code: player for player in self.get_players_without_stats()}
+        for player_code, player_stats_df in self.scraper.scrape_nba_players(list(players)):
+            if player_stats_df is not None:
+                self.add_player_stats(players[player_code], player_stats_df)
+        self.session.commit()
+
+    def get_months_to_update(self, year: int, latest_game_datetime: datetime | None, today: datetime) -> list[str]:
+        """
+        Gets the schedule months that can contain completed games newer than the latest ingested game.
+        :param year: Season year (2021-2022 is 2022).
+        :param latest_game_datetime: Start of the latest ingested game, or None if no game was ingested.
+        :param today: Current date and time.
+        :return: List of month names, as used in the schedule urls. Empty if the season has not started yet.
+        """
+        if today < datetime(year - 1, 10, 1):
+            # Off-season before the season's first month (October).
+            return []
+
+        months = self.scraper.SEASON_MONTHS
+        start = 0
+        if latest_game_datetime is not None:
+            latest_month = latest_game_datetime.strftime('%B').lower()
+            if latest_month in months:
+                start = months.index(latest_month)
+            elif latest_game_datetime.year >= year:
+                # Off-season month after the season's last month (e.g. a delayed season); start from the last month.
+                start = len(months) - 1
+
+        # The current month is the last one that can hold completed games, unless the season is already over.
+        current_season = today.year + 1 if today.month > 8 else today.year
+        end = len(months) - 1
+        current_month = today.strftime('%B').lower()
+        if current_season == year and current_month in months:
+            end = months.index(current_month)
+
+        return months[start:end + 1]
 
     def add_types(self) -> None:
         """
@@ -85,6 +358,10 @@ class DatabaseService:
         :return: None
         """
 
+        # Types are only added once, so resumed and repeated ingests don't duplicate them.
+        if self.session.query(GameType.id).first() is not None:
+            return
+
         # Add Game Types
         # TODO: (#6) Differentiate between playoff games by their rounds in `game_type` table.
         game_types = ["Preseason", "Regular Season", "Play-In Game", "Playoffs"]
@@ -229,22 +506,24 @@ class DatabaseService:
         season = Season(
             year=f"{year}",
             friendly_name=f"NBA Season {year - 1}-{year}",
-            season_start=season_start_date,
+            season_start=datetime.strptime(season_start_date, '%Y-%m-%d %H:%M:%S'),
         )
 
         self.session.add(season)
         self.session.flush()
         return season
 
-    def add_player_stats(self, player: Player) -> None:
+    def add_player_stats(self, player: Player, player_stats_df: pd.DataFrame = None) -> None:
         """
         Add a player's season and career statistics to the player_stats database table.
         :param player: Related Player object.
+        :param player_stats_df: Player's already scraped stats. Default is None, which scrapes the player page.
         :return: None
         """
 
         # TODO: (#5) Add advanced analytics tables from player page to PlayerStats
-        player_stats_df = self.scraper.scrape_nba_player(player.unique_code)
+        if player_stats_df is None:
+            player_stats_df = self.scraper.scrape_nba_player(player.unique_code)
 
         if player_stats_df is None:
             return None
@@ -312,16 +591,8 @@ class DatabaseService:
 
     def add_game_player_logs(self, game: Game, team: Team, box_score):
         for i in box_score.index[:-1]:
-            player_name = box_score['Players'][i]
-            player_code = box_score['Player Code'][i]
-            player = self.session.query(Player).filter(
-                Player.unique_code == player_code and Player.friendly_name == player_name).one_or_none()
-
-            if player is None:
-                player = self.add_player(player_name, player_code)
-                self.add_player_team(player, team)
-
-            self.add_game_player_log(box_score, i, player, game, team)
+            player_id = self.get_player_id(team, box_score['Players'][i], box_score['Player Code'][i])
+            self.add_game_player_log(box_score, i, player_id, game, team)
 
     def add_game_team_log(self, game: Game, team: Team, game_summary: pd.DataFrame, team_box_stats: pd.DataFrame):
         """
@@ -408,6 +679,8 @@ class DatabaseService:
 
         self.session.add(player)
         self.session.flush()
+        if self.player_cache is not None:
+            self.player_cache[player_code] = player.id
 
         return player
 
@@ -426,25 +699,25 @@ class DatabaseService:
         )
         self.session.add(player_team)
 
-    def add_game_player_log(self, box_df: pd.DataFrame, i: int, player: Player, game: Game, team: Team) -> None:
+    def add_game_player_log(self, box_df: pd.DataFrame, i: int, player_id: int, game: Game, team: Team) -> None:
         """
         Add a player's game log to the game_player_log database table.
         :param box_df: Game's box score dataframe
         :param i: index of the box score to look at
-        :param player: Related Player object.
+        :param player_id: Related player's id.
         :param game: Related Game Object
         :param team: Related Team Object
         :return: None
         """
         if ("Did Not" in box_df['MP'][i]) or ("Not With" in box_df['MP'][i]):
             game_player_log = GamePlayerLog(
-                player_id=player.id,
+                player_id=player_id,
                 game_id=game.id,
                 team_id=team.id
             )
         else:
             game_player_log = GamePlayerLog(
-                player_id=player.id,
+                player_id=player_id,
                 game_id=game.id,
                 team_id=team.id,
 
@@ -503,7 +776,7 @@ class DatabaseService:
         game = Game(
             season_id=season.id,
             type=2,  # 2: regular season
-            start_datetime=game_datetime,
+            start_datetime=datetime.strptime(game_datetime, '%Y-%m-%d %H:%M:%S'),
             game_code=game_code,
             home_team_id=home_team.id,
             away_team_id=away_team.id
@@ -512,17 +785,74 @@ class DatabaseService:
         self.session.flush()
         return game
 
-    def add_odds_data(self, odds_data: pd.DataFrame) -> None:
-        # Find game
-        for index, row in odds_data.iterrows():
-            game: Game = self.get_game_by_date_and_teams(row['Date'], row['Home_Team'], row['Visitor_Team'])
+    def add_ingest_cursor(self, season: Season) -> IngestCursor:
+        """
+        Add an ingest cursor for a season to the ingest_cursor database table.
+        :param season: Related Season object.
+        :return: Newly created IngestCursor object.
+        """
+        cursor = IngestCursor(
+            season_id=season.id,
+            games_ingested=0,
+            completed=False,
+            updated_at=datetime.now()
+        )
+        self.session.add(cursor)
+        self.session.flush()
+        return cursor
 
-            if game is None:
-                print(f"{row['Visitor_Team']} @ {row['Home_Team']} on {row['Date']} was not found. Skipping")
-                continue
+    @staticmethod
+    def update_ingest_cursor(cursor: IngestCursor, game: Game) -> None:
+        """
+        Moves a season's ingest cursor past a game. Persisted with the game's logs on the next commit.
+        :param cursor: Season's IngestCursor object.
+        :param game: Game that was just ingested.
+        :return: None
+        """
+        cursor.last_game_code = game.game_code
+        cursor.last_game_datetime = game.start_datetime
+        cursor.games_ingested += 1
+        cursor.updated_at = datetime.now()
 
-            game.spread = row['Closing Odds']
-            self.session.commit()
+    def add_odds_data(self, odds_data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Sets the spread of the games in an odds dataframe.
+
+        All odds rows are matched against the games of their seasons with one joined query, and the spreads are
+        applied with one batched UPDATE in a single transaction.
+        :param odds_data: Odds dataframe (Date, Visitor_Team, Home_Team, Closing Odds).
+        :return: The odds rows that did not match a game.
+        """
+        # Odds dates are 'YYYY-MM-DD'; games after August belong to the next season.
+        dates = pd.to_datetime(odds_data['Date'], format='%Y-%m-%d')
+        season_years = {str(year) for year in dates.dt.year + (dates.dt.month > 8)}
+
+        game_ids = {(start_datetime.date(), home, away): game_id
+                    for game_id, start_datetime, home, away in self.get_games_with_team_names(season_years)}
+
+        spreads = []
+        matched = []
+        for date, home, away, spread in zip(dates.dt.date, odds_data['Home_Team'], odds_data['Visitor_Team'],
+                                            odds_data['Closing Odds']):
+            game_id = game_ids.get((date, home, away))
+            matched.append(game_id is not None)
+            if game_id is not None:
+                spreads.append({'game_id': game_id, 'game_spread': spread})
+
+        if spreads:
+            game_table = Game.__table__
+            self.session.execute(update(game_table)
+                                 .where(game_table.c.id == bindparam('game_id'))
+                                 .values(spread=bindparam('game_spread')),
+                                 spreads)
+        self.session.commit()
+
+        unmatched = odds_data[[not is_matched for is_matched in matched]]
+        for index, row in unmatched.iterrows():
+            print(f"{row['Visitor_Team']} @ {row['Home_Team']} on {row['Date']} was not found. Skipping")
+        print(f"Spreads set for {len(spreads)} games, {len(unmatched)} odds rows unmatched.")
+
+        return unmatched
 
     def get_seasons_by_years(self, years: list[int]) -> list[Season]:
         """
@@ -546,18 +876,97 @@ class DatabaseService:
         query: Season = self.session.query(Season).where(Season.year == str(year)).one_or_none()
         return query
 
-    def get_games_by_season_id(self, season_id: int) -> list[Game]:
+    def get_games_by_season_id(self, season_id: int, since: datetime = None) -> list[Game]:
         """
         Retrieves a season's schedule from the database.
         :param season_id: Season id.
+        :param since: Only retrieve games starting at or after this time. Default is the whole season.
         :return: A dataframe of the NBA season schedule.
         """
-        query: list[Game] = self.session\
+        query = self.session\
             .query(Game)\
-            .where(Game.season_id == season_id)\
+            .where(Game.season_id == season_id)
+        if since is not None:
+            query = query.where(Game.start_datetime >= since)
+
+        games: list[Game] = query\
             .order_by(Game.start_datetime.asc())\
             .all()
 
+        return games
+
+    def get_ingest_cursor(self, season_id: int) -> IngestCursor:
+        """
+        Retrieves the ingest cursor of a season.
+        :param season_id: Season id.
+        :return: IngestCursor object, or None if the season was ingested before cursors existed.
+        """
+        query: IngestCursor = self.session \
+            .query(IngestCursor) \
+            .where(IngestCursor.season_id == season_id) \
+            .one_or_none()
+
+        return query
+
+    def get_ingested_game_codes(self, season_id: int) -> set[str]:
+        """
+        Retrieves the codes of a season's games that already have their team and player logs.
+        :param season_id: Season id.
+        :return: Set of game codes.
+        """
+        team_logged = self.session.query(GameTeamLog.game_id)
+        player_logged = self.session.query(GamePlayerLog.game_id)
+        query = self.session \
+            .query(Game.game_code) \
+            .where(Game.season_id == season_id) \
+            .where(Game.id.in_(team_logged)) \
+            .where(Game.id.in_(player_logged)) \
+            .all()
+
+        return {row.game_code for row in query}
+
+    def get_months_with_missing_games(self, season_id: int, today: datetime) -> set[str]:
+        """
+        Retrieves the schedule months of a season's games that were played but don't have their team and player logs.
+        :param season_id: Season id.
+        :param today: Current date and time; later games are not played yet.
+        :return: Set of month names, as used in the schedule urls.
+        """
+        team_logged = self.session.query(GameTeamLog.game_id)
+        player_logged = self.session.query(GamePlayerLog.game_id)
+        query = self.session \
+            .query(Game.start_datetime) \
+            .where(Game.season_id == season_id) \
+            .where(Game.start_datetime < today) \
+            .where(or_(Game.id.not_in(team_logged), Game.id.not_in(player_logged))) \
+            .all()
+
+        return {row.start_datetime.strftime('%B').lower() for row in query}
+
+    def get_latest_ingested_game_datetime(self, season_id: int) -> datetime | None:
+        """
+        Retrieves the start of the latest game of a season that has its logs.
+        :param season_id: Season id.
+        :return: Start datetime, or None if no game was ingested.
+        """
+        query: tuple = self.session \
+            .query(func.max(Game.start_datetime)) \
+            .where(Game.season_id == season_id) \
+            .where(Game.id.in_(self.session.query(GameTeamLog.game_id))) \
+            .one()
+
+        return query[0]
+
+    def get_players_without_stats(self) -> list[Player]:
+        """
+        Retrieves the players that have no player stats.
+        :return: List of players.
+        """
+        query: list[Player] = self.session \
+            .query(Player) \
+            .where(Player.id.not_in(self.session.query(PlayerStats.player_id))) \
+            .all()
+
         return query
 
     def get_game_by_game_code(self, game_code: str) -> Game:
@@ -573,6 +982,24 @@ class DatabaseService:
 
         return query
 
+    def get_games_with_team_names(self, season_years: set[str]) -> list[Row]:
+        """
+        Retrieves every game of some seasons along with its home and away team names.
+        :param season_years: Season years (e.g. {'2022', '2023'}).
+        :return: List of rows (Game.id, Game.start_datetime, home team name, away team name).
+        """
+        home_team = aliased(Team)
+        away_team = aliased(Team)
+        query: list[Row] = self.session\
+            .query(Game.id, Game.start_datetime, home_team.name, away_team.name)\
+            .join(home_team, Game.home_team_id == home_team.id)\
+            .join(away_team, Game.away_team_id == away_team.id)\
+            .join(Season, Game.season_id == Season.id)\
+            .where(Season.year.in_(season_years))\
+            .all()
+
+        return query
+
     def get_game_by_date_and_teams(self, date, home, away) -> Game:
         """
         Retrieves a game from the database by the date and the home and away teams.
@@ -648,6 +1075,85 @@ class DatabaseService:
 
         return query[0], query[1]
 
+    def get_team_logs_by_season_id(self, season_id: int, since: datetime = None) -> dict[int, list[Row]]:
+        """
+        Retrieves every team game log of a season (joined with Team to get Team Names) in one query.
+        :param season_id: Season id.
+        :param since: Only retrieve the logs of games starting at or after this time. Default is the whole season.
+        :return: Dictionary of game id to list of sqlalchemy.engine.row.Row (GameTeamLog, str).
+        """
+        query = self.session\
+            .query(GameTeamLog, Team.name)\
+            .join(Team, GameTeamLog.team_id == Team.id)\
+            .join(Game, GameTeamLog.game_id == Game.id)\
+            .where(Game.season_id == season_id)
+        if since is not None:
+            query = query.where(Game.start_datetime >= since)
+
+        team_logs: dict[int, list[Row]] = {}
+        for row in query.order_by(GameTeamLog.id).all():
+            team_logs.setdefault(row.GameTeamLog.game_id, []).append(row)
+        return team_logs
+
+    def get_player_logs_by_season_id(self, season_id: int, since: datetime = None) -> dict[tuple[int, int], list[Row]]:
+        """
+        Retrieves the player game log columns used for features of a whole season (joined with Player to get the
+        player's code and name) in one query.
+        :param season_id: Season id.
+        :param since: Only retrieve the logs of games starting at or after this time. Default is the whole season.
+        :return: Dictionary of (game id, team id) to list of sqlalchemy.engine.row.Row (player_id, minutes_played,
+        box_plus_minus, unique_code, friendly_name).
+        """
+        query = self.session\
+            .query(GamePlayerLog.game_id, GamePlayerLog.team_id, GamePlayerLog.player_id,
+                   GamePlayerLog.minutes_played, GamePlayerLog.box_plus_minus, Player.unique_code,
+                   Player.friendly_name)\
+            .join(Player, GamePlayerLog.player_id == Player.id)\
+            .join(Game, GamePlayerLog.game_id == Game.id)\
+            .where(Game.season_id == season_id)
+        if since is not None:
+            query = query.where(Game.start_datetime >= since)
+
+        player_logs: dict[tuple[int, int], list[Row]] = {}
+        for row in query.order_by(GamePlayerLog.id).all():
+            player_logs.setdefault((row.game_id, row.team_id), []).append(row)
+        return player_logs
+
+    def get_season_fingerprint(self, season_id: int) -> str:
+        """
+        Summarizes a season's games and logs: row counts and highest ids, which change whenever games or logs are added
+        or removed, then a digest of the logs' stat columns, which changes when a box score value is corrected in place.
+        :param season_id: Season id.
+        :return: Fingerprint string.
+        """
+        games: tuple = self.session\
+            .query(func.count(Game.id), func.max(Game.id))\
+            .where(Game.season_id == season_id)\
+            .one()
+
+        team_logs = self.__log_aggregates(GameTeamLog, season_id)
+        player_logs = self.__log_aggregates(GamePlayerLog, season_id)
+
+        content = hashlib.sha256(repr((team_logs[2:], player_logs[2:])).encode('utf-8')).hexdigest()[:16]
+        return f'{tuple(games)}:{tuple(team_logs[:2])}:{tuple(player_logs[:2])}:{content}'
+
+    def __log_aggregates(self, model: Type[GameTeamLog] | Type[GamePlayerLog], season_id: int) -> tuple:
+        # Count and highest id, then for every stat column its sum and its sum weighted by the row id (so values moved
+        # between rows change it too), and the number of rows with minutes played.
+        stat_columns = [column for column in model.__table__.columns
+                        if isinstance(column.type, (Integer, Numeric)) and not column.primary_key
+                        and not column.foreign_keys]
+        aggregates = [func.count(model.id), func.max(model.id)]
+        for column in stat_columns:
+            aggregates += [func.sum(column), func.sum(column * model.id)]
+        aggregates.append(func.count(model.minutes_played))
+
+        return tuple(self.session
+                     .query(*aggregates)
+                     .join(Game, model.game_id == Game.id)
+                     .where(Game.season_id == season_id)
+                     .one())
+
     def get_player_by_player_id(self, player_id: int) -> Type[NotImplementedError] | Player:
         """
         Retrieves a player from the database.
@@ -699,3 +1205,16 @@ class DatabaseService:
             .where(Game.game_code == game_code)\
             .one_or_none()
         return query[0]
+
+    def get_spreads_by_game_codes(self, game_codes: list[str]) -> dict[str, float | None]:
+        """
+        Retrieves the spreads of several games with one query.
+        :param game_codes: Unique game codes
+        :return: Dictionary of spread by game code (None for games without odds). Unknown game codes are left out.
+        """
+        query = self.session\
+            .query(Game.game_code, Game.spread)\
+            .where(Game.game_code.in_(game_codes))\
+            .all()
+
+        return {row.game_code: float(row.spread) if row.spread is not None else None for row in query}
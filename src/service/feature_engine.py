@@ -0,0 +1,201 @@
+from itertools import product
+
+import numpy as np
+from sqlalchemy.engine import Row
+
+from models.database import Game
+from models.exponential_averages import ExponentialAverages
+from models.league_state import LeagueState
+from models.player_registry import PlayerRegistry
+
+
+class TeamFeatureEngine:
+    """
+    Vectorized computation of the team features of a season.
+
+    The season's team game logs are laid out as arrays with one row per team per game (home row, then away row, in
+    schedule order). Running totals are cumulative sums per team, shifted by one game so every row only sees the games
+    before it, which gives the same pre-game features as replaying the season through `NbaTeam.update_features`.
+
+    Rolling means over the last ROLLING_WINDOWS games are the difference of the totals a window apart (the same values
+    LeagueState keeps in ring buffers), followed by exponentially weighted means of the same stats. The last feature
+    is the average pre-game box plus/minus of the players that played, kept in a PlayerRegistry.
+    """
+
+    # Bump when the features change, so stored feature matrices are rebuilt (see FeatureStore).
+    FEATURE_VERSION = 4
+
+    # Features that are running means of a per-game stat.
+    MEAN_FEATURES = ['mov', 'off_rtg', 'tov_pct', 'off_reb', 'ts_pct', 'def_rtg', 'def_reb', 'opp_tov_pct', 'pace']
+
+    LAST_N_GAMES = 10
+    ROLLING_WINDOWS = LeagueState.ROLLING_WINDOWS
+    EWMA = ExponentialAverages(MEAN_FEATURES, LeagueState.EWMA_HALF_LIVES, capacity=0)
+
+    TEAM_FEATURE_NAMES = ['win_loss_pct', 'mov', 'off_rtg', 'tov_pct', 'off_reb', 'ts_pct', 'def_rtg', 'def_reb',
+                          'opp_tov_pct', 'pace', 'last10_pct'] + \
+        [f'{stat}_last{window}' for window, stat in product(ROLLING_WINDOWS, MEAN_FEATURES)] + EWMA.feature_names
+    FEATURE_NAMES = TEAM_FEATURE_NAMES + ['avg_bpm']
+
+    @classmethod
+    def season_features(cls, games: list[Game], season_team_logs: dict[int, list[Row]],
+                        season_player_logs: dict[tuple[int, int], list[Row]] = None,
+                        max_games: int = 1230) -> tuple[np.ndarray, list[float], list[str]]:
+        """
+        Computes the home - away pre-game feature differentials of a season's games.
+        :param games: Season's games, in schedule order.
+        :param season_team_logs: Dictionary of game id to the game's two Rows (GameTeamLog, str).
+        :param season_player_logs: Dictionary of (game id, team id) to the team's player log rows (see
+        DatabaseService.get_player_logs_by_season_id). Default is no player logs (the BPM differential is 0).
+        :param max_games: Maximum number of games used (there are 1230 regular season games in a season).
+        :return: Feature differentials (one row per game), actual point differentials, corresponding game codes.
+        """
+        team_ids, stats, outcomes, game_codes = cls.to_team_games(games, season_team_logs, max_games)
+        team_features = cls.compute_features(team_ids, stats)
+
+        differentials = np.zeros((len(game_codes), len(cls.FEATURE_NAMES)))
+        differentials[:, :-1] = team_features[0::2] - team_features[1::2]
+        if season_player_logs:
+            differentials[:, -1] = cls.bpm_differentials(games, game_codes, season_player_logs)
+        return differentials, outcomes, game_codes
+
+    @classmethod
+    def bpm_differentials(cls, games: list[Game], game_codes: list[str],
+                          season_player_logs: dict[tuple[int, int], list[Row]]) -> np.ndarray:
+        """
+        Computes the home - away average pre-game BPM differential of the games used for features.
+        :param games: Season's games, in schedule order.
+        :param game_codes: Codes of the games used for features (see to_team_games).
+        :param season_player_logs: Dictionary of (game id, team id) to the team's player log rows.
+        :return: BPM differential of every game in game_codes.
+        """
+        used = set(game_codes)
+        registry = PlayerRegistry()
+        differentials = []
+        for game in games:
+            if game.game_code not in used:
+                continue
+            home_bpm = registry.average_bpm(*cls.roster(season_player_logs.get((game.id, game.home_team_id), [])))
+            away_bpm = registry.average_bpm(*cls.roster(season_player_logs.get((game.id, game.away_team_id), [])))
+            differentials.append(home_bpm - away_bpm)
+        return np.array(differentials, dtype=float)
+
+    @staticmethod
+    def roster(player_logs: list[Row]) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Lays out the players that played in a team's game (minutes played) as arrays.
+        :param player_logs: Team's player log rows for the game (player_id, minutes_played, box_plus_minus).
+        :return: Player ids, box plus/minus (NaN if missing).
+        """
+        played = [log for log in player_logs if log.minutes_played is not None]
+        player_ids = np.fromiter((log.player_id for log in played), dtype=np.int64, count=len(played))
+        bpms = np.fromiter((np.nan if log.box_plus_minus is None else float(log.box_plus_minus) for log in played),
+                           dtype=float, count=len(played))
+        return player_ids, bpms
+
+    @classmethod
+    def to_team_games(cls, games: list[Game], season_team_logs: dict[int, list[Row]],
+                      max_games: int = 1230) -> tuple[np.ndarray, np.ndarray, list[float], list[str]]:
+        """
+        Lays out a season's team game logs as arrays with one row per team per game (home row, then away row).
+        :param games: Season's games, in schedule order.
+        :param season_team_logs: Dictionary of game id to the game's two Rows (GameTeamLog, str).
+        :param max_games: Maximum number of games used.
+        :return: Team ids, per-game stats (win, then MEAN_FEATURES), actual point differentials, game codes.
+        """
+        team_ids = []
+        rows = []
+        outcomes = []
+        game_codes = []
+        for game in games:
+            if len(game_codes) >= max_games:
+                break
+
+            # Games without logs (e.g. not played yet) are skipped.
+            team_logs = season_team_logs.get(game.id, [])
+            if len(team_logs) != 2:
+                continue
+            home_log, away_log = (log.GameTeamLog for log in team_logs)
+            if home_log.team_id != game.home_team_id:
+                home_log, away_log = away_log, home_log
+
+            team_ids.extend((home_log.team_id, away_log.team_id))
+            rows.append(cls.__team_game_stats(home_log, away_log))
+            rows.append(cls.__team_game_stats(away_log, home_log))
+            outcomes.append(home_log.total_points - away_log.total_points)
+            game_codes.append(game.game_code)
+
+        stats = np.array(rows, dtype=float).reshape(len(rows), 1 + len(cls.MEAN_FEATURES))
+        return np.array(team_ids, dtype=np.int64), stats, outcomes, game_codes
+
+    @classmethod
+    def compute_features(cls, team_ids: np.ndarray, stats: np.ndarray) -> np.ndarray:
+        """
+        Computes every row's pre-game features with grouped cumulative sums shifted by one game.
+        :param team_ids: Team id of every row, in game order.
+        :param stats: Per-game stats of every row (win, then MEAN_FEATURES).
+        :return: Feature matrix (one row per team game, columns in TEAM_FEATURE_NAMES order).
+        """
+        # Group each team's rows together, keeping game order inside a team.
+        order = np.argsort(team_ids, kind='stable')
+        sorted_ids = team_ids[order]
+        group_starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+        group_ends = np.r_[group_starts[1:], len(sorted_ids)]
+
+        # Totals before each game: a cumulative sum per team, shifted down one game.
+        sorted_stats = stats[order]
+        pre_game_totals = np.zeros_like(sorted_stats)
+        games_played = np.zeros(len(sorted_ids))
+        for start, end in zip(group_starts, group_ends):
+            pre_game_totals[start + 1:end] = np.cumsum(sorted_stats[start:end - 1], axis=0)
+            games_played[start:end] = np.arange(end - start)
+
+        sorted_features = np.zeros((len(sorted_ids), len(cls.TEAM_FEATURE_NAMES)))
+        played = games_played > 0
+        # Season features: win%, the running means and the last n win%.
+        season_count = len(cls.MEAN_FEATURES) + 2
+        sorted_features[played, :season_count - 1] = pre_game_totals[played] / games_played[played, None]
+        last_n = cls.__last_n_means(pre_game_totals, games_played, group_starts, group_ends, cls.LAST_N_GAMES)
+        sorted_features[played, season_count - 1] = last_n[played, 0]
+
+        # Rolling means follow the season features, one block of MEAN_FEATURES per window.
+        for i, window in enumerate(cls.ROLLING_WINDOWS):
+            start = season_count + i * len(cls.MEAN_FEATURES)
+            rolling = cls.__last_n_means(pre_game_totals, games_played, group_starts, group_ends, window)
+            sorted_features[played, start:start + len(cls.MEAN_FEATURES)] = rolling[played, 1:]
+
+        # Exponentially weighted means follow the rolling means.
+        start = season_count + len(cls.ROLLING_WINDOWS) * len(cls.MEAN_FEATURES)
+        for group_start, group_end in zip(group_starts, group_ends):
+            sorted_features[group_start:group_end, start:] = \
+                cls.EWMA.pre_game_means(sorted_stats[group_start:group_end, 1:])
+
+        features = np.empty_like(sorted_features)
+        features[order] = sorted_features
+        return features
+
+    @staticmethod
+    def __last_n_means(pre_game_totals: np.ndarray, games_played: np.ndarray, group_starts: np.ndarray,
+                       group_ends: np.ndarray, window: int) -> np.ndarray:
+        # Totals of the last n games: the difference of the totals n games apart (within the team).
+        lagged_totals = np.zeros_like(pre_game_totals)
+        for start, end in zip(group_starts, group_ends):
+            if end - start > window:
+                lagged_totals[start + window:end] = pre_game_totals[start:end - window]
+        counts = np.minimum(games_played, window)[:, None]
+        return np.divide(pre_game_totals - lagged_totals, counts, out=np.zeros_like(pre_game_totals), where=counts > 0)
+
+    @staticmethod
+    def __team_game_stats(team_log, opp_team_log) -> tuple:
+        return (
+            1.0 if float(team_log.total_points) > float(opp_team_log.total_points) else 0.0,
+            team_log.total_points - opp_team_log.total_points,
+            team_log.offensive_rating,
+            team_log.turnover_pct,
+            team_log.offensive_rebounds,
+            team_log.true_shooting_pct,
+            team_log.defensive_rating,
+            team_log.defensive_rebounds,
+            opp_team_log.turnover_pct,
+            team_log.pace,
+        )
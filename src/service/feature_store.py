@@ -0,0 +1,79 @@
+import hashlib
+import os
+import shutil
+
+import numpy as np
+
+from common.atomic_write import atomic_write_directory
+
+
+class FeatureStore:
+    """
+    On-disk store of generated season data (feature matrix, outcomes and game codes).
+
+    Each season is stored as .npy files under `<directory>/<season>/<key>/`, where the key is a hash of the feature
+    definition version and a fingerprint of the season's source data. A season is rebuilt only when its key changes
+    (new games were ingested or the features changed); otherwise it is loaded memory-mapped.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Constructor for the feature store.
+        :param directory: Directory for the stored seasons. Created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(feature_version: int | str, data_fingerprint: str) -> str:
+        """
+        Builds the key of a season's stored data.
+        :param feature_version: Version of the feature definitions.
+        :param data_fingerprint: Fingerprint of the season's source data.
+        :return: Hex digest.
+        """
+        return hashlib.sha256(f'{feature_version}:{data_fingerprint}'.encode('utf-8')).hexdigest()[:16]
+
+    def load(self, season: int, key: str) -> tuple[np.ndarray, np.ndarray, list[str]] | None:
+        """
+        Loads a season's stored data, memory-mapped.
+        :param season: Season year (2021-2022 is 2022).
+        :param key: Key of the stored data.
+        :return: features, outcomes, game codes; or None if the season is not stored under this key.
+        """
+        path = self.__season_path(season, key)
+        try:
+            features = np.load(os.path.join(path, 'features.npy'), mmap_mode='r')
+            outcomes = np.load(os.path.join(path, 'outcomes.npy'), mmap_mode='r')
+            game_codes = np.load(os.path.join(path, 'game_codes.npy')).tolist()
+        except FileNotFoundError:
+            # Not stored, or being replaced by another process.
+            return None
+        return features, outcomes, game_codes
+
+    def save(self, season: int, key: str, features: np.ndarray, outcomes: list[float], game_codes: list[str]) -> None:
+        """
+        Stores a season's data under a key, replacing the season's data stored under any other key.
+        :param season: Season year (2021-2022 is 2022).
+        :param key: Key of the stored data.
+        :param features: Feature matrix (one row per game).
+        :param outcomes: Actual point differentials.
+        :param game_codes: Corresponding game codes.
+        :return: None
+        """
+        season_dir = os.path.join(self.directory, str(season))
+        os.makedirs(season_dir, exist_ok=True)
+
+        def write(path: str) -> None:
+            np.save(os.path.join(path, 'features.npy'), np.asarray(features, dtype=float))
+            np.save(os.path.join(path, 'outcomes.npy'), np.asarray(outcomes, dtype=float))
+            np.save(os.path.join(path, 'game_codes.npy'), np.asarray(game_codes, dtype=str))
+
+        atomic_write_directory(self.__season_path(season, key), write)
+
+        for entry in os.listdir(season_dir):
+            if entry != key and not entry.startswith('.'):
+                shutil.rmtree(os.path.join(season_dir, entry), ignore_errors=True)
+
+    def __season_path(self, season: int, key: str) -> str:
+        return os.path.join(self.directory, str(season), key)
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+
+import joblib
+import sklearn
+from sklearn.pipeline import Pipeline
+
+from common.atomic_write import atomic_write_directory
+
+
+class ModelStore:
+    """
+    On-disk store of fitted prediction pipelines.
+
+    Each model is stored under `<directory>/<key>/` as an uncompressed joblib file (so its arrays can be
+    memory-mapped when loaded) next to a metadata.json file. The key is a hash of the feature definition version, the
+    training years and a fingerprint of the training seasons' data, so a model is only reused for the exact data it
+    was trained on. The latest model saved for that data (e.g. a tuned pipeline) replaces the previous one; the
+    pipeline's configuration is recorded in the metadata.
+    """
+
+    MODEL_FILE = 'model.joblib'
+    METADATA_FILE = 'metadata.json'
+
+    def __init__(self, directory: str):
+        """
+        Constructor for the model store.
+        :param directory: Directory for the stored models. Created if it does not exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(feature_version: int | str, training_years: list[int], data_fingerprint: str) -> str:
+        """
+        Builds the key of a model.
+        :param feature_version: Version of the feature definitions.
+        :param training_years: Seasons the model is trained on.
+        :param data_fingerprint: Fingerprint of the training seasons' source data.
+        :return: Hex digest.
+        """
+        years = ','.join(str(year) for year in training_years)
+        return hashlib.sha256(f'{feature_version}:{years}:{data_fingerprint}'.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def pipeline_fingerprint(pipeline: Pipeline) -> str:
+        """
+        Summarizes a pipeline's configuration: its steps and every (nested) hyperparameter. Fitting doesn't change it.
+        :param pipeline: Pipeline, fitted or not.
+        :return: Hex digest.
+        """
+        # Nested estimators are described by their class; their parameters are listed on their own.
+        params = {name: type(value).__name__ if hasattr(value, 'get_params') else repr(value)
+                  for name, value in pipeline.get_params(deep=True).items() if name != 'steps'}
+        params['steps'] = [[name, type(step).__name__ if hasattr(step, 'get_params') else repr(step)]
+                           for name, step in pipeline.steps]
+        return hashlib.sha256(json.dumps(params, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+    def load(self, key: str) -> tuple[Pipeline, dict] | None:
+        """
+        Loads a stored model, memory-mapping its arrays.
+        :param key: Key of the model.
+        :return: pipeline, metadata; or None if no model is stored under this key.
+        """
+        path = os.path.join(self.directory, key)
+        try:
+            with open(os.path.join(path, self.METADATA_FILE)) as f:
+                metadata = json.load(f)
+            pipeline = joblib.load(os.path.join(path, self.MODEL_FILE), mmap_mode='r')
+        except FileNotFoundError:
+            # Not stored, or being replaced by another process.
+            return None
+
+        if metadata['sklearn_version'] != sklearn.__version__:
+            print(f"Model {key} was saved with scikit-learn {metadata['sklearn_version']} "
+                  f"(installed: {sklearn.__version__}).")
+        return pipeline, metadata
+
+    def save(self, key: str, pipeline: Pipeline, metadata: dict) -> None:
+        """
+        Stores a fitted model under a key, replacing any model stored under the same key.
+        :param key: Key of the model.
+        :param pipeline: Fitted pipeline.
+        :param metadata: JSON-serializable description of the model (training years, feature version, ...).
+        :return: None
+        """
+        metadata = dict(metadata, key=key, sklearn_version=sklearn.__version__)
+
+        def write(path: str) -> None:
+            joblib.dump(pipeline, os.path.join(path, self.MODEL_FILE))
+            with open(os.path.join(path, self.METADATA_FILE), 'w') as f:
+                json.dump(metadata, f, indent=2)
+
+        atomic_write_directory(os.path.join(self.directory, key), write)
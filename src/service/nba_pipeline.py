@@ -1,15 +1,29 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
 import numpy as np
 import pandas as pd
 
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
 from common.constants import TEAMS_CURRENT
-from models.database import GamePlayerLog
-from models.nba_player import NbaPlayer
+from models.league_state import LeagueState
 from models.nba_team import NbaTeam
-from sklearn.linear_model import LogisticRegression
+from models.player_registry import PlayerRegistry
+from sklearn.linear_model import LogisticRegression, Ridge
+from sklearn.model_selection import GridSearchCV, RandomizedSearchCV
 from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.utils.validation import check_is_fitted
+from service.database_engine import create_database_engine
+from service.bankroll import BankrollSimulator, RiskResult
 from service.database_service import DatabaseService
+from service.feature_engine import TeamFeatureEngine
+from service.feature_store import FeatureStore
+from service.model_store import ModelStore
+from service.season_state import SeasonState
 
 
 class NbaPredictor:
@@ -17,20 +31,26 @@ class NbaPredictor:
     This class is the predictor for NBA Games utilizing sklearn pipeline.
     """
 
-    def __init__(self, database_service: DatabaseService, seasons: list[int]):
+    def __init__(self, database_service: DatabaseService, seasons: list[int], feature_store: FeatureStore = None,
+                 workers: int = 1):
         """
         Constructor for Logistic Regression ML pipeline.
         :param seasons: Years for model training.
+        :param feature_store: Optional on-disk store of generated season data, reused while the season is unchanged.
+        :param workers: Number of worker processes generating seasons in parallel. Default is 1 (no worker processes).
         """
         self.training_years = seasons
         self.pipeline = Pipeline([
-            # ("scale", StandardScaler()),
+            # No scaling by default; tune_model tries StandardScaler().
+            ("scale", "passthrough"),
             ("model", LogisticRegression(random_state=True, solver='liblinear', max_iter=100))
         ])
 
         self.HOME_COURT_ADV = 1.0
 
         self.db = database_service
+        self.feature_store = feature_store
+        self.workers = workers
 
     def train_model(self):
         """
@@ -41,6 +61,116 @@ class NbaPredictor:
         # Train model
         self.pipeline.fit(training_input_data, training_output_data)
 
+    def save_model(self, model_store: ModelStore) -> str:
+        """
+        Stores the fitted pipeline with its metadata (training years, feature version, training data fingerprint,
+        pipeline configuration), replacing the model previously stored for the same data.
+        :param model_store: Model store.
+        :return: Key of the stored model.
+        """
+        check_is_fitted(self.pipeline)
+        data_fingerprint = self.training_data_fingerprint()
+        key = model_store.key(TeamFeatureEngine.FEATURE_VERSION, self.training_years, data_fingerprint)
+        model_store.save(key, self.pipeline, {
+            'training_years': self.training_years,
+            'feature_version': TeamFeatureEngine.FEATURE_VERSION,
+            'feature_names': TeamFeatureEngine.FEATURE_NAMES,
+            'data_fingerprint': data_fingerprint,
+            'pipeline': str(self.pipeline),
+            'pipeline_fingerprint': model_store.pipeline_fingerprint(self.pipeline),
+        })
+        print(f"Model {key} saved.")
+        return key
+
+    def load_model(self, model_store: ModelStore) -> bool:
+        """
+        Loads the pipeline trained on the training years' current data with the current features, if it was stored. The
+        stored pipeline (e.g. one tuned by tune_model) replaces the predictor's pipeline, configuration included.
+        :param model_store: Model store.
+        :return: True if a model was loaded (no training needed).
+        """
+        key = model_store.key(TeamFeatureEngine.FEATURE_VERSION, self.training_years,
+                              self.training_data_fingerprint())
+        stored = model_store.load(key)
+        if stored is None:
+            print(f"No stored model for training years {self.training_years} ({key}).")
+            return False
+
+        self.pipeline, metadata = stored
+        print(f"Model {key} loaded (trained on {metadata['training_years']}; {metadata['pipeline']}).")
+        return True
+
+    def training_data_fingerprint(self) -> str:
+        """
+        Summarizes the training years' data (see DatabaseService.get_season_fingerprint).
+        :return: Fingerprint string.
+        """
+        return '|'.join(self.db.get_season_fingerprint(self.db.get_season_by_year(year).id)
+                        for year in self.training_years)
+
+    def tune_model(self, param_grid: list[dict] | dict = None, n_iter: int = None, n_jobs: int = -1,
+                   scoring: str = 'neg_mean_absolute_error') -> GridSearchCV | RandomizedSearchCV:
+        """
+        Searches pipeline steps and hyperparameters with season-forward splits (train on the seasons before a season,
+        validate on that season), then keeps the best pipeline refit on all training years.
+
+        The training data is generated once; candidates are fit in parallel worker processes that share it (joblib
+        memory-maps large arrays instead of copying them to every worker).
+        :param param_grid: Grid of pipeline parameters, e.g. {'scale': ['passthrough', StandardScaler()],
+        'model__C': [0.1, 1.0]}. Default is default_tuning_grid().
+        :param n_iter: Number of randomly sampled candidates. Default is the full grid.
+        :param n_jobs: Number of parallel workers (-1 is every core).
+        :param scoring: sklearn scoring of the predicted point differentials.
+        :return: Fitted search (see cv_results_ for every candidate's scores).
+        """
+        season_data = self.generate_seasons(self.training_years)
+        inputs = np.concatenate([np.asarray(features, dtype=float) for features, _, _ in season_data])
+        outcomes = np.concatenate([np.asarray(season_outcomes, dtype=float) for _, season_outcomes, _ in season_data])
+        seasons = np.concatenate([np.full(len(season_outcomes), year)
+                                  for year, (_, season_outcomes, _) in zip(self.training_years, season_data)])
+
+        splits = self.season_splits(seasons)
+        param_grid = param_grid if param_grid is not None else self.default_tuning_grid()
+        if n_iter is None:
+            search = GridSearchCV(self.pipeline, param_grid, scoring=scoring, cv=splits, n_jobs=n_jobs)
+        else:
+            search = RandomizedSearchCV(self.pipeline, param_grid, n_iter=n_iter, scoring=scoring, cv=splits,
+                                        n_jobs=n_jobs, random_state=0)
+        search.fit(inputs, outcomes)
+
+        self.pipeline = search.best_estimator_
+        print(f"Best score: {search.best_score_} ({scoring}) with {search.best_params_}.")
+        return search
+
+    @staticmethod
+    def season_splits(seasons: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+        """
+        Builds forward-chaining splits: every season after the first is validated on a model trained on the seasons
+        before it.
+        :param seasons: Season of every training row.
+        :return: List of (train indexes, validation indexes).
+        """
+        years = sorted(set(seasons.tolist()))
+        if len(years) < 2:
+            raise ValueError("Season-forward splits need at least two seasons.")
+        return [(np.flatnonzero(seasons < year), np.flatnonzero(seasons == year)) for year in years[1:]]
+
+    @staticmethod
+    def default_tuning_grid() -> list[dict]:
+        """
+        Default candidates of tune_model: with and without scaling, logistic regression with several regularization
+        strengths and solvers, and ridge regression of the point differential.
+        :return: List of parameter grids.
+        """
+        scalers = ['passthrough', StandardScaler()]
+        return [
+            {'scale': scalers, 'model': [LogisticRegression(random_state=True, solver='liblinear', max_iter=100)],
+             'model__C': [0.01, 0.1, 1.0, 10.0]},
+            {'scale': scalers, 'model': [LogisticRegression(random_state=True, solver='lbfgs', max_iter=1000)],
+             'model__C': [0.01, 0.1, 1.0, 10.0]},
+            {'scale': scalers, 'model': [Ridge()], 'model__alpha': [0.1, 1.0, 10.0, 100.0]},
+        ]
+
     def generate_data(self, years: list[int]) -> tuple[list[list[float]], list[float], list[str]]:
         """
         Generates input data to model training and predictions
@@ -51,111 +181,173 @@ class NbaPredictor:
         actual_outcomes = []
         corresponding_games = []
 
-        for year in years:
-            season = self.db.get_season_by_year(year)
-            schedule = self.db.get_games_by_season_id(season.id)
-            teams: dict = self.create_teams(year)
-            players: dict[NbaPlayer] = {}
-            count = 0
-            for game in schedule:
-                # Skipping the first 150 games so that each team has approximately player ~ 10 games.
-                # if count <= 150:
-                #     count += 1
-                #     continue
-
-                # There are 1230 regular season games in a season.
-                if count >= 1230:
-                    break
-                # Get team game logs from database.
-                home_team_log, away_team_log = self.db.get_team_logs_by_game_id(game.id)
-
-                # Get Team objects from memory.
-                home_team_obj: NbaTeam = teams[f"{home_team_log.name}"]
-                away_team_obj: NbaTeam = teams[f"{away_team_log.name}"]
-
-                home_player_logs: list[GamePlayerLog] = self.db.get_player_logs_by_game_id_team_id(game.id,
-                                                                                                   game.home_team_id)
-                away_player_logs: list[GamePlayerLog] = self.db.get_player_logs_by_game_id_team_id(game.id,
-                                                                                                   game.away_team_id)
-
-                # Get features from team objects (before this game's stats).
-                features: list[float] = self.generate_features_differential(home_team_obj, away_team_obj)
-
-                # Add average BPM differential from player objects
-                np.append(features, (self.calculate_avg_bpm(home_player_logs, players) -
-                                     self.calculate_avg_bpm(away_player_logs, players)))
-
-                # Calculate outcome data.
-                total_points_differential: float = \
-                    home_team_log.GameTeamLog.total_points - away_team_log.GameTeamLog.total_points
-
-                pipeline_inputs.append(features)
-                actual_outcomes.append(total_points_differential)
-                corresponding_games.append(game.game_code)
-
-                # Update team and player objects.
-                home_team_obj.update_features(home_team_log, away_team_log)
-                away_team_obj.update_features(away_team_log, home_team_log)
-
-                count += 1
+        for features, outcomes, game_codes in self.generate_seasons(years):
+
+            pipeline_inputs.extend(features)
+            actual_outcomes.extend(outcomes)
+            corresponding_games.extend(game_codes)
 
         return pipeline_inputs, actual_outcomes, corresponding_games
 
+    def generate_seasons(self, years: list[int]) -> list[tuple[np.ndarray, list[float] | np.ndarray, list[str]]]:
+        """
+        Generates every season's input data, in worker processes when the predictor has more than one worker.
+        :param years: list of seasons
+        :return: Every season's input features, actual outcomes and game codes, in the order of years.
+        """
+        # A season listed several times is generated once.
+        distinct_years = list(dict.fromkeys(years))
+        # Seasons don't share any team or player state, so they can be generated independently.
+        if self.workers > 1 and len(distinct_years) > 1:
+            season_data = self.generate_seasons_in_workers(distinct_years)
+        else:
+            season_data = [self.generate_season_data(year) for year in distinct_years]
+
+        season_data_by_year = dict(zip(distinct_years, season_data))
+        return [season_data_by_year[year] for year in years]
+
+    def generate_seasons_in_workers(self, years: list[int]) -> list[tuple[np.ndarray, np.ndarray, list[str]]]:
+        """
+        Generates seasons' input data in worker processes, each with its own database connection.
+        :param years: list of distinct seasons (workers of the same season would write the same feature store entry)
+        :return: Every season's input features, actual outcomes and game codes, in the order of years.
+        """
+        if len(set(years)) != len(years):
+            raise ValueError(f"Seasons should be distinct: {years}.")
+
+        url = self.db.engine.url
+        if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+            print("In-memory databases can't be shared with worker processes; generating seasons serially.")
+            return [self.generate_season_data(year) for year in years]
+
+        database_url = url.render_as_string(hide_password=False)
+        feature_store_directory = self.feature_store.directory if self.feature_store is not None else None
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(years))) as executor:
+            # Results come back in the order of years, whichever worker finishes first.
+            return list(executor.map(NbaPredictor.generate_season_data_in_worker, repeat(database_url), years,
+                                     repeat(feature_store_directory)))
+
+    @staticmethod
+    def generate_season_data_in_worker(database_url: str, year: int,
+                                       feature_store_directory: str = None) -> tuple[np.ndarray, np.ndarray, list[str]]:
+        """
+        Generates a season's input data in a worker process (see generate_seasons_in_workers).
+        :param database_url: SQLAlchemy database url; the worker opens its own connection.
+        :param year: Season year (2021-2022 is 2022).
+        :param feature_store_directory: Directory of the feature store. Default is no feature store.
+        :return: Input features (2d array), actual outcome data (array), corresponding game code (array)
+        """
+        engine = create_database_engine(database_url)
+        session = Session(engine)
+        try:
+            feature_store = FeatureStore(feature_store_directory) if feature_store_directory else None
+            predictor = NbaPredictor(DatabaseService(session, None, engine), [year], feature_store)
+            features, outcomes, game_codes = predictor.generate_season_data(year)
+            # Copy stored (memory-mapped) data so it can be sent back to the parent process.
+            return np.array(features, dtype=float), np.array(outcomes, dtype=float), list(game_codes)
+        finally:
+            session.close()
+            engine.dispose()
+
+    def generate_season_data(self, year: int) -> tuple[np.ndarray, list[float] | np.ndarray, list[str]]:
+        """
+        Generates a season's input data, loading it from the feature store when the season has not changed.
+        :param year: Season year (2021-2022 is 2022).
+        :return: Input features (2d array), actual outcome data (array), corresponding game code (array)
+        """
+        season = self.db.get_season_by_year(year)
+
+        key = None
+        if self.feature_store is not None:
+            key = self.feature_store.key(TeamFeatureEngine.FEATURE_VERSION,
+                                         self.db.get_season_fingerprint(season.id))
+            stored = self.feature_store.load(year, key)
+            if stored is not None:
+                return stored
+
+        # Preload the whole season in a few queries; features are then computed for all games at once.
+        schedule = self.db.get_games_by_season_id(season.id)
+        season_team_logs = self.db.get_team_logs_by_season_id(season.id)
+        season_player_logs = self.db.get_player_logs_by_season_id(season.id)
+
+        # Features are the home - away differentials of the teams' stats and players' average BPM before each game.
+        features, outcomes, game_codes = TeamFeatureEngine.season_features(schedule, season_team_logs,
+                                                                           season_player_logs)
+
+        if self.feature_store is not None:
+            self.feature_store.save(year, key, features, outcomes, game_codes)
+        return features, outcomes, game_codes
+
+    def update_season_state(self, year: int, snapshot_path: str = None) -> SeasonState:
+        """
+        Brings a season's team and player state up to date, resuming from a snapshot when there is one, so only the
+        games played since the snapshot are loaded and applied. Games are applied in schedule order, so when a game
+        older than the snapshot's last game was ingested since (e.g. a retried game), the state is rebuilt.
+        :param year: Season year (2021-2022 is 2022).
+        :param snapshot_path: Snapshot file, updated after the new games are applied. Default is no snapshot.
+        :return: SeasonState after the latest played game.
+        """
+        state = SeasonState.load(snapshot_path) if snapshot_path else None
+        if state is None or state.season != year:
+            state = SeasonState(year)
+
+        season = self.db.get_season_by_year(year)
+        if state.last_game_datetime is not None:
+            ingested = self.db.get_ingested_game_codes(season.id) - state.processed_game_codes
+            if ingested and any(game.game_code in ingested and game.start_datetime < state.last_game_datetime
+                   for game in self.db.get_games_by_season_id(season.id)):
+                print(f"Games older than the {year} season state's last game were ingested; rebuilding the state.")
+                state = SeasonState(year)
+
+        schedule = self.db.get_games_by_season_id(season.id, state.last_game_datetime)
+        season_team_logs = self.db.get_team_logs_by_season_id(season.id, state.last_game_datetime)
+        season_player_logs = self.db.get_player_logs_by_season_id(season.id, state.last_game_datetime)
+
+        for game in schedule:
+            # Games without logs (e.g. not played yet) are skipped.
+            team_logs = season_team_logs.get(game.id, [])
+            if len(team_logs) != 2 or state.is_processed(game):
+                continue
+            home_team_log, away_team_log = team_logs
+            if home_team_log.GameTeamLog.team_id != game.home_team_id:
+                home_team_log, away_team_log = away_team_log, home_team_log
+
+            state.apply_game(game, home_team_log, away_team_log,
+                             season_player_logs.get((game.id, game.home_team_id), []),
+                             season_player_logs.get((game.id, game.away_team_id), []))
+
+        if snapshot_path:
+            state.save(snapshot_path)
+        return state
+
     def run_prediction_for_season(self, year: int):
         """
         Predicts a season of the NBA using a trained model; used for prediction accuracy.
         :param year: Season year (2021-2022 is 2022).
         :return: None
         """
-        # Initialize counters
-        correct, incorrect, push, dnp = 0, 0, 0, 0
-        results = []
-
         prediction_inputs, actual_outcomes, game_codes = self.generate_data([year])
         predictions = self.pipeline.predict(prediction_inputs)
 
         if len(predictions) != len(actual_outcomes):
             raise ValueError("List lengths should be the same")
 
-        for i in range(len(predictions)):
-            odds: float | None = self.db.get_spread_by_game_code(game_codes[i])
-            if odds is None:
-                dnp += 1  # no odds: do not count prediction.
-                continue
-
-            # Predict home team wins by more than the oddsmakers. We bet the home team spread.
-            # TODO: double check that this math is correct (i.e. Positives and negatives).
-            res = [predictions[i], actual_outcomes[i], odds, game_codes[i]]
-            print(f"{i}: {game_codes[i]}")
-            if predictions[i] < odds:
-                if actual_outcomes[i] < odds:
-                    correct += 1
-                    res.append("Correct")
-                elif actual_outcomes[i] > odds:
-                    incorrect += 1
-                    res.append("Incorrect")
-                else:
-                    push += 1
-                    res.append("Push")
-            elif predictions[i] > odds:
-                if actual_outcomes[i] < odds:
-                    incorrect += 1
-                    res.append("Incorrect")
-                elif actual_outcomes[i] > odds:
-                    correct += 1
-                    res.append("Correct")
-                else:
-                    push += 1
-                    res.append("Push")
-            else:
-                dnp += 1
-                continue
-
-            results.append(res)
-
-        results_summary = pd.DataFrame(data=results,
-                                       columns=['Prediction', 'Actual Point Difference', 'Closing Odds', 'Game Code',
-                                                'Prediction Outcome'])
+        spreads = self.db.get_spreads_by_game_codes(list(game_codes))
+        # Games without odds have a NaN spread and are not predicted.
+        odds = np.array([spreads.get(game_code) for game_code in game_codes], dtype=float)
+        outcomes = self.grade_predictions(predictions, actual_outcomes, odds)
+
+        correct, incorrect, push, dnp = (int(np.count_nonzero(outcomes == outcome))
+                                         for outcome in ("Correct", "Incorrect", "Push", "DNP"))
+
+        bets = outcomes != "DNP"
+        results_summary = pd.DataFrame({
+            'Prediction': np.asarray(predictions, dtype=float)[bets],
+            'Actual Point Difference': np.asarray(actual_outcomes, dtype=float)[bets],
+            'Closing Odds': odds[bets],
+            'Game Code': np.asarray(game_codes, dtype=object)[bets],
+            'Prediction Outcome': outcomes[bets],
+        })
         outname = f'{year}_prediction.csv'
         outdir = './data'
         if not os.path.exists(outdir):
@@ -170,6 +362,26 @@ class NbaPredictor:
               f"DNPs)")
         print(f"Win Loss Percentage: {win_loss_pct} (Does not include pushes or DNP)")
 
+    @staticmethod
+    def grade_predictions(predictions: np.ndarray, actual_outcomes: np.ndarray, odds: np.ndarray) -> np.ndarray:
+        """
+        Grades predicted point differences against the home team spread.
+
+        Predicting below the spread bets one side and predicting above it bets the other: the bet is correct when the
+        actual point difference lands on the same side of the spread, incorrect on the other side and a push on the
+        spread. Predictions equal to the spread and games without odds (NaN) are not bet on ("DNP").
+        :param predictions: Predicted point differences.
+        :param actual_outcomes: Actual point differences.
+        :param odds: Closing home team spread of every game.
+        :return: Prediction Outcome of every game ("Correct", "Incorrect", "Push" or "DNP").
+        """
+        odds = np.asarray(odds, dtype=float)
+        # TODO: double check that this math is correct (i.e. Positives and negatives).
+        side = np.sign(np.asarray(predictions, dtype=float) - odds)
+        result = np.sign(np.asarray(actual_outcomes, dtype=float) - odds)
+        bet = ~np.isnan(odds) & (side != 0)
+        return np.select([~bet, result == 0, side == result], ["DNP", "Push", "Correct"], default="Incorrect")
+
     def check_prediction(self):
         """
         Checks prediction based on odds data against outcome data for prediction accuracy.
@@ -185,36 +397,15 @@ class NbaPredictor:
         """
         raise NotImplementedError()
 
-    def calculate_avg_bpm(self, player_logs, players: dict) -> float:
+    @staticmethod
+    def calculate_avg_bpm(player_logs: list[Row], players: PlayerRegistry) -> float:
         """
-        Calculates the average box plus/minus differential of the players between two teams in a game.
-        :param players: Dictionary of NbaPlayer objects.
-        :param player_logs: Team's player logs for the game.
+        Calculates the average pre-game box plus/minus of a team's players in a game, then adds the game to their BPM.
+        :param player_logs: Team's player logs for the game (player_id, minutes_played, box_plus_minus).
+        :param players: Registry of the players' BPM, keyed by player id.
         :return: float of the average box plus/minus.
         """
-        pre_bpm_sum = 0.0
-        count = 0
-
-        # TODO: Add support to advanced stats in database.
-        # TODO: Currently this uses a player dict, but make it so that we query instead to reduce our memory usage.
-        for player_log in player_logs:
-            if player_log.minutes_played is None:
-                continue
-
-            player = self.db.get_player_by_player_id(player_log.player_id)
-            player_obj = players.get(player.unique_code)
-            if not player_obj:
-                players[player.unique_code] = NbaPlayer(player.friendly_name, player.unique_code)
-                pre_bpm_sum += float(players[player.unique_code].bpm)
-            else:
-                pre_bpm_sum += float(player_obj.bpm)
-            count += 1
-
-            players[player.unique_code].update_bpm(player_log)
-        if count == 0:
-            return 0
-
-        return pre_bpm_sum / count
+        return players.average_bpm(*TeamFeatureEngine.roster(player_logs))
 
     @staticmethod
     def generate_features_differential(home: NbaTeam, away: NbaTeam) -> list[float]:
@@ -239,8 +430,9 @@ class NbaPredictor:
         :return: Dictionary of NBA teams (season unique).
         """
         teams = {}
+        league = LeagueState(team_capacity=len(TEAMS_CURRENT), player_capacity=0)
         for team in TEAMS_CURRENT:
-            teams[team] = NbaTeam(team, year)
+            teams[team] = NbaTeam(team, year, league)
             print(f'{team} created.')
         return teams
 
@@ -254,49 +446,16 @@ class NbaPredictor:
         :return:
         """
         predictions = pd.read_csv(data_path, header=0, index_col=0)
-        bankroll = initial_bankroll
-        daily_starting_bankroll = []
-        minimum_bankroll = initial_bankroll
-        maximum_bankroll = 0
-        current_day = predictions.iloc[0]["Game Code"][:8]
-        today_bankroll = initial_bankroll
-        plus_minus = []
-        max_loss_streak = 0
-        curr_loss_streak = 0
-        prev_result = "Push"
-
-        for index, row in predictions.iterrows():
-            game_day = row["Game Code"][:8]
-
-            if game_day != current_day:
-                yesterday_bankroll = today_bankroll
-                plus_minus.append(bankroll - yesterday_bankroll)
-                current_day = game_day
-                today_bankroll = bankroll
-            else:
-                plus_minus.append(None)
-
-            bet_amount = max(today_bankroll * unit_pct, min_unit)
-            if row["Prediction Outcome"] == "Correct":
-                bankroll += ((bet_amount * 1.90) - bet_amount)
-                curr_loss_streak = 0
-                prev_result = "Correct"
-            elif row["Prediction Outcome"] == "Incorrect":
-                bankroll -= bet_amount
-                if prev_result == "Incorrect" or prev_result == "Push":
-                    curr_loss_streak += 1
-                    max_loss_streak = max(max_loss_streak, curr_loss_streak)
-                prev_result = "Incorrect"
-            else:
-                prev_result = "Push"
-
-            daily_starting_bankroll.append(today_bankroll)
-
-            maximum_bankroll = max(today_bankroll, maximum_bankroll)
-            minimum_bankroll = min(today_bankroll, minimum_bankroll)
-
-        predictions["Bankroll Progression"] = daily_starting_bankroll
-        predictions["Plus_Minus"] = plus_minus
+        result = BankrollSimulator(initial_bankroll, unit_pct, min_unit)\
+            .simulate(predictions["Game Code"].tolist(), predictions["Prediction Outcome"].tolist())
+
+        bankroll = result.bankroll
+        minimum_bankroll = result.minimum_bankroll
+        maximum_bankroll = result.maximum_bankroll
+        max_loss_streak = result.max_loss_streak
+
+        predictions["Bankroll Progression"] = result.daily_starting_bankroll
+        predictions["Plus_Minus"] = result.plus_minus
 
         profit = bankroll - initial_bankroll
 
@@ -313,6 +472,28 @@ class NbaPredictor:
         print(f"Lowest Bankroll: ${formatted_minimum_bankroll} | Highest Bankroll: ${formatted_maximum_bankroll}")
         print(f"Max Loss Streak: {max_loss_streak}")
 
+    def check_risk(self, data_path: str, initial_bankroll: float, unit_pct: float, min_unit: float,
+                   paths: int = 10000, seed: int = None) -> RiskResult:
+        """
+        Estimates the risk of the result csv's staking by simulating bankroll paths over bootstrapped seasons of its
+        prediction outcomes.
+        :param data_path: File path for predictions
+        :param initial_bankroll: Initial Starting Money
+        :param unit_pct: Wager amount per game (percentage of bankroll to bet)
+        :param min_unit: Minimum bet amount.
+        :param paths: Number of simulated seasons.
+        :param seed: Random seed.
+        :return: RiskResult
+        """
+        predictions = pd.read_csv(data_path, header=0, index_col=0)
+        result = BankrollSimulator(initial_bankroll, unit_pct, min_unit)\
+            .simulate_risk(predictions["Game Code"].tolist(), predictions["Prediction Outcome"].tolist(),
+                           paths=paths, seed=seed)
+
+        print(f"Risk of Ruin: {result.risk_of_ruin:.2%} ({paths} simulated seasons).")
+        print(result.percentiles().to_string())
+        return result
+
     @staticmethod
     def to_currency_formatting(value):
         desired_representation = "{:,}".format(value)
@@ -0,0 +1,188 @@
+import json
+import os
+import zlib
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy.engine import Row
+
+from common.atomic_write import atomic_write
+from models.database import Game
+from models.league_state import LeagueState
+from models.nba_player import NbaPlayer
+from models.nba_team import NbaTeam
+
+
+class SeasonState:
+    """
+    In-season state of every team (NbaTeam running totals and last 10 results) and player (NbaPlayer BPM), tagged
+    with the processed games.
+
+    The state can be saved as a compact snapshot (zlib-compressed JSON) and resumed later by applying only the games
+    played since, so daily predictions don't replay the season from its first game.
+    """
+
+    SNAPSHOT_VERSION = 4
+
+    def __init__(self, season: int):
+        """
+        Constructor for an empty season state.
+        :param season: Season year (2021-2022 is 2022).
+        """
+        self.season = season
+        # Team and player values are rows of one league state; the objects below are views over those rows.
+        self.league = LeagueState()
+        self.teams: dict[str, NbaTeam] = {}
+        self.players: dict[str, NbaPlayer] = {}
+
+        self.games_processed = 0
+        self.last_game_code: str | None = None
+        self.last_game_datetime: datetime | None = None
+        # Every processed game, so games ingested late (older than the last processed game) are not taken as processed.
+        self.processed_game_codes: set[str] = set()
+
+    def team(self, name: str) -> NbaTeam:
+        """
+        Gets a team's state, creating it on first use.
+        :param name: Team name.
+        :return: NbaTeam object.
+        """
+        team = self.teams.get(name)
+        if team is None:
+            team = NbaTeam(name, self.season, self.league)
+            self.teams[name] = team
+        return team
+
+    def is_processed(self, game: Game) -> bool:
+        """
+        Checks whether a game was already applied to the state.
+        :param game: Game object.
+        :return: True if the game was applied.
+        """
+        return game.game_code in self.processed_game_codes
+
+    def apply_game(self, game: Game, home_team_log: Row, away_team_log: Row, home_player_logs: list[Row],
+                   away_player_logs: list[Row]) -> None:
+        """
+        Updates the teams and players with a game's logs.
+        :param game: Game object.
+        :param home_team_log: Home team's Row (GameTeamLog, str).
+        :param away_team_log: Away team's Row (GameTeamLog, str).
+        :param home_player_logs: Home team's player log rows (see DatabaseService.get_player_logs_by_season_id).
+        :param away_player_logs: Away team's player log rows.
+        :return: None
+        """
+        team_indexes = np.array([self.team(home_team_log.name).index, self.team(away_team_log.name).index])
+        team_stats = np.array([LeagueState.team_stats(home_team_log.GameTeamLog),
+                               LeagueState.team_stats(away_team_log.GameTeamLog)])
+        # Each team's opponent is the other row.
+        self.league.apply_games(team_indexes, team_stats, team_stats[::-1])
+
+        player_indexes, bpms = [], []
+        for player_log in home_player_logs + away_player_logs:
+            if player_log.minutes_played is None:
+                continue
+            player = self.players.get(player_log.unique_code)
+            if player is None:
+                player = NbaPlayer(player_log.friendly_name, player_log.unique_code, self.league)
+                self.players[player_log.unique_code] = player
+            player_indexes.append(player.index)
+            bpms.append(np.nan if player_log.box_plus_minus is None else float(player_log.box_plus_minus))
+        self.league.update_player_bpm(np.array(player_indexes, dtype=np.intp), np.array(bpms, dtype=float))
+
+        self.processed_game_codes.add(game.game_code)
+        self.last_game_datetime = game.start_datetime
+        self.last_game_code = game.game_code
+        self.games_processed += 1
+
+    def features(self, home: str, away: str, home_players: list[str] = None,
+                 away_players: list[str] = None) -> np.ndarray:
+        """
+        Gets the home - away feature differential of an upcoming game (columns of TeamFeatureEngine.FEATURE_NAMES).
+        :param home: Home team name.
+        :param away: Away team name.
+        :param home_players: Unique codes of the home team's expected players. Default is no players (BPM of 0).
+        :param away_players: Unique codes of the away team's expected players. Default is no players.
+        :return: Feature differential.
+        """
+        home_team, away_team = self.team(home), self.team(away)
+        home_features = home_team.features + home_team.rolling_features + home_team.ewma_features + \
+            [self.average_bpm(home_players or [])]
+        away_features = away_team.features + away_team.rolling_features + away_team.ewma_features + \
+            [self.average_bpm(away_players or [])]
+        return np.subtract(home_features, away_features)
+
+    def average_bpm(self, player_codes: list[str]) -> float:
+        """
+        Gets the average BPM of players; players that have not played yet count as 0.
+        :param player_codes: Players' unique codes.
+        :return: Average BPM, 0 if there are no players.
+        """
+        if len(player_codes) == 0:
+            return 0
+        indexes = [self.players[code].index for code in player_codes if code in self.players]
+        bpm = LeagueState.PLAYER_FIELDS.index('bpm')
+        return float(self.league.player_values[indexes, bpm].sum() / len(player_codes))
+
+    def to_snapshot(self) -> bytes:
+        """
+        Serializes the state.
+        :return: Compressed snapshot.
+        """
+        snapshot = {
+            'version': self.SNAPSHOT_VERSION,
+            'season': self.season,
+            'games_processed': self.games_processed,
+            'last_game_code': self.last_game_code,
+            'last_game_datetime': self.last_game_datetime.isoformat() if self.last_game_datetime else None,
+            'processed_game_codes': sorted(self.processed_game_codes),
+            'teams': [team.to_state() for team in self.teams.values()],
+            'players': [player.to_state() for player in self.players.values()],
+        }
+        return zlib.compress(json.dumps(snapshot, separators=(',', ':')).encode('utf-8'))
+
+    @classmethod
+    def from_snapshot(cls, data: bytes) -> 'SeasonState':
+        """
+        Restores a state serialized by to_snapshot.
+        :param data: Compressed snapshot.
+        :return: SeasonState object.
+        """
+        snapshot = json.loads(zlib.decompress(data).decode('utf-8'))
+        if snapshot['version'] != cls.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported season state snapshot version {snapshot['version']}.")
+
+        state = cls(snapshot['season'])
+        state.games_processed = snapshot['games_processed']
+        state.last_game_code = snapshot['last_game_code']
+        if snapshot['last_game_datetime'] is not None:
+            state.last_game_datetime = datetime.fromisoformat(snapshot['last_game_datetime'])
+        state.processed_game_codes = set(snapshot['processed_game_codes'])
+        state.teams = {team['team_name']: NbaTeam.from_state(team, state.league) for team in snapshot['teams']}
+        state.players = {player['player_code']: NbaPlayer.from_state(player, state.league)
+                         for player in snapshot['players']}
+        return state
+
+    def save(self, path: str) -> None:
+        """
+        Writes a snapshot of the state to a file.
+        :param path: Snapshot file path.
+        :return: None
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        atomic_write(path, self.to_snapshot())
+
+    @classmethod
+    def load(cls, path: str) -> 'SeasonState | None':
+        """
+        Reads a snapshot file.
+        :param path: Snapshot file path.
+        :return: SeasonState object, or None if the file does not exist.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return cls.from_snapshot(f.read())
@@ -0,0 +1,140 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import pandas as pd
+
+from service.bankroll import BankrollSimulator
+
+
+class StakingSweep:
+    """
+    Evaluates a grid of staking parameters against saved prediction results of several seasons.
+
+    Every season's csv is read once into day starts and outcome arrays. With several workers, the arrays are sent to
+    each worker process once (when it starts) and every (season, parameters) cell only sends its parameters.
+
+    A cell either stakes a fixed percentage of the bankroll (unit_pct) or a fraction of the Kelly stake
+    (kelly_fraction), the Kelly stake being computed from the season's own hit rate. That hit rate is only known after
+    the season, so Kelly cells show how the staking would have done with a correctly estimated edge. Without an edge
+    the Kelly stake is 0 and the cell places no bets.
+    """
+
+    COLUMNS = ['Season', 'Initial Bankroll', 'Unit Pct', 'Min Unit', 'Kelly Fraction', 'Bankroll', 'Profit', 'ROI',
+               'Minimum Bankroll', 'Maximum Bankroll', 'Max Drawdown', 'Max Loss Streak', 'Bets']
+
+    # Seasons of a worker process, set once when the worker starts (see init_worker).
+    worker_seasons: dict[int, dict] = {}
+
+    def __init__(self, prediction_paths: dict[int, str], workers: int = 1):
+        """
+        Constructor for a staking sweep.
+        :param prediction_paths: File path for predictions of every season, e.g. {2022: 'data/2022_prediction.csv'}.
+        :param workers: Number of worker processes evaluating the grid. 1 evaluates it in this process.
+        """
+        self.workers = max(1, workers or 1)
+        self.seasons = {year: self.load_season(data_path) for year, data_path in prediction_paths.items()}
+
+    @staticmethod
+    def load_season(data_path: str) -> dict:
+        """
+        Reads a season's prediction results into arrays.
+        :param data_path: File path for predictions
+        :return: Dictionary with the day starts, correct and incorrect bets and the hit rate (pushes excluded).
+        """
+        predictions = pd.read_csv(data_path, header=0, index_col=0)
+        outcomes = predictions["Prediction Outcome"].to_numpy(dtype=str)
+        correct = outcomes == "Correct"
+        incorrect = outcomes == "Incorrect"
+        decided = int(correct.sum() + incorrect.sum())
+        return {
+            'day_starts': BankrollSimulator.day_starts(predictions["Game Code"].tolist()),
+            'correct': correct,
+            'incorrect': incorrect,
+            'win_probability': correct.sum() / decided if decided else 0.0,
+        }
+
+    @staticmethod
+    def staking_grid(initial_bankrolls: tuple[float, ...] = (1000.0,),
+                     unit_pcts: tuple[float, ...] = (0.01, 0.02, 0.03, 0.05, 0.1),
+                     min_units: tuple[float, ...] = (5.0,),
+                     kelly_fractions: tuple[float, ...] = (0.25, 0.5, 1.0)) -> list[dict]:
+        """
+        Builds a grid of staking parameters: every fixed unit percentage, then every Kelly fraction, for every
+        initial bankroll and minimum bet.
+        :param initial_bankrolls: Initial Starting Money
+        :param unit_pcts: Wager amounts per game (percentage of bankroll to bet)
+        :param min_units: Minimum bet amounts.
+        :param kelly_fractions: Fractions of the Kelly stake.
+        :return: List of parameters (initial_bankroll, min_unit and either unit_pct or kelly_fraction).
+        """
+        grid = []
+        for initial_bankroll, min_unit in product(initial_bankrolls, min_units):
+            cell = {'initial_bankroll': float(initial_bankroll), 'min_unit': float(min_unit)}
+            grid += [dict(cell, unit_pct=float(unit_pct), kelly_fraction=None) for unit_pct in unit_pcts]
+            grid += [dict(cell, unit_pct=None, kelly_fraction=float(fraction)) for fraction in kelly_fractions]
+        return grid
+
+    def run(self, grid: list[dict] = None) -> pd.DataFrame:
+        """
+        Evaluates every staking parameters of the grid on every season.
+        :param grid: Staking parameters (see staking_grid). Default is staking_grid().
+        :return: Dataframe with one row per (season, parameters), columns COLUMNS.
+        """
+        grid = grid if grid is not None else self.staking_grid()
+        years, cells = zip(*product(self.seasons, grid)) if self.seasons and grid else ((), ())
+
+        if self.workers == 1 or len(cells) <= 1:
+            rows = [self.evaluate(year, self.seasons[year], cell) for year, cell in zip(years, cells)]
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=StakingSweep.init_worker,
+                                     initargs=(self.seasons,)) as executor:
+                # Cells are cheap; batching them saves a round trip per cell.
+                chunksize = max(1, len(cells) // (4 * self.workers))
+                rows = list(executor.map(StakingSweep.evaluate_in_worker, years, cells, chunksize=chunksize))
+
+        print(f"Staking sweep: {len(grid)} parameters on {len(self.seasons)} seasons.")
+        return pd.DataFrame(rows, columns=self.COLUMNS)
+
+    @staticmethod
+    def init_worker(seasons: dict[int, dict]) -> None:
+        """
+        Keeps the seasons' arrays in a worker process (see run).
+        :param seasons: Arrays of every season (see load_season).
+        :return: None
+        """
+        StakingSweep.worker_seasons = seasons
+
+    @staticmethod
+    def evaluate_in_worker(year: int, cell: dict) -> list:
+        """
+        Evaluates staking parameters on a season in a worker process (see run).
+        :param year: Season year.
+        :param cell: Staking parameters.
+        :return: Row of the results table.
+        """
+        return StakingSweep.evaluate(year, StakingSweep.worker_seasons[year], cell)
+
+    @staticmethod
+    def evaluate(year: int, season: dict, cell: dict) -> list:
+        """
+        Simulates a season's bets with staking parameters.
+        :param year: Season year.
+        :param season: Arrays of the season (see load_season).
+        :param cell: Staking parameters (see staking_grid).
+        :return: Row of the results table, values in COLUMNS order.
+        """
+        unit_pct = cell['unit_pct']
+        initial_bankroll = cell['initial_bankroll']
+        if cell['kelly_fraction'] is not None:
+            unit_pct = cell['kelly_fraction'] * BankrollSimulator.kelly_unit_pct(season['win_probability'])
+            if unit_pct <= 0:
+                # No edge: Kelly bets nothing, rather than the minimum bet on every game.
+                return [year, initial_bankroll, 0.0, cell['min_unit'], cell['kelly_fraction'], initial_bankroll, 0.0,
+                        0.0, initial_bankroll, initial_bankroll, 0.0, 0, 0]
+
+        result = BankrollSimulator(initial_bankroll, unit_pct, cell['min_unit'])\
+            .simulate_days(season['day_starts'], season['correct'], season['incorrect'])
+        profit = result.bankroll - initial_bankroll
+        return [year, initial_bankroll, unit_pct, cell['min_unit'], cell['kelly_fraction'], result.bankroll, profit,
+                profit / initial_bankroll, result.minimum_bankroll, result.maximum_bankroll, result.max_drawdown,
+                result.max_loss_streak, len(season['correct'])]
@@ -0,0 +1,53 @@
+import os
+from urllib.parse import urlsplit
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from scripts.Scraper import Scraper
+from service.database_service import DatabaseService
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class FixtureScraper(Scraper):
+    """
+    Scraper that serves the saved pages in test/data instead of fetching them. Pages that are not saved are missing.
+    """
+
+    def __init__(self, fail_on: str = None, missing: str = None):
+        """
+        :param fail_on: Optional url fragment; fetching a matching url raises a RuntimeError (simulates a crash).
+        :param missing: Optional url fragment; matching pages are missing (simulates a page that fails to scrape).
+        """
+        super().__init__()
+        self.fail_on = fail_on
+        self.missing = missing
+        self.requested_urls = []
+
+    def fetch_texts(self, urls: list[str]) -> dict[str, str | None]:
+        pages = {}
+        for url in urls:
+            if self.fail_on is not None and self.fail_on in url:
+                raise RuntimeError(f"Simulated failure fetching {url}")
+
+            self.requested_urls.append(url)
+            path = os.path.join(DATA_DIR, urlsplit(url).path.lstrip('/'))
+            if os.path.exists(path) and not (self.missing is not None and self.missing in url):
+                with open(path) as f:
+                    pages[url] = f.read()
+            else:
+                pages[url] = None
+        return pages
+
+
+def create_database_service(scraper: Scraper = None) -> DatabaseService:
+    """
+    Creates a DatabaseService backed by an empty in-memory SQLite database.
+    :param scraper: Scraper for the service. Default is a FixtureScraper.
+    :return: DatabaseService
+    """
+    engine = create_engine('sqlite://')
+    db_service = DatabaseService(Session(engine), scraper or FixtureScraper(), engine)
+    db_service.initialize_database()
+    return db_service
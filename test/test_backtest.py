@@ -0,0 +1,68 @@
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.linear_model import Ridge, SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from service.backtest import WalkForwardBacktest
+from service.nba_pipeline import NbaPredictor
+
+
+def generate_season_data(year: int) -> tuple[np.ndarray, list[float], list[str]]:
+    # Four games a day for 20 days, starting on a Tuesday in October.
+    rng = np.random.default_rng(year)
+    features = rng.normal(size=(80, 3))
+    outcomes = features @ np.array([5.0, -2.0, 1.0]) + rng.normal(size=80)
+    start = date(year - 1, 10, 18)
+    game_codes = [f"{(start + timedelta(days=i // 4)).strftime('%Y%m%d')}0T{i % 4:02d}" for i in range(80)]
+    return features, outcomes.tolist(), game_codes
+
+
+class TestWalkForwardBacktest(unittest.TestCase):
+    @patch("service.nba_pipeline.DatabaseService")
+    def setUp(self, mock_db_service) -> None:
+        self.predictor = NbaPredictor(mock_db_service, [2022, 2023])
+        self.predictor.pipeline = Pipeline([("scale", StandardScaler()), ("model", Ridge())])
+        self.generated_years = []
+
+        def generate(year):
+            self.generated_years.append(year)
+            return generate_season_data(year)
+
+        self.predictor.generate_season_data = generate
+
+    def test_daily_refit_uses_only_earlier_games(self):
+        results = WalkForwardBacktest(self.predictor).run(2023)
+
+        self.assertEqual([2022, 2023], self.generated_years)
+        self.assertEqual(80, len(results))
+        self.assertEqual(20, results['Step'].nunique())
+
+        history_inputs, history_outcomes, _ = generate_season_data(2022)
+        inputs, outcomes, game_codes = generate_season_data(2023)
+        # The third day is predicted by a model trained on last season and the first two days.
+        model = clone(self.predictor.pipeline).fit(np.r_[history_inputs, inputs[:8]], history_outcomes + outcomes[:8])
+        np.testing.assert_allclose(model.predict(inputs[8:12]), results['Prediction'][8:12])
+        self.assertEqual(game_codes, results['Game Code'].tolist())
+        self.assertEqual(outcomes, results['Actual Point Difference'].tolist())
+
+    def test_weekly_partial_fit(self):
+        backtest = WalkForwardBacktest(self.predictor, SGDRegressor(random_state=0), step='week')
+        results = backtest.run(2023, history_years=[])
+
+        # The first week has no training data; the remaining days of the 20 fall in two more weeks.
+        self.assertEqual(['2022-W43', '2022-W44'], sorted(results['Step'].unique()))
+        self.assertEqual(80 - 6 * 4, len(results))
+        self.assertLess(np.mean(np.abs(results['Prediction'] - results['Actual Point Difference'])), 5.0)
+
+    def test_unsupported_step(self):
+        with self.assertRaises(ValueError):
+            WalkForwardBacktest(self.predictor, step='month')
+
+
+if __name__ == "__main__":
+    unittest.main()
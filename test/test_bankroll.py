@@ -0,0 +1,149 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from service.bankroll import BankrollSimulator, RiskResult
+from service.nba_pipeline import NbaPredictor
+
+
+def create_predictions(count: int = 400, seed: int = 11) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    days = np.sort(rng.integers(0, count // 4, size=count))
+    game_codes = [f'2022{10 + day // 28:02d}{1 + day % 28:02d}0T{i:02d}' for i, day in enumerate(days % 100)]
+    outcomes = rng.choice(['Correct', 'Incorrect', 'Push'], size=count, p=[0.52, 0.45, 0.03])
+    return pd.DataFrame({'Game Code': game_codes, 'Prediction Outcome': outcomes})
+
+
+def replay(predictions: pd.DataFrame, initial_bankroll: float, unit_pct: float, min_unit: float) -> tuple:
+    """
+    Places the bets one at a time (the previous check_profit loop).
+    """
+    bankroll = initial_bankroll
+    daily_starting_bankroll = []
+    minimum_bankroll = initial_bankroll
+    maximum_bankroll = 0
+    current_day = predictions.iloc[0]["Game Code"][:8]
+    today_bankroll = initial_bankroll
+    plus_minus = []
+    max_loss_streak = 0
+    curr_loss_streak = 0
+    prev_result = "Push"
+
+    for index, row in predictions.iterrows():
+        game_day = row["Game Code"][:8]
+        if game_day != current_day:
+            plus_minus.append(bankroll - today_bankroll)
+            current_day = game_day
+            today_bankroll = bankroll
+        else:
+            plus_minus.append(None)
+
+        bet_amount = max(today_bankroll * unit_pct, min_unit)
+        if row["Prediction Outcome"] == "Correct":
+            bankroll += ((bet_amount * 1.90) - bet_amount)
+            curr_loss_streak = 0
+            prev_result = "Correct"
+        elif row["Prediction Outcome"] == "Incorrect":
+            bankroll -= bet_amount
+            if prev_result == "Incorrect" or prev_result == "Push":
+                curr_loss_streak += 1
+                max_loss_streak = max(max_loss_streak, curr_loss_streak)
+            prev_result = "Incorrect"
+        else:
+            prev_result = "Push"
+
+        daily_starting_bankroll.append(today_bankroll)
+        maximum_bankroll = max(today_bankroll, maximum_bankroll)
+        minimum_bankroll = min(today_bankroll, minimum_bankroll)
+
+    return bankroll, minimum_bankroll, maximum_bankroll, max_loss_streak, daily_starting_bankroll, plus_minus
+
+
+class TestBankrollSimulator(unittest.TestCase):
+
+    def test_matches_replay(self):
+        predictions = create_predictions()
+        for settings in [(1000.0, 0.05, 5.0), (100.0, 0.02, 5.0), (1000.0, 0.25, 1.0)]:
+            bankroll, minimum, maximum, streak, daily, plus_minus = replay(predictions, *settings)
+            result = BankrollSimulator(*settings).simulate(predictions['Game Code'].tolist(),
+                                                           predictions['Prediction Outcome'].tolist())
+
+            self.assertEqual(bankroll, result.bankroll)
+            self.assertEqual(minimum, result.minimum_bankroll)
+            self.assertEqual(maximum, result.maximum_bankroll)
+            self.assertEqual(streak, result.max_loss_streak)
+            self.assertEqual(daily, result.daily_starting_bankroll.tolist())
+            pd.testing.assert_series_equal(pd.Series(plus_minus, dtype=float), pd.Series(result.plus_minus))
+
+    def test_loss_streaks(self):
+        outcomes = np.array(['Incorrect', 'Push', 'Incorrect', 'Correct', 'Incorrect', 'Incorrect', 'Incorrect'])
+        streaks = BankrollSimulator.loss_streaks((outcomes == 'Correct')[None], (outcomes == 'Incorrect')[None])
+
+        # A loss right after a win does not extend the streak; a push does not reset it.
+        self.assertEqual([1, 1, 2, 0, 0, 1, 2], streaks[0].tolist())
+
+    def test_paths_match_single_path(self):
+        simulator = BankrollSimulator(1000.0, 0.05, 5.0)
+        paths = [create_predictions(seed=seed)['Prediction Outcome'].to_numpy() for seed in range(3)]
+        game_codes = create_predictions()['Game Code'].tolist()
+        day_starts = simulator.day_starts(game_codes)
+
+        bankrolls = simulator.day_start_bankrolls(day_starts, np.array(paths) == 'Correct',
+                                                  np.array(paths) == 'Incorrect')
+
+        for path, path_bankrolls in zip(paths, bankrolls):
+            expected = simulator.day_start_bankrolls(day_starts, (path == 'Correct')[None],
+                                                     (path == 'Incorrect')[None])[0]
+            self.assertEqual(expected.tolist(), path_bankrolls.tolist())
+
+    def test_risk_without_variance(self):
+        predictions = create_predictions()
+        simulator = BankrollSimulator(1000.0, 0.05, 5.0)
+        game_codes = predictions['Game Code'].tolist()
+
+        winning = simulator.simulate_risk(game_codes, ['Correct'] * len(game_codes), paths=20, seed=1)
+        expected = simulator.simulate(game_codes, ['Correct'] * len(game_codes)).bankroll
+        self.assertEqual([expected] * 20, winning.final_bankrolls.tolist())
+        self.assertEqual(0.0, winning.risk_of_ruin)
+        self.assertEqual(0.0, winning.max_drawdowns.max())
+
+        losing = simulator.simulate_risk(game_codes, ['Incorrect'] * len(game_codes), paths=20, ruin_bankroll=0, seed=1)
+        self.assertEqual(1.0, losing.risk_of_ruin)
+        self.assertEqual(len(game_codes), losing.max_loss_streaks[0])
+
+    def test_risk_chunks(self):
+        predictions = create_predictions()
+        simulator = BankrollSimulator(1000.0, 0.05, 5.0)
+        args = predictions['Game Code'].tolist(), predictions['Prediction Outcome'].tolist()
+
+        result = simulator.simulate_risk(*args, paths=250, chunk_size=100, seed=3)
+        repeated = simulator.simulate_risk(*args, paths=250, chunk_size=100, seed=3)
+
+        self.assertEqual(250, len(result.final_bankrolls))
+        self.assertEqual(result.final_bankrolls.tolist(), repeated.final_bankrolls.tolist())
+        self.assertTrue(((result.max_drawdowns >= 0) & (result.max_drawdowns < 1)).all())
+        percentiles = result.percentiles()
+        self.assertEqual(list(RiskResult.PERCENTILES), percentiles.index.tolist())
+        self.assertTrue(percentiles['Final Bankroll'].is_monotonic_increasing)
+
+    @patch("service.nba_pipeline.DatabaseService")
+    def test_check_profit_writes_columns(self, mock_db_service):
+        predictions = create_predictions()
+        _, _, _, _, daily, plus_minus = replay(predictions, 1000.0, 0.05, 5.0)
+
+        with tempfile.TemporaryDirectory() as directory:
+            data_path = os.path.join(directory, '2022_prediction.csv')
+            predictions.to_csv(data_path)
+            NbaPredictor(mock_db_service, [2022]).check_profit(data_path, 1000.0, 0.05, 5.0)
+            written = pd.read_csv(data_path, header=0, index_col=0, float_precision='round_trip')
+
+        self.assertEqual(daily, written['Bankroll Progression'].tolist())
+        pd.testing.assert_series_equal(pd.Series(plus_minus, dtype=float, name='Plus_Minus'), written['Plus_Minus'])
+
+
+if __name__ == "__main__":
+    unittest.main()
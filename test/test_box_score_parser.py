@@ -0,0 +1,90 @@
+import math
+import os
+import unittest
+
+from bs4 import BeautifulSoup
+from lxml import html
+
+from scripts.Scraper import Scraper
+from scripts.box_score_parser import BoxScoreParser
+
+BOX_SCORE_DIR = os.path.join(os.path.dirname(__file__), 'data', 'boxscores')
+
+
+def normalize(value):
+    """
+    Normalizes a cell so string cells from the legacy parser compare equal to typed cells.
+    """
+    if value is None or value == '' or (isinstance(value, float) and math.isnan(value)):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+class TestBoxScoreParser(unittest.TestCase):
+
+    def setUp(self):
+        self.pages = {}
+        for file_name in sorted(os.listdir(BOX_SCORE_DIR)):
+            with open(os.path.join(BOX_SCORE_DIR, file_name)) as f:
+                self.pages[file_name[:-5]] = f.read()
+
+    def test_parse_matches_legacy_parser(self):
+        scraper = Scraper()
+        for game_code, page in self.pages.items():
+            actual = BoxScoreParser.parse(page)
+            expected = scraper.parse_nba_game_legacy(BeautifulSoup(page, 'lxml'))
+
+            for actual_df, expected_df in zip(actual, expected):
+                self.assertEqual(list(expected_df.columns), list(actual_df.columns), game_code)
+                self.assertEqual(expected_df.shape, actual_df.shape, game_code)
+                for column in expected_df.columns:
+                    self.assertEqual([normalize(v) for v in expected_df[column]],
+                                     [normalize(v) for v in actual_df[column]], f'{game_code} {column}')
+
+    def test_parse_typed_rows(self):
+        game_summary, home_box, away_box = BoxScoreParser.parse(self.pages['202210180BOS'])
+
+        self.assertEqual(['PHI', 'BOS'], list(game_summary['Team']))
+        self.assertIsInstance(game_summary['T'][1], int)
+        self.assertIsInstance(game_summary['Pace'][1], float)
+
+        starter = home_box.iloc[0]
+        self.assertIsInstance(starter['MP'], str)
+        self.assertIsInstance(starter['FGA'], int)
+        self.assertIsInstance(starter['TS%'], float)
+        self.assertIsInstance(starter['+/-'], int)
+
+        totals = home_box.iloc[-1]
+        self.assertEqual('Team Totals', totals['Players'])
+        self.assertEqual('240', totals['MP'])
+        self.assertIsNone(totals['+/-'])
+        self.assertEqual(game_summary['T'][1], totals['PTS'])
+
+    def test_parse_did_not_play(self):
+        _, home_box, _ = BoxScoreParser.parse(self.pages['202210180BOS'])
+
+        dnp = home_box[home_box['MP'].str.startswith('Did Not')]
+        self.assertEqual(2, len(dnp))
+        self.assertTrue(dnp['FG'].isna().all())
+        self.assertTrue(dnp['BPM'].isna().all())
+
+    def test_parse_overtime(self):
+        game_summary, home_box, away_box = BoxScoreParser.parse(self.pages['202210190IND'])
+
+        self.assertEqual(['Team', '1', '2', '3', '4', 'OT', 'T'], list(game_summary.columns[:7]))
+        self.assertEqual(['WAS', 'IND'], list(game_summary['Team']))
+        self.assertEqual('265', home_box['MP'].iloc[-1])
+        self.assertEqual('265', away_box['MP'].iloc[-1])
+
+    def test_find_tables(self):
+        tables = BoxScoreParser.find_tables(html.fromstring(self.pages['202210180BOS']))
+
+        self.assertEqual({'line_score', 'four_factors', 'box-PHI-game-basic', 'box-PHI-game-advanced',
+                          'box-BOS-game-basic', 'box-BOS-game-advanced'}, set(tables))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+import warnings
+
+from sqlalchemy import exc
+from sqlalchemy.orm import Session
+
+from fixture_scraper import FixtureScraper
+from service.database_engine import create_database_engine
+from service.database_service import DatabaseService
+from service.nba_pipeline import NbaPredictor
+
+
+class TestDatabaseEngine(unittest.TestCase):
+    def setUp(self):
+        warnings.simplefilter('ignore', exc.SAWarning)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.tmp_dir.name, 'nba.db')}"
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_sqlite_file_pragmas(self):
+        engine = create_database_engine(self.url)
+        with engine.connect() as connection:
+            self.assertEqual('wal', connection.exec_driver_sql('PRAGMA journal_mode').scalar())
+            self.assertEqual(1, connection.exec_driver_sql('PRAGMA synchronous').scalar())
+        engine.dispose()
+
+    def test_unsupported_backend(self):
+        with self.assertRaises(ValueError):
+            create_database_engine('mysql://localhost/nba')
+
+    def test_ingest_and_generate_data_on_sqlite_file(self):
+        engine = create_database_engine(self.url)
+        db_service = DatabaseService(Session(engine), FixtureScraper(), engine)
+        db_service.initialize_database()
+        db_service.populate_tables(2023)
+        db_service.session.close()
+
+        # A new session on the same file sees the committed season.
+        db_service = DatabaseService(Session(engine), FixtureScraper(), engine)
+        features, outcomes, game_codes = NbaPredictor(db_service, [2023]).generate_data([2023])
+
+        self.assertEqual(['202210180BOS', '202210180GSW', '202210190IND'], game_codes)
+        self.assertEqual(3, len(features))
+        self.assertEqual(3, len(outcomes))
+        db_service.session.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    unittest.main()
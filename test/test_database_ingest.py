@@ -0,0 +1,217 @@
+import unittest
+import warnings
+from datetime import datetime
+
+import pandas as pd
+from sqlalchemy import exc, event
+
+from fixture_scraper import FixtureScraper, create_database_service
+from models.database import GameTeamLog, GamePlayerLog, GameType, PlayerStats, Game, Team, Player
+
+GAME_CODES = ['202210180BOS', '202210180GSW', '202210190IND']
+
+
+class TestDatabaseIngest(unittest.TestCase):
+
+    def setUp(self):
+        # SQLite has no native DECIMAL and can't sort the team tables' FK cycle; both are harmless here.
+        warnings.simplefilter('ignore', exc.SAWarning)
+        self.db_service = create_database_service()
+        self.session = self.db_service.session
+
+    def box_score_requests(self) -> list[str]:
+        return [url.split('/')[-1][:-5] for url in self.db_service.scraper.requested_urls if '/boxscores/' in url]
+
+    def test_populate_tables(self):
+        self.db_service.populate_tables(2023)
+
+        season = self.db_service.get_season_by_year(2023)
+        cursor = self.db_service.get_ingest_cursor(season.id)
+        self.assertTrue(cursor.completed)
+        self.assertEqual(3, cursor.games_ingested)
+        self.assertEqual('202210190IND', cursor.last_game_code)
+
+        self.assertEqual(6, self.session.query(GameTeamLog).count())
+        self.assertEqual(3 * 2 * 13, self.session.query(GamePlayerLog).count())
+        self.assertEqual(set(GAME_CODES), self.db_service.get_ingested_game_codes(season.id))
+        # Only one player page is saved.
+        self.assertEqual(1, self.session.query(PlayerStats.player_id).distinct().count())
+
+    def test_populate_tables_resumes_after_failure(self):
+        self.db_service.scraper = FixtureScraper(fail_on='202210190IND')
+        self.db_service.scraper.batch_size = 1
+
+        with self.assertRaises(RuntimeError):
+            self.db_service.populate_tables(2023, chunk_size=1)
+        self.session.rollback()
+
+        season = self.db_service.get_season_by_year(2023)
+        cursor = self.db_service.get_ingest_cursor(season.id)
+        self.assertFalse(cursor.completed)
+        self.assertEqual(2, cursor.games_ingested)
+        self.assertEqual('202210180GSW', cursor.last_game_code)
+        self.assertEqual(set(GAME_CODES[:2]), self.db_service.get_ingested_game_codes(season.id))
+
+        self.db_service.scraper = FixtureScraper()
+        self.db_service.populate_tables(2023, chunk_size=1)
+
+        # Only the game that was lost is scraped again, and nothing is duplicated.
+        self.assertEqual(['202210190IND'], self.box_score_requests())
+        self.assertEqual(6, self.session.query(GameTeamLog).count())
+        self.assertEqual(3 * 2 * 13, self.session.query(GamePlayerLog).count())
+        self.assertTrue(self.db_service.get_ingest_cursor(season.id).completed)
+
+    def test_populate_tables_completed_season(self):
+        self.db_service.populate_tables(2023)
+        self.db_service.scraper = FixtureScraper()
+
+        self.db_service.populate_tables(2023)
+
+        self.assertEqual([], self.db_service.scraper.requested_urls)
+        self.assertEqual(4, self.session.query(GameType).count())
+
+    def test_update_season_scrapes_only_new_games(self):
+        self.db_service.scraper = FixtureScraper(fail_on='202210190IND')
+        self.db_service.scraper.batch_size = 1
+        with self.assertRaises(RuntimeError):
+            self.db_service.populate_tables(2023, chunk_size=1)
+        self.session.rollback()
+
+        self.db_service.scraper = FixtureScraper()
+        self.db_service.update_season(2023, today=datetime(2022, 10, 20))
+
+        schedule_requests = [url for url in self.db_service.scraper.requested_urls if '/leagues/' in url]
+        self.assertEqual(1, len(schedule_requests))
+        self.assertTrue(schedule_requests[0].endswith('NBA_2023_games-october.html'))
+        self.assertEqual(['202210190IND'], self.box_score_requests())
+        self.assertEqual(6, self.session.query(GameTeamLog).count())
+        self.assertEqual(3 * 2 * 13, self.session.query(GamePlayerLog).count())
+
+    def test_update_season_skips_games_not_played_yet(self):
+        self.db_service.update_season(2023, today=datetime(2022, 10, 19))
+
+        season = self.db_service.get_season_by_year(2023)
+        self.assertEqual(set(GAME_CODES[:2]), self.db_service.get_ingested_game_codes(season.id))
+
+        self.db_service.scraper = FixtureScraper()
+        self.db_service.update_season(2023, today=datetime(2022, 10, 19))
+        self.assertEqual([], self.box_score_requests())
+
+    def test_update_season_retries_missing_games_of_earlier_months(self):
+        self.db_service.scraper = FixtureScraper(missing='202210180GSW')
+        self.db_service.update_season(2023, today=datetime(2022, 10, 20))
+        season = self.db_service.get_season_by_year(2023)
+        self.assertEqual({'202210180BOS', '202210190IND'}, self.db_service.get_ingested_game_codes(season.id))
+
+        # The latest ingested game is in November; October still has a game without logs.
+        game = self.db_service.get_game_by_game_code('202210190IND')
+        game.start_datetime = datetime(2022, 11, 2, 19)
+        self.session.commit()
+
+        self.db_service.scraper = FixtureScraper()
+        self.db_service.update_season(2023, today=datetime(2022, 11, 5))
+
+        schedule_requests = [url for url in self.db_service.scraper.requested_urls if '/leagues/' in url]
+        self.assertEqual(['october', 'november'], [url.split('-')[-1][:-5] for url in schedule_requests])
+        self.assertEqual(['202210180GSW'], self.box_score_requests())
+        self.assertEqual(set(GAME_CODES), self.db_service.get_ingested_game_codes(season.id))
+        self.assertFalse(self.db_service.get_ingest_cursor(season.id).completed)
+
+    def test_update_season_completes_season(self):
+        self.db_service.scraper = FixtureScraper(missing='202210180GSW')
+        self.db_service.update_season(2023, today=datetime(2023, 8, 1))
+        season = self.db_service.get_season_by_year(2023)
+        # A game is still missing.
+        self.assertFalse(self.db_service.get_ingest_cursor(season.id).completed)
+
+        self.db_service.scraper = FixtureScraper()
+        self.db_service.update_season(2023, today=datetime(2023, 8, 2))
+        self.assertTrue(self.db_service.get_ingest_cursor(season.id).completed)
+        self.assertEqual(['202210180GSW'], self.box_score_requests())
+
+        self.db_service.scraper = FixtureScraper()
+        self.db_service.update_season(2023, today=datetime(2023, 8, 3))
+        self.assertEqual([], self.db_service.scraper.requested_urls)
+
+    def test_players_are_resolved_from_cache(self):
+        statements = []
+        event.listen(self.db_service.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        self.db_service.populate_tables(2023)
+
+        # One query preloads the cache and one finds the players without stats; no per-row lookups.
+        player_queries = [s for s in statements if s.startswith('SELECT') and '\nFROM player' in s]
+        self.assertEqual(2, len(player_queries))
+        self.assertEqual(3 * 2 * 13, self.session.query(Player).count())
+        self.assertEqual(self.db_service.player_cache,
+                         dict(self.session.query(Player.unique_code, Player.id).all()))
+
+    def test_bulk_game_logs_match_orm_game_logs(self):
+        scraper = FixtureScraper()
+        game_summary, home_box, away_box = scraper.scrape_nba_game('202210190IND')
+        team = Team(name='Indiana Pacers')
+        self.session.add_all([team, Game(game_code='orm'), Game(game_code='bulk')])
+        self.session.flush()
+        orm_game, bulk_game = self.session.query(Game).order_by(Game.id).all()
+
+        self.db_service.add_game_team_log(orm_game, team, game_summary.iloc[1], home_box.iloc[-1])
+        self.db_service.add_game_player_logs(orm_game, team, home_box)
+        self.db_service.queue_game_logs(bulk_game, team, game_summary.iloc[1], home_box)
+        self.db_service.flush_game_logs()
+        self.session.commit()
+
+        def logs(model, game):
+            columns = [c.name for c in model.__table__.columns if c.name not in ('id', 'game_id')]
+            return [[getattr(log, c) for c in columns]
+                    for log in self.session.query(model).where(model.game_id == game.id).order_by(model.id)]
+
+        self.assertEqual(logs(GameTeamLog, orm_game), logs(GameTeamLog, bulk_game))
+        self.assertEqual(13, len(logs(GamePlayerLog, bulk_game)))
+        self.assertEqual(logs(GamePlayerLog, orm_game), logs(GamePlayerLog, bulk_game))
+
+    def test_add_odds_data(self):
+        self.db_service.populate_tables(2023)
+        games = [(self.session.get(Game, game_id).game_code, str(start_datetime.date()), home, away)
+                 for game_id, start_datetime, home, away in self.db_service.get_games_with_team_names({'2023'})]
+        self.assertEqual(3, len(games))
+
+        odds = [[date, away, home, -1.5 - i] for i, (_, date, home, away) in enumerate(games)]
+        odds.append(['2022-10-21', games[0][3], games[0][2], 3.0])
+        unmatched = self.db_service.add_odds_data(
+            pd.DataFrame(odds, columns=['Date', 'Visitor_Team', 'Home_Team', 'Closing Odds']))
+
+        self.assertEqual(['2022-10-21'], unmatched['Date'].tolist())
+        for i, (game_code, _, _, _) in enumerate(games):
+            self.assertEqual(-1.5 - i, float(self.db_service.get_spread_by_game_code(game_code)))
+        spreads = self.db_service.get_spreads_by_game_codes([game_code for game_code, _, _, _ in games] + ['unknown'])
+        self.assertEqual({game_code: -1.5 - i for i, (game_code, _, _, _) in enumerate(games)}, spreads)
+
+    def test_get_months_to_update(self):
+        months = self.db_service.get_months_to_update
+        self.assertEqual(['december', 'january'], months(2023, datetime(2022, 12, 30), datetime(2023, 1, 2)))
+        self.assertEqual(['october'], months(2023, None, datetime(2022, 10, 20)))
+        # Finished seasons are scraped up to the end of the playoffs.
+        self.assertEqual(self.db_service.scraper.SEASON_MONTHS[-4:],
+                         months(2023, datetime(2023, 4, 9), datetime(2023, 9, 1)))
+
+    def test_get_months_to_update_off_season(self):
+        months = self.db_service.get_months_to_update
+        season_months = self.db_service.scraper.SEASON_MONTHS
+        # The season has not started yet.
+        self.assertEqual([], months(2023, None, datetime(2022, 9, 15)))
+        self.assertEqual([], months(2024, None, datetime(2022, 8, 15)))
+        # The season is over.
+        self.assertEqual(season_months, months(2023, None, datetime(2023, 8, 15)))
+        # Games stored in off-season months (e.g. a preseason game, or a delayed season's last games).
+        self.assertEqual(season_months, months(2023, datetime(2022, 9, 30), datetime(2023, 9, 1)))
+        self.assertEqual(season_months[-1:], months(2020, datetime(2020, 8, 14), datetime(2020, 9, 1)))
+
+        self.db_service.scraper = FixtureScraper()
+        self.db_service.update_season(2023, today=datetime(2022, 9, 15))
+        self.assertEqual([], self.db_service.scraper.requested_urls)
+        self.assertIsNone(self.db_service.get_season_by_year(2023))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from models.exponential_averages import ExponentialAverages
+
+
+class TestExponentialAverages(unittest.TestCase):
+
+    def setUp(self):
+        self.ewma = ExponentialAverages(['a', 'b'], (2, 10), capacity=1)
+        self.values = np.random.default_rng(5).normal(size=(40, 2))
+
+    def test_feature_names(self):
+        self.assertEqual(['a_ewm2', 'b_ewm2', 'a_ewm10', 'b_ewm10'], self.ewma.feature_names)
+
+    def test_push_matches_pandas_ewm(self):
+        for game_values in self.values:
+            self.ewma.push(np.array([0]), game_values[None, :])
+
+        frame = pd.DataFrame(self.values)
+        expected = np.r_[frame.ewm(halflife=2).mean().iloc[-1], frame.ewm(halflife=10).mean().iloc[-1]]
+        np.testing.assert_allclose(expected, self.ewma.means(np.array([0]))[0], atol=1e-12)
+
+    def test_pre_game_means_match_incremental(self):
+        expected = []
+        for game_values in self.values:
+            expected.append(self.ewma.means(np.array([0]))[0])
+            self.ewma.push(np.array([0]), game_values[None, :])
+
+        np.testing.assert_allclose(expected, self.ewma.pre_game_means(self.values), atol=1e-9)
+
+    def test_state_round_trip(self):
+        self.ewma.grow(2)
+        for game_values in self.values[:7]:
+            self.ewma.push(np.array([0]), game_values[None, :])
+
+        self.ewma.from_state(1, self.ewma.to_state(0))
+
+        np.testing.assert_array_equal(self.ewma.means(np.array([0])), self.ewma.means(np.array([1])))
+
+
+if __name__ == "__main__":
+    unittest.main()
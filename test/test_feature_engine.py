@@ -0,0 +1,136 @@
+import random
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from models.nba_player import NbaPlayer
+from models.nba_team import NbaTeam
+from service.feature_engine import TeamFeatureEngine
+from service.nba_pipeline import NbaPredictor
+
+
+def create_season(team_count: int = 6, game_count: int = 90, seed: int = 7) -> tuple[list, dict]:
+    """
+    Creates a synthetic season shaped like DatabaseService.get_games_by_season_id / get_team_logs_by_season_id.
+    :return: games, dictionary of game id to the game's two team log rows
+    """
+    rng = random.Random(seed)
+    games = []
+    team_logs = {}
+    for game_id in range(1, game_count + 1):
+        home_id, away_id = rng.sample(range(1, team_count + 1), 2)
+        games.append(SimpleNamespace(id=game_id, game_code=f'game{game_id}', home_team_id=home_id,
+                                     away_team_id=away_id))
+
+        logs = []
+        for team_id in (home_id, away_id):
+            log = SimpleNamespace(
+                game_id=game_id, team_id=team_id, total_points=rng.randint(85, 135),
+                offensive_rating=round(rng.uniform(95, 125), 1), turnover_pct=round(rng.uniform(8, 18), 1),
+                offensive_rebounds=rng.randint(4, 18), true_shooting_pct=round(rng.uniform(0.45, 0.68), 3),
+                defensive_rating=round(rng.uniform(95, 125), 1), defensive_rebounds=rng.randint(25, 45),
+                pace=round(rng.uniform(92, 106), 1))
+            logs.append(SimpleNamespace(GameTeamLog=log, name=f'Team {team_id}'))
+        # Log rows come back in insertion order, which is not always home first.
+        if rng.random() < 0.3:
+            logs.reverse()
+        team_logs[game_id] = logs
+    return games, team_logs
+
+
+def create_player_logs(games: list, players_per_team: int = 8, seed: int = 7) -> dict:
+    """
+    Creates synthetic player logs shaped like DatabaseService.get_player_logs_by_season_id for create_season's games.
+    :return: dictionary of (game id, team id) to the team's player log rows
+    """
+    rng = random.Random(seed)
+    player_logs = {}
+    for game in games:
+        for team_id in (game.home_team_id, game.away_team_id):
+            logs = []
+            for i in range(players_per_team):
+                player_id = team_id * 100 + i
+                played = rng.random() < 0.85
+                bpm = round(rng.uniform(-8, 8), 1) if rng.random() < 0.95 else None
+                logs.append(SimpleNamespace(game_id=game.id, team_id=team_id, player_id=player_id,
+                                            minutes_played='24:00' if played else None,
+                                            box_plus_minus=bpm if played else None,
+                                            unique_code=f'player{player_id}', friendly_name=f'Player {player_id}'))
+            player_logs[(game.id, team_id)] = logs
+    return player_logs
+
+
+class TestTeamFeatureEngine(unittest.TestCase):
+
+    def test_matches_nba_team_replay(self):
+        games, season_team_logs = create_season()
+
+        teams = {}
+        expected = []
+        expected_outcomes = []
+        for game in games:
+            home_log, away_log = season_team_logs[game.id]
+            if home_log.GameTeamLog.team_id != game.home_team_id:
+                home_log, away_log = away_log, home_log
+            home = teams.setdefault(home_log.name, NbaTeam(home_log.name, 2023))
+            away = teams.setdefault(away_log.name, NbaTeam(away_log.name, 2023))
+
+            expected.append(np.r_[NbaPredictor.generate_features_differential(home, away),
+                                  np.subtract(home.rolling_features, away.rolling_features),
+                                  np.subtract(home.ewma_features, away.ewma_features)])
+            expected_outcomes.append(home_log.GameTeamLog.total_points - away_log.GameTeamLog.total_points)
+            home.update_features(home_log, away_log)
+            away.update_features(away_log, home_log)
+
+        features, outcomes, game_codes = TeamFeatureEngine.season_features(games, season_team_logs)
+
+        self.assertEqual((len(games), len(TeamFeatureEngine.FEATURE_NAMES)), features.shape)
+        # Rolling sums are kept by adding and subtracting values, so they can differ in the last digits.
+        np.testing.assert_allclose(np.array(expected), features[:, :-1], rtol=1e-9, atol=1e-9)
+        # No player logs: no BPM differential.
+        self.assertTrue(np.array_equal(np.zeros(len(games)), features[:, -1]))
+        self.assertEqual(expected_outcomes, outcomes)
+        self.assertEqual([game.game_code for game in games], game_codes)
+
+    def test_first_game_has_no_history(self):
+        games, season_team_logs = create_season(team_count=2, game_count=1)
+        features, _, _ = TeamFeatureEngine.season_features(games, season_team_logs)
+        self.assertTrue(np.array_equal(np.zeros((1, len(TeamFeatureEngine.FEATURE_NAMES))), features))
+
+    def test_bpm_differential_matches_nba_player_replay(self):
+        games, season_team_logs = create_season()
+        season_player_logs = create_player_logs(games)
+
+        players = {}
+        expected = []
+        for game in games:
+            averages = []
+            for team_id in (game.home_team_id, game.away_team_id):
+                played = [log for log in season_player_logs[(game.id, team_id)] if log.minutes_played is not None]
+                pre_game_bpm = []
+                for log in played:
+                    player = players.setdefault(log.player_id, NbaPlayer(log.friendly_name, log.unique_code))
+                    pre_game_bpm.append(player.bpm)
+                    player.update_bpm(log)
+                averages.append(np.mean(pre_game_bpm) if pre_game_bpm else 0.0)
+            expected.append(averages[0] - averages[1])
+
+        features, _, _ = TeamFeatureEngine.season_features(games, season_team_logs, season_player_logs)
+
+        np.testing.assert_allclose(expected, features[:, -1], rtol=1e-12, atol=1e-12)
+        self.assertNotEqual(0.0, np.abs(features[:, -1]).sum())
+
+    def test_skips_games_without_logs_and_caps_games(self):
+        games, season_team_logs = create_season(game_count=20)
+        del season_team_logs[3]
+
+        _, outcomes, game_codes = TeamFeatureEngine.season_features(games, season_team_logs, max_games=10)
+
+        self.assertEqual(10, len(outcomes))
+        self.assertNotIn('game3', game_codes)
+        self.assertEqual('game11', game_codes[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import tempfile
+import unittest
+import warnings
+from unittest.mock import patch
+
+import numpy as np
+from sqlalchemy import event, exc, func
+
+from fixture_scraper import create_database_service
+from models.database import GameTeamLog, GamePlayerLog
+from service.feature_engine import TeamFeatureEngine
+from service.feature_store import FeatureStore
+from service.nba_pipeline import NbaPredictor
+
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = FeatureStore(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_save_load(self):
+        features = np.arange(6, dtype=float).reshape(3, 2)
+        self.store.save(2023, 'abc', features, [1, -2, 3], ['a', 'b', 'c'])
+
+        loaded_features, outcomes, game_codes = self.store.load(2023, 'abc')
+
+        self.assertIsInstance(loaded_features, np.memmap)
+        self.assertTrue(np.array_equal(features, loaded_features))
+        self.assertEqual([1.0, -2.0, 3.0], list(outcomes))
+        self.assertEqual(['a', 'b', 'c'], game_codes)
+        self.assertIsNone(self.store.load(2023, 'other'))
+        self.assertIsNone(self.store.load(2022, 'abc'))
+
+    def test_save_replaces_stale_keys(self):
+        self.store.save(2023, 'old', np.zeros((1, 2)), [1], ['a'])
+        self.store.save(2023, 'new', np.ones((1, 2)), [2], ['b'])
+
+        self.assertEqual(['new'], os.listdir(os.path.join(self.tmp_dir.name, '2023')))
+        self.assertIsNone(self.store.load(2023, 'old'))
+
+    def test_save_keeps_concurrent_writer(self):
+        path = os.path.join(self.tmp_dir.name, '2023', 'abc')
+        replace = os.replace
+
+        def racing_replace(src, dst):
+            # Another process renames the same key into place just before this one.
+            if dst == path and not os.path.exists(dst):
+                self.store.save(2024, 'abc', np.ones((1, 2)), [1], ['a'])
+                replace(os.path.join(self.tmp_dir.name, '2024', 'abc'), dst)
+            return replace(src, dst)
+
+        with patch('common.atomic_write.os.replace', side_effect=racing_replace):
+            self.store.save(2023, 'abc', np.ones((1, 2)), [1], ['a'])
+
+        self.assertEqual(['abc'], os.listdir(os.path.join(self.tmp_dir.name, '2023')))
+        self.assertEqual(['a'], self.store.load(2023, 'abc')[2])
+
+    def test_load_missing_files(self):
+        self.store.save(2023, 'abc', np.zeros((1, 2)), [1], ['a'])
+        # A season removed while it is being read (e.g. replaced by another process).
+        os.remove(os.path.join(self.tmp_dir.name, '2023', 'abc', 'features.npy'))
+
+        self.assertIsNone(self.store.load(2023, 'abc'))
+
+    def test_key(self):
+        self.assertEqual(FeatureStore.key(1, 'data'), FeatureStore.key(1, 'data'))
+        self.assertNotEqual(FeatureStore.key(1, 'data'), FeatureStore.key(2, 'data'))
+        self.assertNotEqual(FeatureStore.key(1, 'data'), FeatureStore.key(1, 'more data'))
+
+
+class TestNbaPredictorFeatureStore(unittest.TestCase):
+    def setUp(self):
+        warnings.simplefilter('ignore', exc.SAWarning)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.db_service = create_database_service()
+        self.db_service.populate_tables(2023)
+        self.predictor = NbaPredictor(self.db_service, [2023], FeatureStore(self.tmp_dir.name))
+
+        self.statements = []
+        event.listen(self.db_service.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: self.statements.append(statement))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def team_log_queries(self) -> int:
+        return len([s for s in self.statements if s.startswith('SELECT game_team_log.id')])
+
+    def test_unchanged_season_is_loaded(self):
+        built = self.predictor.generate_data([2023])
+        self.assertEqual(1, self.team_log_queries())
+
+        loaded = self.predictor.generate_data([2023])
+
+        self.assertEqual(1, self.team_log_queries())
+        self.assertTrue(np.array_equal(np.array(built[0]), np.array(loaded[0])))
+        self.assertEqual(built[1], loaded[1])
+        self.assertEqual(built[2], loaded[2])
+
+    def test_feature_version_change_rebuilds(self):
+        self.predictor.generate_data([2023])
+
+        with patch.object(TeamFeatureEngine, 'FEATURE_VERSION', TeamFeatureEngine.FEATURE_VERSION + 1):
+            self.predictor.generate_data([2023])
+
+        self.assertEqual(2, self.team_log_queries())
+
+    def test_corrected_box_score_changes_fingerprint(self):
+        season = self.db_service.get_season_by_year(2023)
+        fingerprint = self.db_service.get_season_fingerprint(season.id)
+
+        # A stat corrected in place: same rows, same ids.
+        log = self.db_service.session.query(GameTeamLog).order_by(GameTeamLog.id).first()
+        log.offensive_rating = float(log.offensive_rating) + 1
+        self.db_service.session.flush()
+        corrected = self.db_service.get_season_fingerprint(season.id)
+        self.assertNotEqual(fingerprint, corrected)
+
+        player_log = self.db_service.session.query(GamePlayerLog).where(GamePlayerLog.points > 0)\
+            .order_by(GamePlayerLog.id).first()
+        player_log.points -= 1
+        self.db_service.session.flush()
+        self.assertNotEqual(corrected, self.db_service.get_season_fingerprint(season.id))
+
+    def test_new_games_rebuild(self):
+        self.predictor.generate_data([2023])
+        season = self.db_service.get_season_by_year(2023)
+        fingerprint = self.db_service.get_season_fingerprint(season.id)
+
+        last_game_id = self.db_service.session.query(func.max(GameTeamLog.game_id)).scalar()
+        self.db_service.session.query(GameTeamLog).where(GameTeamLog.game_id == last_game_id).delete()
+        self.assertNotEqual(fingerprint, self.db_service.get_season_fingerprint(season.id))
+
+        _, outcomes, game_codes = self.predictor.generate_data([2023])
+        self.assertEqual(2, self.team_log_queries())
+        self.assertEqual(2, len(game_codes))
+
+
+if __name__ == "__main__":
+    unittest.main()
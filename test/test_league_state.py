@@ -0,0 +1,108 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from models.league_state import LeagueState
+from models.nba_player import NbaPlayer
+from models.nba_team import NbaTeam
+from test_feature_engine import create_season
+
+
+class TestLeagueState(unittest.TestCase):
+
+    def setUp(self):
+        self.league = LeagueState(team_capacity=2, player_capacity=2)
+
+    def test_views_have_no_instance_dict(self):
+        team = NbaTeam('Team', 2023, self.league)
+        player = NbaPlayer('Player', 'player01', self.league)
+
+        self.assertFalse(hasattr(team, '__dict__'))
+        self.assertFalse(hasattr(player, '__dict__'))
+        self.assertEqual('Team', team.team_name)
+        self.assertEqual('player01', player.player_code)
+
+    def test_standalone_views_have_private_states(self):
+        team = NbaTeam('Team', 2023)
+        other_team = NbaTeam('Other Team', 2023)
+        player = NbaPlayer('Player', 'player01')
+
+        self.assertIsNot(team.league, other_team.league)
+        self.assertIsNot(team.league, player.league)
+        self.assertEqual((1, len(LeagueState.TEAM_FIELDS)), team.league.team_values.shape)
+        self.assertEqual((1, len(LeagueState.PLAYER_FIELDS)), player.league.player_values.shape)
+        self.assertEqual(0, len(team.league.player_values))
+
+    def test_arrays_grow(self):
+        players = [NbaPlayer(f'Player {i}', f'player{i:02d}', self.league) for i in range(20)]
+        for i, player in enumerate(players):
+            player.bpm_total = i
+
+        self.assertEqual(20, self.league.player_count)
+        self.assertEqual(list(range(20)), [player.bpm_total for player in players])
+        self.assertEqual('player19', players[19].player_code)
+
+    def test_last10_ring(self):
+        team = NbaTeam('Team', 2023, self.league)
+        results = 'WLWWLLLWWWLW'
+        for result in results:
+            team.update_last10(result)
+
+        self.assertEqual(10, len(team.last10))
+        self.assertEqual(list(results[-10:]), list(team.last10))
+        self.assertEqual('W', team.last10.popleft())
+        self.assertEqual(list(results[-9:]), list(team.last10))
+
+    def test_apply_games_matches_update_features(self):
+        games, team_logs = create_season(team_count=6, game_count=120)
+        expected = {}
+        for game in games:
+            home_log, away_log = team_logs[game.id]
+            for log, opp_log in ((home_log, away_log), (away_log, home_log)):
+                team = expected.setdefault(log.GameTeamLog.team_id, NbaTeam(log.name, 2023))
+                team.update_features(log, opp_log)
+
+        # Apply every game on its own "slate" as one array update.
+        teams = {team_id: NbaTeam(team.team_name, 2023, self.league) for team_id, team in expected.items()}
+        for game in games:
+            home_log, away_log = (log.GameTeamLog for log in team_logs[game.id])
+            indexes = np.array([teams[home_log.team_id].index, teams[away_log.team_id].index])
+            stats = np.array([self.team_stats(home_log), self.team_stats(away_log)])
+            self.league.apply_games(indexes, stats, stats[::-1])
+
+        for team_id, team in teams.items():
+            np.testing.assert_allclose(expected[team_id].features, team.features, atol=1e-12)
+            np.testing.assert_allclose(expected[team_id].rolling_features, team.rolling_features, atol=1e-12)
+            np.testing.assert_allclose(expected[team_id].ewma_features, team.ewma_features, atol=1e-12)
+            self.assertEqual(list(expected[team_id].last10), list(team.last10))
+            self.assertEqual(expected[team_id].games, team.games)
+
+    def test_apply_games_rejects_duplicate_teams(self):
+        team = NbaTeam('Team', 2023, self.league)
+        stats = np.zeros((2, 8))
+        with self.assertRaises(ValueError):
+            self.league.apply_games(np.array([team.index, team.index]), stats, stats)
+
+    def test_update_player_bpm_matches_update_bpm(self):
+        bpms = [[1.5, None, -2.0], [3.0, 4.0, None], [None, -1.0, 0.5]]
+        expected = [NbaPlayer(f'Player {i}', f'player{i}') for i in range(3)]
+        players = [NbaPlayer(f'Player {i}', f'player{i}', self.league) for i in range(3)]
+
+        for game in bpms:
+            for player, bpm in zip(expected, game):
+                player.update_bpm(SimpleNamespace(box_plus_minus=bpm))
+            self.league.update_player_bpm(np.array([player.index for player in players]),
+                                          np.array([np.nan if bpm is None else bpm for bpm in game]))
+
+        for player, expected_player in zip(players, expected):
+            self.assertEqual(expected_player.to_state(), player.to_state())
+
+    @staticmethod
+    def team_stats(log) -> list[float]:
+        return [log.total_points, log.offensive_rating, log.turnover_pct, log.offensive_rebounds,
+                log.true_shooting_pct, log.defensive_rating, log.defensive_rebounds, log.pace]
+
+
+if __name__ == "__main__":
+    unittest.main()
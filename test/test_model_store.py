@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from service.model_store import ModelStore
+
+
+class TestModelStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = ModelStore(os.path.join(self.tmp_dir.name, 'models'))
+        rng = np.random.default_rng(1)
+        self.inputs = rng.normal(size=(50, 3))
+        self.pipeline = Pipeline([("scale", StandardScaler()), ("model", Ridge())])
+        self.pipeline.fit(self.inputs, self.inputs @ np.array([1.0, -2.0, 0.5]))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key(self):
+        key = ModelStore.key(1, [2021, 2022], 'fingerprint')
+        self.assertEqual(key, ModelStore.key(1, [2021, 2022], 'fingerprint'))
+        self.assertNotEqual(key, ModelStore.key(2, [2021, 2022], 'fingerprint'))
+        self.assertNotEqual(key, ModelStore.key(1, [2022], 'fingerprint'))
+        self.assertNotEqual(key, ModelStore.key(1, [2021, 2022], 'other'))
+
+    def test_pipeline_fingerprint(self):
+        fingerprint = ModelStore.pipeline_fingerprint(self.pipeline)
+
+        # Fitting doesn't change the configuration.
+        self.assertEqual(fingerprint, ModelStore.pipeline_fingerprint(
+            Pipeline([("scale", StandardScaler()), ("model", Ridge())])))
+        self.assertNotEqual(fingerprint, ModelStore.pipeline_fingerprint(
+            Pipeline([("scale", StandardScaler()), ("model", Ridge(alpha=0.5))])))
+        self.assertNotEqual(fingerprint, ModelStore.pipeline_fingerprint(
+            Pipeline([("scale", "passthrough"), ("model", Ridge())])))
+
+    def test_save_and_load(self):
+        self.assertIsNone(self.store.load('missing'))
+
+        self.store.save('abc', self.pipeline, {'training_years': [2021, 2022]})
+        pipeline, metadata = self.store.load('abc')
+
+        np.testing.assert_array_equal(self.pipeline.predict(self.inputs), pipeline.predict(self.inputs))
+        self.assertEqual([2021, 2022], metadata['training_years'])
+        self.assertEqual('abc', metadata['key'])
+        self.assertEqual(['abc'], os.listdir(self.store.directory))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,26 @@
+import os
+import tempfile
 import unittest
+import warnings
 from unittest.mock import patch
 
 import numpy as np
+import pandas as pd
+from sqlalchemy import event, exc
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sqlalchemy.orm import Session
 
 from common.constants import TEAMS_CURRENT
+from fixture_scraper import FixtureScraper, create_database_service
+from service.database_engine import create_database_engine
+from service.database_service import DatabaseService
+from models.database import GamePlayerLog
+from service.feature_engine import TeamFeatureEngine
+from service.feature_store import FeatureStore
+from service.model_store import ModelStore
+from models.player_registry import PlayerRegistry
 from service.nba_pipeline import NbaPredictor
 
 
@@ -22,9 +39,219 @@ class TestNbaPipeline(unittest.TestCase):
         expected = np.array([0.6, 0.7, 0.8])
         self.assertTrue(np.allclose(expected, actual))
 
+    def test_grade_predictions(self):
+        rng = np.random.default_rng(5)
+        odds = rng.integers(-6, 6, size=200).astype(float)
+        odds[::17] = np.nan
+        predictions = rng.integers(-8, 8, size=200).astype(float)
+        actual_outcomes = rng.integers(-8, 8, size=200).astype(float)
+
+        expected = []
+        for prediction, actual, spread in zip(predictions, actual_outcomes, odds):
+            if np.isnan(spread) or prediction == spread:
+                expected.append("DNP")
+            elif actual == spread:
+                expected.append("Push")
+            elif (prediction < spread) == (actual < spread):
+                expected.append("Correct")
+            else:
+                expected.append("Incorrect")
+
+        outcomes = NbaPredictor.grade_predictions(predictions, actual_outcomes, odds)
+        self.assertEqual(expected, outcomes.tolist())
+        self.assertEqual({"Correct", "Incorrect", "Push", "DNP"}, set(expected))
+
+    def test_run_prediction_for_season(self):
+        game_codes = ['202210180BOS', '202210180GSW', '202210190IND', '202210190DET']
+        self.test_nba_predictor.db.get_spreads_by_game_codes.return_value = \
+            {'202210180BOS': -3.0, '202210180GSW': 2.0, '202210190IND': None, '202210190DET': 1.0}
+        self.test_nba_predictor.pipeline = Ridge()
+
+        with tempfile.TemporaryDirectory() as directory, \
+                patch.object(NbaPredictor, 'generate_data', return_value=(np.zeros((4, 1)), [-5.0, 2.0, 1.0, -4.0],
+                                                                          game_codes)), \
+                patch.object(Ridge, 'predict', return_value=np.array([-4.0, 1.0, 0.0, 3.0])):
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                self.test_nba_predictor.run_prediction_for_season(2023)
+                written = pd.read_csv('data/2023_prediction.csv', header=0, index_col=0)
+            finally:
+                os.chdir(cwd)
+
+        self.test_nba_predictor.db.get_spreads_by_game_codes.assert_called_once_with(game_codes)
+        self.assertEqual(['202210180BOS', '202210180GSW', '202210190DET'], written['Game Code'].tolist())
+        self.assertEqual(['Correct', 'Push', 'Incorrect'], written['Prediction Outcome'].tolist())
+        self.assertEqual([-3.0, 2.0, 1.0], written['Closing Odds'].tolist())
+
     def test_create_teams(self):
         test_teams = self.test_nba_predictor.create_teams(2023)
 
         for name in TEAMS_CURRENT:
             self.assertEqual(name, test_teams[name].team_name)
             self.assertEqual(2023, test_teams[name].season)
+
+
+class TestNbaPipelineSeasonPreload(unittest.TestCase):
+    def setUp(self) -> None:
+        warnings.simplefilter('ignore', exc.SAWarning)
+        self.db_service = create_database_service()
+        self.db_service.populate_tables(2023)
+        self.predictor = NbaPredictor(self.db_service, [2023])
+
+    def test_generate_data_preloads_season(self):
+        statements = []
+        event.listen(self.db_service.engine, 'before_cursor_execute',
+                     lambda conn, cursor, statement, *args: statements.append(statement))
+
+        features, outcomes, game_codes = self.predictor.generate_data([2023])
+
+        # Season, games, team logs and player logs; nothing per game.
+        self.assertEqual(4, len(statements))
+        self.assertEqual(len(game_codes), len(features))
+        self.assertEqual(['202210180BOS', '202210180GSW', '202210190IND'], game_codes)
+        for game_code, outcome in zip(game_codes, outcomes):
+            game = self.db_service.get_game_by_game_code(game_code)
+            logs = {row.GameTeamLog.team_id: row.GameTeamLog.total_points
+                    for row in self.db_service.get_team_logs_by_game_id(game.id)}
+            self.assertEqual(logs[game.home_team_id] - logs[game.away_team_id], outcome)
+
+    def test_calculate_avg_bpm(self):
+        season = self.db_service.get_season_by_year(2023)
+        game = self.db_service.get_game_by_game_code('202210180BOS')
+        player_logs = self.db_service.get_player_logs_by_season_id(season.id)[(game.id, game.home_team_id)]
+        players = PlayerRegistry(capacity=1)
+
+        self.assertEqual(0.0, self.predictor.calculate_avg_bpm(player_logs, players))
+
+        played = [log for log in player_logs if log.minutes_played is not None]
+        self.assertTrue(np.array_equal(np.ones(len(played)), players.games_played[[log.player_id for log in played]]))
+        expected = np.mean([float(log.box_plus_minus or 0.0) for log in played])
+        self.assertAlmostEqual(expected, self.predictor.calculate_avg_bpm(player_logs, players))
+
+    def test_save_and_load_model(self):
+        features, outcomes, _ = self.predictor.generate_data([2023])
+        self.predictor.pipeline = Pipeline([("scale", StandardScaler()), ("model", Ridge())]).fit(features, outcomes)
+
+        with tempfile.TemporaryDirectory() as directory:
+            model_store = ModelStore(directory)
+            key = self.predictor.save_model(model_store)
+
+            loaded = NbaPredictor(self.db_service, [2023])
+            self.assertTrue(loaded.load_model(model_store))
+            np.testing.assert_array_equal(self.predictor.pipeline.predict(features), loaded.pipeline.predict(features))
+            _, metadata = model_store.load(key)
+            self.assertEqual([2023], metadata['training_years'])
+            self.assertEqual(TeamFeatureEngine.FEATURE_NAMES, metadata['feature_names'])
+            self.assertEqual(ModelStore.pipeline_fingerprint(self.predictor.pipeline), metadata['pipeline_fingerprint'])
+
+            # A model trained on other data is not loaded.
+            game = self.db_service.get_game_by_game_code('202210190IND')
+            self.db_service.session.query(GamePlayerLog).where(GamePlayerLog.game_id == game.id).delete()
+            self.assertFalse(NbaPredictor(self.db_service, [2023]).load_model(model_store))
+
+
+class TestNbaPipelineWorkers(unittest.TestCase):
+    def setUp(self) -> None:
+        warnings.simplefilter('ignore', exc.SAWarning)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_database_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'nba.db')}")
+        self.db_service = DatabaseService(Session(self.engine), FixtureScraper(), self.engine)
+        self.db_service.initialize_database()
+        self.db_service.populate_tables(2023)
+
+    def tearDown(self) -> None:
+        self.db_service.session.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_workers_match_serial(self):
+        serial = NbaPredictor(self.db_service, [2023]).generate_season_data(2023)
+        feature_store = FeatureStore(os.path.join(self.tmp_dir.name, 'feature_store'))
+        [parallel] = NbaPredictor(self.db_service, [2023], feature_store, workers=2).generate_seasons_in_workers([2023])
+
+        np.testing.assert_array_equal(np.array(serial[0]), np.array(parallel[0]))
+        self.assertEqual(list(serial[1]), list(parallel[1]))
+        self.assertEqual(serial[2], parallel[2])
+        self.assertEqual(3, len(parallel[2]))
+
+    def test_duplicate_years_generated_once(self):
+        predictor = NbaPredictor(self.db_service, [2023], workers=2)
+        with patch.object(predictor, 'generate_season_data', wraps=predictor.generate_season_data) as generate:
+            _, _, game_codes = predictor.generate_data([2023, 2023])
+
+        generate.assert_called_once_with(2023)
+        self.assertEqual(['202210180BOS', '202210180GSW', '202210190IND'] * 2, game_codes)
+        with self.assertRaises(ValueError):
+            predictor.generate_seasons_in_workers([2023, 2023])
+
+    def test_in_memory_database_runs_serially(self):
+        db_service = create_database_service()
+        db_service.populate_tables(2023)
+
+        [(_, _, game_codes)] = NbaPredictor(db_service, [2023], workers=2).generate_seasons_in_workers([2023])
+
+        self.assertEqual(['202210180BOS', '202210180GSW', '202210190IND'], game_codes)
+
+
+class TestNbaPipelineTuning(unittest.TestCase):
+    @patch("service.nba_pipeline.DatabaseService")
+    def setUp(self, mock_db_service) -> None:
+        self.predictor = NbaPredictor(mock_db_service, [2019, 2020, 2021])
+        self.generated_years = []
+
+        def generate_season_data(year):
+            self.generated_years.append(year)
+            rng = np.random.default_rng(year)
+            features = rng.normal(size=(60, 4))
+            outcomes = np.round(features @ np.array([6.0, -3.0, 2.0, 0.0]) + rng.normal(size=60))
+            return features, outcomes.tolist(), [f'{year}{i:04d}' for i in range(60)]
+
+        self.predictor.generate_season_data = generate_season_data
+
+    def test_season_splits(self):
+        seasons = np.array([2019, 2019, 2020, 2021, 2021])
+        splits = NbaPredictor.season_splits(seasons)
+
+        self.assertEqual([[0, 1], [0, 1, 2]], [train.tolist() for train, _ in splits])
+        self.assertEqual([[2], [3, 4]], [validation.tolist() for _, validation in splits])
+        with self.assertRaises(ValueError):
+            NbaPredictor.season_splits(np.array([2019, 2019]))
+
+    def test_tune_model(self):
+        param_grid = {'scale': ['passthrough', StandardScaler()], 'model': [Ridge()],
+                      'model__alpha': [0.1, 1000.0]}
+
+        search = self.predictor.tune_model(param_grid, n_jobs=2)
+
+        # Seasons are generated once, not per candidate or split.
+        self.assertEqual([2019, 2020, 2021], self.generated_years)
+        self.assertEqual(4, len(search.cv_results_['params']))
+        self.assertEqual(2, search.n_splits_)
+        self.assertEqual(0.1, search.best_params_['model__alpha'])
+        self.assertIs(search.best_estimator_, self.predictor.pipeline)
+
+    def test_tuned_model_is_loaded(self):
+        self.predictor.db.get_season_by_year.return_value.id = 1
+        self.predictor.db.get_season_fingerprint.return_value = 'fingerprint'
+        self.predictor.tune_model({'model': [Ridge()], 'model__alpha': [0.1, 1000.0]}, n_jobs=1)
+        features, _, _ = self.predictor.generate_data([2021])
+
+        with tempfile.TemporaryDirectory() as directory:
+            model_store = ModelStore(directory)
+            self.predictor.save_model(model_store)
+
+            # A later run starts with the default pipeline.
+            loaded = NbaPredictor(self.predictor.db, [2019, 2020, 2021])
+            self.assertTrue(loaded.load_model(model_store))
+
+        self.assertIsInstance(loaded.pipeline.named_steps['model'], Ridge)
+        self.assertEqual(0.1, loaded.pipeline.named_steps['model'].alpha)
+        np.testing.assert_array_equal(self.predictor.pipeline.predict(features), loaded.pipeline.predict(features))
+
+    def test_tune_model_randomized(self):
+        param_grid = {'model': [Ridge()], 'model__alpha': [0.1, 1.0, 10.0, 100.0]}
+
+        search = self.predictor.tune_model(param_grid, n_iter=2, n_jobs=1)
+
+        self.assertEqual(2, len(search.cv_results_['params']))
@@ -98,7 +98,7 @@ class TestNbaTeam(TestCase):
         self.assertEqual(1.0, self.test_team.win_loss_pct)
         self.assertEqual(1.0, self.test_team.last10_pct)
 
-    def test_set_features(self):
+    def test_features(self):
         self.test_team.win_loss_pct = 0.1
         self.test_team.mov = 0.2
         self.test_team.off_rtg = 0.3
@@ -111,8 +111,6 @@ class TestNbaTeam(TestCase):
         self.test_team.pace = 1.0
         self.test_team.last10_pct = 1.1
 
-        self.test_team.set_features()
-
         self.assertEqual(
             [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1],
             self.test_team.features
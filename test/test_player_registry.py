@@ -0,0 +1,36 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from models.nba_player import NbaPlayer
+from models.player_registry import PlayerRegistry
+
+
+class TestPlayerRegistry(unittest.TestCase):
+
+    def test_matches_update_bpm(self):
+        games = [[1.5, None, -2.0], [3.0, 4.0, None], [None, -1.0, 0.5]]
+        player_ids = np.array([3, 7, 2000])
+        expected = [NbaPlayer(f'Player {i}', f'player{i}') for i in player_ids]
+        registry = PlayerRegistry(capacity=4)
+
+        for game in games:
+            expected_average = np.mean([player.bpm for player in expected])
+            for player, bpm in zip(expected, game):
+                player.update_bpm(SimpleNamespace(box_plus_minus=bpm))
+            average = registry.average_bpm(player_ids, np.array([np.nan if bpm is None else bpm for bpm in game]))
+            self.assertAlmostEqual(expected_average, average)
+
+        for player_id, player in zip(player_ids, expected):
+            self.assertEqual(player.games_played, registry.games_played[player_id])
+            self.assertAlmostEqual(player.bpm, registry.bpm[player_id])
+            self.assertAlmostEqual(player.bpm_total, registry.bpm_total[player_id])
+
+    def test_empty_roster(self):
+        registry = PlayerRegistry()
+        self.assertEqual(0, registry.average_bpm(np.array([], dtype=np.int64), np.array([])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+from scripts.Scraper import Scraper
+from scripts.response_cache import ResponseCache
+from test_scraper import DATA_DIR, SavedPageHandler
+
+
+class CountingHandler(SavedPageHandler):
+    request_count = 0
+
+    def do_GET(self):
+        type(self).request_count += 1
+        super().do_GET()
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = ResponseCache(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_put_get(self):
+        url = 'https://www.basketball-reference.com/boxscores/202210180BOS.html'
+        self.assertIsNone(self.cache.get(url))
+
+        self.cache.put(url, '<html>box score</html>')
+
+        self.assertEqual('<html>box score</html>', self.cache.get(url))
+
+    def test_identical_pages_stored_once(self):
+        self.cache.put('https://example.com/a.html', '<html>same</html>')
+        self.cache.put('https://example.com/b.html', '<html>same</html>')
+
+        objects = [f for _, _, files in os.walk(os.path.join(self.tmp_dir.name, 'objects')) for f in files]
+        self.assertEqual(1, len(objects))
+
+    def test_ttl_for(self):
+        season = ResponseCache.current_season()
+
+        self.assertIsNone(self.cache.ttl_for('https://www.basketball-reference.com/boxscores/202210180BOS.html'))
+        self.assertIsNone(self.cache.ttl_for(
+            f'https://www.basketball-reference.com/leagues/NBA_{season - 1}_games-october.html'))
+        self.assertEqual(6 * 60 * 60, self.cache.ttl_for(
+            f'https://www.basketball-reference.com/leagues/NBA_{season}_games-october.html'))
+        self.assertEqual(7 * 24 * 60 * 60, self.cache.ttl_for(
+            'https://www.basketball-reference.com/players/e/evanske01.html'))
+
+    def test_expired_entry(self):
+        cache = ResponseCache(self.tmp_dir.name, default_ttl_seconds=0)
+        url = 'https://www.basketball-reference.com/players/e/evanske01.html'
+        cache.put(url, '<html>player</html>')
+        time.sleep(0.01)
+
+        self.assertIsNone(cache.get(url))
+        self.assertEqual('<html>player</html>', cache.get(url, ignore_ttl=True))
+
+
+class TestScraperCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), partial(CountingHandler, directory=DATA_DIR))
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        CountingHandler.request_count = 0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_replay_from_cache(self):
+        cache = ResponseCache(self.tmp_dir.name)
+        online = Scraper(requests_per_second=1000, burst=10, base_url=self.base_url, cache=cache)
+        game_codes = ['202210180BOS', '202210180GSW']
+
+        online_games = dict(online.scrape_nba_games(game_codes))
+        self.assertEqual(2, CountingHandler.request_count)
+
+        offline = Scraper(base_url=self.base_url, cache=cache, offline=True)
+        offline_games = dict(offline.scrape_nba_games(game_codes + ['202210190IND']))
+
+        # Nothing new reached the server, and the uncached game is reported missing.
+        self.assertEqual(2, CountingHandler.request_count)
+        self.assertIsNone(offline_games['202210190IND'])
+        for game_code in game_codes:
+            self.assertTrue(online_games[game_code][1].equals(offline_games[game_code][1]))
+
+    def test_offline_requires_cache(self):
+        with self.assertRaises(ValueError):
+            Scraper(offline=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+
+from models.rolling_windows import RollingWindows
+
+
+class TestRollingWindows(unittest.TestCase):
+
+    def setUp(self):
+        self.rolling = RollingWindows(['a', 'b'], (3, 5), capacity=1)
+        self.values = np.random.default_rng(3).normal(size=(2, 12, 2))
+
+    def test_feature_names(self):
+        self.assertEqual(['a_last3', 'b_last3', 'a_last5', 'b_last5'], self.rolling.feature_names)
+
+    def test_means_match_naive_windows(self):
+        self.rolling.grow(2)
+        indexes = np.array([0, 1])
+        np.testing.assert_array_equal(np.zeros((2, 4)), self.rolling.means(indexes))
+
+        for game in range(self.values.shape[1]):
+            self.rolling.push(indexes, self.values[:, game])
+            expected = [np.r_[self.values[team, max(0, game - 2):game + 1].mean(axis=0),
+                              self.values[team, max(0, game - 4):game + 1].mean(axis=0)] for team in range(2)]
+            np.testing.assert_allclose(expected, self.rolling.means(indexes), atol=1e-12)
+
+    def test_state_round_trip(self):
+        for game in range(7):
+            self.rolling.push(np.array([0]), self.values[0, game:game + 1])
+
+        state = self.rolling.to_state(0)
+        restored = RollingWindows(['a', 'b'], (3, 5), capacity=1)
+        restored.from_state(0, state)
+
+        self.assertEqual(self.values[0, 2:7].tolist(), state)
+        np.testing.assert_allclose(self.rolling.means(np.array([0])), restored.means(np.array([0])), atol=1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+import unittest
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from unittest.mock import patch
+
+from scripts.Scraper import Scraper
+from scripts.async_fetcher import AsyncFetcher, TokenBucket
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+
+class SavedPageHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the saved pages in test/data and records how many requests were in flight at once.
+    """
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    delay_seconds = 0.0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(cls.delay_seconds)
+            super().do_GET()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestScraper(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), partial(SavedPageHandler, directory=DATA_DIR))
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        SavedPageHandler.in_flight = 0
+        SavedPageHandler.max_in_flight = 0
+        SavedPageHandler.delay_seconds = 0.0
+        self.scraper = Scraper(max_concurrency=3, requests_per_second=1000, burst=10, base_url=self.base_url)
+
+    def test_scrape_nba_season(self):
+        schedule = self.scraper.scrape_nba_season(2023)
+
+        # Only the october page is saved; every other month is a 404 and is skipped.
+        self.assertEqual(3, len(schedule))
+        self.assertEqual(['Boston Celtics', 'Golden State Warriors', 'Indiana Pacers'],
+                         list(schedule['Home/Neutral']))
+        self.assertEqual('Tue, Oct 18, 2022', schedule['Date'][0])
+
+    def test_scrape_nba_season_missing(self):
+        self.assertIsNone(self.scraper.scrape_nba_season(1990))
+
+    def test_scrape_nba_games(self):
+        self.scraper.batch_size = 2
+        game_codes = ['202210180BOS', '202210180GSW', '202210190IND', '202210200XXX']
+
+        results = list(self.scraper.scrape_nba_games(game_codes))
+
+        self.assertEqual(game_codes, [game_code for game_code, _ in results])
+        self.assertIsNone(results[3][1])
+
+        game_summary, home_box, away_box = results[0][1]
+        self.assertEqual(['PHI', 'BOS'], list(game_summary['Team']))
+        self.assertEqual('Team Totals', home_box['Players'].iloc[-1])
+        self.assertEqual(14, len(away_box))
+
+        # Overtime game.
+        game_summary, _, _ = results[2][1]
+        self.assertIn('OT', game_summary.columns)
+
+    def test_scrape_nba_players(self):
+        results = dict(self.scraper.scrape_nba_players(['evanske01', 'nobodyxx01']))
+
+        self.assertIsNone(results['nobodyxx01'])
+        self.assertEqual('Career', results['evanske01']['Season'].iloc[-1])
+
+    def test_fetch_texts_fails_on_error_status(self):
+        urls = [f'{self.base_url}/ok.html', f'{self.base_url}/limited.html', f'{self.base_url}/error.html']
+        responses = {urls[0]: (200, '<html></html>'), urls[1]: (429, 'Too Many Requests'),
+                     urls[2]: (500, 'Internal Server Error')}
+
+        with patch.object(self.scraper.fetcher, 'fetch_all', return_value=responses):
+            pages = self.scraper.fetch_texts(urls)
+
+        self.assertEqual({urls[0]: '<html></html>', urls[1]: None, urls[2]: None}, pages)
+
+    def test_fetch_pages_bounds_concurrency(self):
+        SavedPageHandler.delay_seconds = 0.05
+        urls = [f'{self.base_url}/boxscores/202210180BOS.html?copy={i}' for i in range(9)]
+
+        pages = self.scraper.fetch_pages(urls)
+
+        self.assertTrue(all(pages[url] is not None for url in urls))
+        self.assertLessEqual(SavedPageHandler.max_in_flight, 3)
+        self.assertGreater(SavedPageHandler.max_in_flight, 1)
+
+    def test_fetcher_respects_rate_limit(self):
+        fetcher = AsyncFetcher('test-agent', max_concurrency=4, requests_per_second=20, burst=1)
+        urls = [f'{self.base_url}/leagues/NBA_2023_games-october.html?copy={i}' for i in range(5)]
+
+        start = time.monotonic()
+        responses = fetcher.fetch_all(urls)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(5, fetcher.request_count)
+        self.assertTrue(all(status == 200 for status, _ in responses.values()))
+        # The first request spends the burst token, the other four wait for the bucket to refill.
+        self.assertGreaterEqual(elapsed, 4 / 20 * 0.9)
+
+    def test_token_bucket_invalid(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(0, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import os
+import tempfile
+import unittest
+import warnings
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import numpy as np
+from sqlalchemy import exc
+
+from fixture_scraper import FixtureScraper, create_database_service
+from service.feature_engine import TeamFeatureEngine
+from service.nba_pipeline import NbaPredictor
+from service.season_state import SeasonState
+from test_feature_engine import create_season, create_player_logs
+
+
+def create_dated_season(game_count: int = 60) -> tuple[list, dict]:
+    games, team_logs = create_season(game_count=game_count)
+    for game in games:
+        # Three games start at the same time every day.
+        game.start_datetime = datetime(2022, 10, 18, 19) + timedelta(days=(game.id - 1) // 3)
+    return games, team_logs
+
+
+def apply(state: SeasonState, game, team_logs: dict) -> None:
+    home_log, away_log = team_logs[game.id]
+    if home_log.GameTeamLog.team_id != game.home_team_id:
+        home_log, away_log = away_log, home_log
+    state.apply_game(game, home_log, away_log, [], [])
+
+
+class TestSeasonState(unittest.TestCase):
+
+    def test_features_match_feature_engine(self):
+        games, team_logs = create_dated_season()
+        expected, _, _ = TeamFeatureEngine.season_features(games, team_logs)
+
+        state = SeasonState(2023)
+        for i, game in enumerate(games):
+            home_log, away_log = team_logs[game.id]
+            if home_log.GameTeamLog.team_id != game.home_team_id:
+                home_log, away_log = away_log, home_log
+            np.testing.assert_allclose(expected[i], state.features(home_log.name, away_log.name), atol=1e-12)
+            apply(state, game, team_logs)
+
+    def test_features_with_rosters(self):
+        games, team_logs = create_dated_season()
+        player_logs = create_player_logs(games)
+        state = SeasonState(2023)
+        for game in games:
+            home_log, away_log = team_logs[game.id]
+            if home_log.GameTeamLog.team_id != game.home_team_id:
+                home_log, away_log = away_log, home_log
+            state.apply_game(game, home_log, away_log, player_logs[(game.id, game.home_team_id)],
+                             player_logs[(game.id, game.away_team_id)])
+
+        home_players = ['player100', 'player101', 'unknown']
+        features = state.features('Team 1', 'Team 2', home_players)
+
+        self.assertEqual(len(TeamFeatureEngine.FEATURE_NAMES), len(features))
+        expected = (state.players['player100'].bpm + state.players['player101'].bpm) / 3
+        self.assertAlmostEqual(expected, features[-1])
+
+    def test_apply_game_updates_league_arrays(self):
+        games, team_logs = create_dated_season()
+        player_logs = create_player_logs(games)
+        state = SeasonState(2023)
+        game = games[0]
+        home_log, away_log = team_logs[game.id]
+
+        with patch.object(state.league, 'apply_games', wraps=state.league.apply_games) as apply_games, \
+                patch.object(state.league, 'update_player_bpm', wraps=state.league.update_player_bpm) as update_bpm:
+            state.apply_game(game, home_log, away_log, player_logs[(game.id, home_log.GameTeamLog.team_id)],
+                             player_logs[(game.id, away_log.GameTeamLog.team_id)])
+
+        apply_games.assert_called_once()
+        update_bpm.assert_called_once()
+        self.assertEqual(1.0, state.team(home_log.name).games)
+        played = [log for log in player_logs[(game.id, home_log.GameTeamLog.team_id)] if log.minutes_played]
+        self.assertEqual(float(played[0].box_plus_minus), state.players[played[0].unique_code].bpm)
+
+    def test_snapshot_resume_matches_full_replay(self):
+        games, team_logs = create_dated_season()
+        full = SeasonState(2023)
+        for game in games:
+            apply(full, game, team_logs)
+
+        # Snapshot in the middle of a day's games, then resume with every game that has not been processed.
+        partial = SeasonState(2023)
+        for game in games[:31]:
+            apply(partial, game, team_logs)
+        resumed = SeasonState.from_snapshot(partial.to_snapshot())
+        for game in games:
+            if not resumed.is_processed(game):
+                apply(resumed, game, team_logs)
+
+        self.assertEqual(len(games), resumed.games_processed)
+        self.assertEqual(full.to_snapshot(), resumed.to_snapshot())
+
+    def test_snapshot_keeps_older_unprocessed_games(self):
+        games, team_logs = create_dated_season()
+        partial = SeasonState(2023)
+        for game in games[:31]:
+            if game is not games[10]:
+                apply(partial, game, team_logs)
+
+        resumed = SeasonState.from_snapshot(partial.to_snapshot())
+        self.assertFalse(resumed.is_processed(games[10]))
+        self.assertTrue(resumed.is_processed(games[11]))
+        self.assertEqual(games[30].start_datetime, resumed.last_game_datetime)
+
+    def test_snapshot_version(self):
+        state = SeasonState(2023)
+        state.SNAPSHOT_VERSION = 0
+        with self.assertRaises(ValueError):
+            SeasonState.from_snapshot(state.to_snapshot())
+
+
+class TestNbaPredictorSeasonState(unittest.TestCase):
+    def setUp(self):
+        warnings.simplefilter('ignore', exc.SAWarning)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_path = os.path.join(self.tmp_dir.name, 'state', '2023.snapshot')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_update_season_state_applies_only_new_games(self):
+        db_service = create_database_service(FixtureScraper(fail_on='202210190IND'))
+        db_service.scraper.batch_size = 1
+        with self.assertRaises(RuntimeError):
+            db_service.populate_tables(2023, chunk_size=1)
+        db_service.session.rollback()
+        predictor = NbaPredictor(db_service, [2023])
+
+        state = predictor.update_season_state(2023, self.snapshot_path)
+        self.assertEqual(2, state.games_processed)
+        self.assertTrue(os.path.exists(self.snapshot_path))
+
+        db_service.scraper = FixtureScraper()
+        db_service.populate_tables(2023)
+        state = predictor.update_season_state(2023, self.snapshot_path)
+
+        self.assertEqual(3, state.games_processed)
+        self.assertEqual('202210190IND', state.last_game_code)
+        self.assertEqual(predictor.update_season_state(2023).to_snapshot(), state.to_snapshot())
+
+        # Nothing new: the snapshot is unchanged.
+        self.assertEqual(state.to_snapshot(), predictor.update_season_state(2023, self.snapshot_path).to_snapshot())
+
+    def test_update_season_state_applies_games_ingested_late(self):
+        db_service = create_database_service(FixtureScraper(missing='202210180GSW'))
+        db_service.update_season(2023, today=datetime(2022, 10, 20))
+        predictor = NbaPredictor(db_service, [2023])
+
+        state = predictor.update_season_state(2023, self.snapshot_path)
+        self.assertEqual(2, state.games_processed)
+        self.assertEqual('202210190IND', state.last_game_code)
+
+        # The missing game, older than the snapshot's last game, is retried.
+        db_service.scraper = FixtureScraper()
+        db_service.update_season(2023, today=datetime(2022, 10, 20))
+        state = predictor.update_season_state(2023, self.snapshot_path)
+
+        self.assertEqual(3, state.games_processed)
+        self.assertTrue(state.is_processed(db_service.get_game_by_game_code('202210180GSW')))
+        self.assertEqual(predictor.update_season_state(2023).to_snapshot(), state.to_snapshot())
+
+
+if __name__ == "__main__":
+    unittest.main()
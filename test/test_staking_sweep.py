@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from service.bankroll import BankrollSimulator
+from service.staking_sweep import StakingSweep
+from test_bankroll import create_predictions, replay
+
+
+class TestStakingSweep(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.prediction_paths = {}
+        for year, seed in [(2021, 11), (2022, 12)]:
+            self.prediction_paths[year] = os.path.join(self.directory.name, f'{year}_prediction.csv')
+            create_predictions(seed=seed).to_csv(self.prediction_paths[year])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_staking_grid(self):
+        grid = StakingSweep.staking_grid(initial_bankrolls=(500, 1000), unit_pcts=(0.01, 0.05), min_units=(5,),
+                                         kelly_fractions=(0.5,))
+
+        self.assertEqual(6, len(grid))
+        self.assertEqual({'initial_bankroll': 500.0, 'min_unit': 5.0, 'unit_pct': 0.01, 'kelly_fraction': None},
+                         grid[0])
+        self.assertEqual({'initial_bankroll': 500.0, 'min_unit': 5.0, 'unit_pct': None, 'kelly_fraction': 0.5},
+                         grid[2])
+
+    def test_fixed_stakes_match_replay(self):
+        grid = StakingSweep.staking_grid(unit_pcts=(0.02, 0.05), kelly_fractions=())
+
+        results = StakingSweep(self.prediction_paths).run(grid)
+
+        self.assertEqual(StakingSweep.COLUMNS, results.columns.tolist())
+        self.assertEqual([2021, 2021, 2022, 2022], results['Season'].tolist())
+        for _, row in results.iterrows():
+            predictions = create_predictions(seed=11 if row['Season'] == 2021 else 12)
+            bankroll, minimum_bankroll, maximum_bankroll, max_loss_streak, _, _ = \
+                replay(predictions, 1000.0, row['Unit Pct'], 5.0)
+            self.assertEqual(bankroll, row['Bankroll'])
+            self.assertEqual(bankroll - 1000.0, row['Profit'])
+            self.assertEqual(minimum_bankroll, row['Minimum Bankroll'])
+            self.assertEqual(maximum_bankroll, row['Maximum Bankroll'])
+            self.assertEqual(max_loss_streak, row['Max Loss Streak'])
+
+    def test_kelly_stakes(self):
+        self.assertAlmostEqual(0.0, BankrollSimulator.kelly_unit_pct(0.5))
+        # p - q / b with b = 0.9.
+        self.assertAlmostEqual(0.6 - 0.4 / 0.9, BankrollSimulator.kelly_unit_pct(0.6))
+
+        results = StakingSweep(self.prediction_paths).run(StakingSweep.staking_grid(unit_pcts=(),
+                                                                                    kelly_fractions=(0.5, 1.0)))
+
+        season = StakingSweep.load_season(self.prediction_paths[2021])
+        kelly = BankrollSimulator.kelly_unit_pct(season['win_probability'])
+        self.assertAlmostEqual(kelly / 2, results['Unit Pct'][0])
+        self.assertAlmostEqual(kelly, results['Unit Pct'][1])
+
+    def test_kelly_without_edge_places_no_bets(self):
+        # Hit rate below the -110 break-even rate (52.4%).
+        losing_path = os.path.join(self.directory.name, '2020_prediction.csv')
+        predictions = create_predictions(seed=13)
+        predictions['Prediction Outcome'] = np.where(np.arange(len(predictions)) % 2 == 0, 'Correct', 'Incorrect')
+        predictions.loc[predictions.index[:10], 'Prediction Outcome'] = 'Incorrect'
+        predictions.to_csv(losing_path)
+
+        results = StakingSweep({2020: losing_path}).run(StakingSweep.staking_grid(unit_pcts=(0.02,),
+                                                                                  kelly_fractions=(0.5,)))
+
+        fixed, kelly = results.iloc[0], results.iloc[1]
+        self.assertEqual(len(predictions), fixed['Bets'])
+        self.assertLess(fixed['Profit'], 0)
+        self.assertEqual(0, kelly['Bets'])
+        self.assertEqual(0.0, kelly['Unit Pct'])
+        self.assertEqual(1000.0, kelly['Bankroll'])
+        self.assertEqual(0.0, kelly['Profit'])
+        self.assertEqual(0, kelly['Max Loss Streak'])
+
+    def test_workers_match_serial(self):
+        grid = StakingSweep.staking_grid()
+
+        serial = StakingSweep(self.prediction_paths).run(grid)
+        parallel = StakingSweep(self.prediction_paths, workers=2).run(grid)
+
+        self.assertTrue(serial.equals(parallel))
+
+
+if __name__ == "__main__":
+    unittest.main()